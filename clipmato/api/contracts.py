@@ -78,6 +78,30 @@ class PublishJobModel(BaseModel):
     last_error: str | None = None
 
 
+class MediaStreamModel(BaseModel):
+    index: int
+    codec_type: str
+    codec_name: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    channel_layout: str | None = None
+    width: int | None = None
+    height: int | None = None
+    duration: float | None = None
+
+
+class MediaInfoModel(BaseModel):
+    name: str
+    size: int
+    mtime_ns: int
+    has_audio: bool
+    has_video: bool = False
+    duration: float | None = None
+    format_name: str | None = None
+    bit_rate: int | None = None
+    streams: list[MediaStreamModel] = Field(default_factory=list)
+
+
 class RecordSummaryModel(BaseModel):
     id: str
     filename: str | None = None
@@ -107,10 +131,12 @@ class RecordDetailModel(RecordSummaryModel):
     publish_targets: list[str] = Field(default_factory=list)
     publish_jobs: dict[str, PublishJobModel] = Field(default_factory=dict)
     prompt_runs: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    media: list[MediaInfoModel] = Field(default_factory=list)
 
 
 class RecordListResponse(BaseModel):
     records: list[RecordSummaryModel] = Field(default_factory=list)
+    next_cursor: str | None = None
 
 
 class ProjectPresetModel(ProjectContextModel):
@@ -126,6 +152,60 @@ class UploadAcceptedResponse(BaseModel):
     id: str
 
 
+class ProcessingStageSlotsModel(BaseModel):
+    limit: int
+    active: int
+    waiting: int
+
+
+class TranscriptCacheStatsModel(BaseModel):
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+class WhisperModelStatsModel(BaseModel):
+    pid: int
+    model_name: str
+    device: str
+    resident_bytes: int
+    load_seconds: float
+    loaded_at: str
+    last_used_at: str
+    uses: int
+
+
+class WhisperModelPoolStatsModel(BaseModel):
+    max_bytes: int
+    resident_bytes: int
+    loads: int
+    evictions: int
+    processes: int
+    models: list[WhisperModelStatsModel] = Field(default_factory=list)
+
+
+class ProcessingQueueMetricsResponse(BaseModel):
+    depth: int
+    max_depth: int
+    depth_by_priority: dict[str, int]
+    workers: int
+    running: int
+    oldest_wait_seconds: float
+    average_wait_seconds: float
+    max_wait_seconds: float
+    enqueued: int
+    completed: int
+    failed: int
+    rejected: int
+    stages: dict[str, ProcessingStageSlotsModel]
+    transcript_cache: TranscriptCacheStatsModel
+    whisper_models: WhisperModelPoolStatsModel
+
+
 class ProgressStatusResponse(BaseModel):
     stage: str
     progress: float
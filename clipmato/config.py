@@ -28,6 +28,12 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 STATIC_BUILD_DIR = UPLOAD_DIR / ".static-build"
 STATIC_BUILD_DIR.mkdir(parents=True, exist_ok=True)
 METADATA_PATH = UPLOAD_DIR / "metadata.json"
+# Record store backend: "json" rewrites metadata.json per change, "sqlite"
+# keeps one row per record in a WAL-mode database, and "sharded" keeps one
+# file per record plus a compact index. Both import metadata.json once.
+METADATA_BACKEND = os.getenv("CLIPMATO_METADATA_BACKEND", "json").strip().lower() or "json"
+METADATA_DB_PATH = UPLOAD_DIR / "metadata.sqlite3"
+METADATA_SHARDS_DIR = UPLOAD_DIR / "metadata.d"
 PROVIDERS_DIR = UPLOAD_DIR / "providers"
 PROVIDERS_DIR.mkdir(parents=True, exist_ok=True)
 SETTINGS_PATH = UPLOAD_DIR / "settings.json"
@@ -39,6 +45,8 @@ PROMPT_RELEASE_STATE_PATH = UPLOAD_DIR / "prompt_release_state.json"
 PROJECT_PRESETS_PATH = UPLOAD_DIR / "project_presets.json"
 AGENT_RUNS_DIR = UPLOAD_DIR / "agent_runs"
 AGENT_RUNS_DIR.mkdir(parents=True, exist_ok=True)
+PROGRESS_LOG_PATH = UPLOAD_DIR / "progress.jsonl"
+PIPELINE_CHECKPOINTS_DIR = UPLOAD_DIR / "pipeline_checkpoints"
 EVENTS_PATH = UPLOAD_DIR / "events.jsonl"
 WEBHOOKS_PATH = UPLOAD_DIR / "webhooks.json"
 
@@ -59,8 +67,51 @@ ALLOWED_UPLOAD_MIME_TYPES: set[str] = {
 }
 MAX_UPLOAD_SIZE_BYTES = 50 * 1024 * 1024  # 50MB limit for uploads
 
+# Maximum number of independent pipeline stages run at the same time
+PIPELINE_MAX_CONCURRENCY = max(int(os.getenv("CLIPMATO_PIPELINE_MAX_CONCURRENCY", "4")), 1)
+
+# Where Step(to_thread=True) stages (transcription, silence removal, editing) run:
+# "thread" uses asyncio.to_thread in the web process, "process" uses a pool of
+# worker processes so CPU-heavy work does not hold the web process's GIL.
+STAGE_EXECUTOR = os.getenv("CLIPMATO_STAGE_EXECUTOR", "thread").strip().lower() or "thread"
+STAGE_PROCESS_WORKERS = max(int(os.getenv("CLIPMATO_STAGE_PROCESS_WORKERS", "2")), 1)
+
+# Upload processing queue: worker pool size and the depth at which new
+# uploads are rejected with 503 instead of piling up.
+PROCESSING_WORKERS = max(int(os.getenv("CLIPMATO_PROCESSING_WORKERS", "2")), 1)
+PROCESSING_QUEUE_MAX_DEPTH = max(int(os.getenv("CLIPMATO_PROCESSING_QUEUE_MAX_DEPTH", "100")), 1)
+
+
+def _stage_concurrency(defaults: dict[str, int], raw: str) -> dict[str, int]:
+    """Apply ``stage=limit`` overrides (comma separated, 0 = unbounded) to ``defaults``."""
+    limits = dict(defaults)
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip()] = int(value)
+    return limits
+
+
+# Process-wide concurrency per pipeline stage, shared by every queued job:
+# one transcription (local Whisper is memory-bound), a few LLM calls, and a
+# couple of ffmpeg jobs. Override with CLIPMATO_STAGE_CONCURRENCY="titles=2,...".
+STAGE_CONCURRENCY: dict[str, int] = _stage_concurrency(
+    {
+        "transcribing": 1,
+        "descriptions": 4,
+        "entities": 4,
+        "titles": 4,
+        "script": 4,
+        "distribution": 4,
+        "editing": 2,
+        "remove_silence": 2,
+    },
+    os.getenv("CLIPMATO_STAGE_CONCURRENCY", ""),
+)
+
 # Mapping of pipeline stages to progress percentages
 STAGE_PROGRESS: dict[str, int] = {
+    "queued": 10,
     "transcribing": 20,
     "descriptions": 30,
     "entities": 40,
@@ -76,6 +127,25 @@ STAGE_PROGRESS: dict[str, int] = {
 MIN_SILENCE_LEN_MS = 1000
 SILENCE_THRESH_DB = -50
 KEEP_SILENCE_MS = 200
+# "numpy" detects silence from frame energies and trims with one ffmpeg pass;
+# "ffmpeg" also detects with ffmpeg's silencedetect (no audio in Python, video
+# kept); "pydub" is the original in-memory split_on_silence implementation.
+SILENCE_REMOVAL_BACKEND = os.getenv("CLIPMATO_SILENCE_REMOVAL_BACKEND", "numpy").strip().lower() or "numpy"
+
+# Editing stage: two-pass EBU R128 loudness normalization (integrated
+# loudness, true peak, loudness range), an optional high-pass (Hz, 0 = off)
+# and noise gate (threshold in dBFS, unset = off), encoded once to AAC.
+# CLIPMATO_EDIT_LOUDNORM=0 leaves levels untouched.
+EDIT_LOUDNORM = os.getenv("CLIPMATO_EDIT_LOUDNORM", "1").strip().lower() not in {"0", "false", "no", "off"}
+EDIT_TARGET_LUFS = float(os.getenv("CLIPMATO_EDIT_TARGET_LUFS", "-16"))
+EDIT_TRUE_PEAK_DB = -1.5
+EDIT_LOUDNESS_RANGE_LU = 11.0
+EDIT_HIGHPASS_HZ = max(float(os.getenv("CLIPMATO_EDIT_HIGHPASS_HZ", "80")), 0.0)
+_edit_noise_gate = os.getenv("CLIPMATO_EDIT_NOISE_GATE_DB", "").strip()
+EDIT_NOISE_GATE_DB = float(_edit_noise_gate) if _edit_noise_gate else None
+EDIT_AUDIO_CODEC = "aac"
+EDIT_AUDIO_BITRATE = "192k"
+EDIT_SAMPLE_RATE = 48000
 
 # Transcription defaults and FFmpeg parameters
 AUDIO_ONLY_EXTENSIONS = {"flac", "m4a", "mp3", "mpga", "oga", "ogg", "wav"}
@@ -84,6 +154,32 @@ MAX_CHUNK_SIZE_BYTES = 25 * 1024 * 1024  # 25MB limit for Whisper API
 FFMPEG_AUDIO_CODEC = "pcm_s16le"
 FFMPEG_SAMPLE_RATE = 16000
 FFMPEG_CHANNELS = 1
+# Oversized uploads are split for the Whisper API at detected silences near
+# evenly spaced targets (within this fraction of a chunk) and the chunks are
+# transcribed concurrently.
+OPENAI_TRANSCRIPTION_CONCURRENCY = max(int(os.getenv("CLIPMATO_OPENAI_TRANSCRIPTION_CONCURRENCY", "4")), 1)
+SPLIT_SEARCH_WINDOW_RATIO = 0.1
+SPLIT_SILENCE_THRESH_DB = -35
+SPLIT_MIN_SILENCE_SECONDS = 0.4
+# Local Whisper reads uploads as a PCM stream piped from ffmpeg ("stream") or
+# from a converted 16 kHz WAV written next to the upload ("file").
+LOCAL_WHISPER_DECODE = os.getenv("CLIPMATO_LOCAL_WHISPER_DECODE", "stream").strip().lower() or "stream"
+# Local Whisper transcribes uploads longer than one window in windows of this
+# many seconds (0 disables windowing), each overlapping the next by
+# LOCAL_WHISPER_WINDOW_OVERLAP_SECONDS, and reports each window's segments as
+# a partial transcript. Peak memory is one decoded window.
+LOCAL_WHISPER_WINDOW_SECONDS = max(float(os.getenv("CLIPMATO_LOCAL_WHISPER_WINDOW_SECONDS", "600")), 0.0)
+LOCAL_WHISPER_WINDOW_OVERLAP_SECONDS = 5.0
+# Loaded local Whisper models are kept per process up to this much memory
+# (least recently used evicted first); each process publishes its pool
+# snapshot under WHISPER_MODEL_STATS_DIR for the processing metrics.
+LOCAL_WHISPER_MEMORY_BYTES = max(int(os.getenv("CLIPMATO_LOCAL_WHISPER_MEMORY_MB", "4096")), 0) * 1024 * 1024
+WHISPER_MODEL_STATS_DIR = UPLOAD_DIR / "whisper_models"
+# Optional ISO-639-1 spoken language hint for Whisper; unset means auto-detect.
+TRANSCRIPTION_LANGUAGE = os.getenv("CLIPMATO_TRANSCRIPTION_LANGUAGE", "").strip().lower() or None
+# Finished transcripts keyed by audio hash + backend/model/language, LRU-evicted past this size.
+TRANSCRIPT_CACHE_DIR = UPLOAD_DIR / "transcript_cache"
+TRANSCRIPT_CACHE_MAX_BYTES = max(int(os.getenv("CLIPMATO_TRANSCRIPT_CACHE_MAX_MB", "256")), 0) * 1024 * 1024
 TRANSCRIPTION_BACKEND_ENV_VAR = "CLIPMATO_TRANSCRIPTION_BACKEND"
 CONTENT_BACKEND_ENV_VAR = "CLIPMATO_CONTENT_BACKEND"
 LOCAL_WHISPER_MODEL_ENV_VAR = "CLIPMATO_LOCAL_WHISPER_MODEL"
@@ -96,6 +192,7 @@ PUBLIC_BASE_URL_ENV_VAR = "CLIPMATO_BASE_URL"
 GOOGLE_CLIENT_ID_ENV_VAR = "GOOGLE_CLIENT_ID"
 GOOGLE_CLIENT_SECRET_ENV_VAR = "GOOGLE_CLIENT_SECRET"
 OPENAI_API_KEY_ENV_VAR = "OPENAI_API_KEY"
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "").strip() or "https://api.openai.com/v1"
 
 # Scheduling defaults
 DEFAULT_CADENCE = "daily"
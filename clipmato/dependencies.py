@@ -15,10 +15,18 @@ from .governance import (
     rollback_prompt_release,
 )
 from .utils.file_io import save_upload_file
-from .utils.metadata import get_metadata_record, read_metadata, update_metadata, remove_metadata
-from .utils.progress import update_progress, read_progress, enrich_with_progress
+from .utils.metadata import (
+    get_metadata_record_view,
+    iter_metadata_summaries,
+    read_metadata_summaries,
+    read_metadata_view,
+    remove_metadata,
+    update_metadata,
+)
+from .utils.progress import update_progress, read_progress, read_progress_many, enrich_with_progress
 from .services.eventing import eventing_service
 from .services.file_processing import process_file_async
+from .services.processing_queue import processing_queue
 from .services.publishing import PublishingService
 from .services.project_presets import ProjectPresetService
 from .services.record_queries import RecordQueryService
@@ -45,13 +53,22 @@ class FileIOService:
 
 
 class MetadataService:
-    """Service for reading, updating, and removing metadata records."""
+    """Service for reading, updating, and removing metadata records.
+
+    Reads return shared read-only record views; use ``update`` to change a record.
+    """
 
     def read(self):
-        return read_metadata()
+        return read_metadata_view()
 
     def get(self, record_id: str):
-        return get_metadata_record(record_id)
+        return get_metadata_record_view(record_id)
+
+    def read_summaries(self):
+        return read_metadata_summaries()
+
+    def iter_summaries(self, *, sort: str = "upload_time", descending: bool = False, after=None):
+        return iter_metadata_summaries(sort=sort, descending=descending, after=after)
 
     def update(self, record_id: str, data: dict):
         return update_metadata(record_id, data)
@@ -69,6 +86,9 @@ class ProgressService:
     def read(self, record_id: str):
         return read_progress(record_id)
 
+    def read_many(self, record_ids):
+        return read_progress_many(record_ids)
+
     def enrich(self, records: list[dict]):
         return enrich_with_progress(records)
 
@@ -79,6 +99,15 @@ class ProcessingService:
     async def process(self, *args, **kwargs):
         return await process_file_async(*args, **kwargs)
 
+    def enqueue(self, *args, **kwargs):
+        return processing_queue.submit(*args, **kwargs)
+
+    def has_capacity(self):
+        return processing_queue.has_capacity()
+
+    def metrics(self):
+        return processing_queue.metrics()
+
 
 class EventingFacade:
     """Service for append-only events, SSE, and webhook delivery."""
@@ -86,12 +115,14 @@ class EventingFacade:
     def emit(self, *args, **kwargs):
         return eventing_service.emit_event(*args, **kwargs)
 
+    def warm(self):
+        return eventing_service.warm()
+
     def list_events(self, *args, **kwargs):
         return eventing_service.list_events(*args, **kwargs)
 
-    async def stream_events(self, *args, **kwargs):
-        async for event in eventing_service.stream_events(*args, **kwargs):
-            yield event
+    def stream_events(self, *args, **kwargs):
+        return eventing_service.stream_events(*args, **kwargs)
 
     def register_webhook(self, *args, **kwargs):
         return eventing_service.register_webhook(*args, **kwargs)
@@ -1,10 +1,20 @@
 """Pipeline orchestration framework for Clipmato:
 Defines a Step interface and Pipeline class so stages are pluggable components.
+
+Steps are listed in their logical order. ``Pipeline`` derives a dependency
+graph from each step's ``input_keys`` and ``output_keys`` and runs every step
+as soon as the steps it depends on have finished, up to ``max_concurrency``
+at a time, so the result is the same as running the list in order.
 """
 import asyncio
-from typing import Any, Callable, Sequence, Union
+import logging
+from typing import Any, Callable, Iterable, Sequence, Union
 
+from .config import PIPELINE_MAX_CONCURRENCY
 from .services.service_utils import run_stage
+from .utils.progress import update_progress
+
+logger = logging.getLogger(__name__)
 
 
 class Step:
@@ -31,7 +41,7 @@ class Step:
         self.to_thread = to_thread
         self.log_result = log_result
 
-    async def run(self, ctx: dict[str, Any]) -> None:
+    async def run(self, ctx: dict[str, Any], *, track_progress: bool = True) -> None:
         args = [ctx[key] for key in self.input_keys]
         result = await run_stage(
             ctx["rec_id"],
@@ -40,6 +50,7 @@ class Step:
             *args,
             to_thread=self.to_thread,
             log_result=self.log_result,
+            track_progress=track_progress,
         )
         if len(self.output_keys) == 1:
             ctx[self.output_keys[0]] = result
@@ -48,15 +59,105 @@ class Step:
                 ctx[key] = val
 
 
+def step_dependencies(steps: Sequence[Step]) -> dict[str, set[str]]:
+    """
+    Return, for each step name, the names of earlier steps it must wait for.
+
+    A step waits for the latest earlier producer of each key it reads, and,
+    for each key it writes, for the previous producer and any step that reads
+    that producer's value. Keys no earlier step produces come from the
+    initial context.
+    """
+    producer: dict[str, str] = {}
+    readers: dict[str, list[str]] = {}
+    dependencies: dict[str, set[str]] = {}
+    for step in steps:
+        if step.name in dependencies:
+            raise ValueError(f"Duplicate pipeline step name: {step.name}")
+        needs: set[str] = set()
+        for key in step.input_keys:
+            if key in producer:
+                needs.add(producer[key])
+        for key in step.output_keys:
+            if key in producer:
+                needs.add(producer[key])
+            needs.update(readers.get(key, ()))
+        needs.discard(step.name)
+        dependencies[step.name] = needs
+        for key in step.input_keys:
+            readers.setdefault(key, []).append(step.name)
+        for key in step.output_keys:
+            producer[key] = step.name
+            readers[key] = []
+    return dependencies
+
+
 class Pipeline:
     """
-    Orchestrates a sequence of Step instances.
+    Orchestrates Step instances as a dependency graph.
+
+    Progress is reported for the earliest unfinished step in list order, so
+    the stage and percentage only move forward while later independent steps
+    run alongside it. The first failing step cancels the others and its
+    exception propagates.
+
+    ``completed`` names steps whose outputs are already in the context (from
+    a checkpoint); they are skipped. ``on_step_complete(step, ctx)`` is called
+    after each step finishes, e.g. to persist a checkpoint.
     """
 
-    def __init__(self, steps: list[Step]):
+    def __init__(self, steps: list[Step], max_concurrency: int | None = None):
         self.steps = steps
+        self.dependencies = step_dependencies(steps)
+        self.max_concurrency = max(1, max_concurrency or PIPELINE_MAX_CONCURRENCY)
+
+    async def run(
+        self,
+        ctx: dict[str, Any],
+        *,
+        completed: Iterable[str] = (),
+        on_step_complete: Callable[[Step, dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        done: set[str] = set(completed) & set(self.dependencies)
+        pending = [step for step in self.steps if step.name not in done]
+        running: dict[asyncio.Task, Step] = {}
+        reported: tuple[str, str | None] | None = None
+
+        def _report_progress() -> None:
+            nonlocal reported
+            frontier = next((step for step in self.steps if step.name not in done), None)
+            if frontier is None or frontier not in running.values():
+                return
+            others = [step.name for step in self.steps if step in running.values() and step is not frontier]
+            message = f"Also running: {', '.join(others)}" if others else None
+            if reported != (frontier.name, message):
+                reported = (frontier.name, message)
+                update_progress(ctx["rec_id"], frontier.name, message)
 
-    async def run(self, ctx: dict[str, Any]) -> dict[str, Any]:
-        for step in self.steps:
-            await step.run(ctx)
-        return ctx
\ No newline at end of file
+        try:
+            while pending or running:
+                for step in list(pending):
+                    if len(running) >= self.max_concurrency:
+                        break
+                    if self.dependencies[step.name] <= done:
+                        pending.remove(step)
+                        running[asyncio.create_task(step.run(ctx, track_progress=False))] = step
+                if not running:
+                    raise RuntimeError("Pipeline has steps whose dependencies can never complete")
+                _report_progress()
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(finished, key=lambda t: self.steps.index(running[t])):
+                    step = running.pop(task)
+                    task.result()
+                    done.add(step.name)
+                    if on_step_complete is not None:
+                        try:
+                            on_step_complete(step, ctx)
+                        except Exception:
+                            logger.exception(f"[{ctx.get('rec_id')}] Step '{step.name}' completion hook failed")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        return ctx
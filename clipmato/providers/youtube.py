@@ -17,6 +17,7 @@ from ..runtime import (
     get_google_oauth_client_id,
     get_google_oauth_client_secret,
 )
+from ..utils.media_probe import media_info, seed_media_info
 from .base import (
     PublishAuthorizationError,
     PublishConfigurationError,
@@ -242,6 +243,7 @@ class YouTubePublisher:
     def _resolve_source_path(self, record: dict[str, Any]) -> Path:
         candidates: list[str] = []
         unsupported_path: Path | None = None
+        seed_media_info(record.get("media"), UPLOAD_DIR)
         if record.get("edited_audio"):
             candidates.append(str(record["edited_audio"]))
         if record.get("filename"):
@@ -249,7 +251,7 @@ class YouTubePublisher:
         for candidate in candidates:
             path = Path(candidate).expanduser()
             if path.exists():
-                if path.suffix.lower() not in self.allowed_extensions:
+                if path.suffix.lower() not in self.allowed_extensions or not self._has_video(path):
                     unsupported_path = path
                     continue
                 return path
@@ -260,6 +262,15 @@ class YouTubePublisher:
             )
         raise PublishConfigurationError("The source media for this record is no longer available.")
 
+    @staticmethod
+    def _has_video(path: Path) -> bool:
+        """Reject containers probed without a video stream (e.g. microphone-only WebM recordings)."""
+        try:
+            info = media_info(path)
+        except OSError:
+            return True  # ffprobe unavailable; trust the extension
+        return info.has_video or not info.streams
+
     def _build_flow(self, redirect_uri: str):
         from google_auth_oauthlib.flow import Flow
 
@@ -1,8 +1,8 @@
 """Event-driven API routes for SSE consumption and webhook management."""
 from __future__ import annotations
 
-import asyncio
 import json
+from contextlib import aclosing
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse, StreamingResponse
@@ -21,6 +21,7 @@ class WebhookCreateRequest(BaseModel):
     run_id: str | None = None
     publish_job_id: str | None = None
     enabled: bool = True
+    batch_size: int = Field(default=1, ge=1, le=500)
 
 
 class WebhookReplayRequest(BaseModel):
@@ -62,23 +63,25 @@ async def stream_events(
 ) -> StreamingResponse:
     async def iterator():
         emitted = 0
-        async for event in eventing_svc.stream_events(
+        events = eventing_svc.stream_events(
             after_sequence=after_sequence,
             record_id=record_id,
             run_id=run_id,
             publish_job_id=publish_job_id,
             event_types=event_type,
-        ):
-            if await request.is_disconnected():
-                break
-            yield (
-                f"id: {event['sequence']}\n"
-                f"event: {event['type']}\n"
-                f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
-            )
-            emitted += 1
-            if limit is not None and emitted >= limit:
-                break
+        )
+        async with aclosing(events):
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                yield (
+                    f"id: {event['sequence']}\n"
+                    f"event: {event['type']}\n"
+                    f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+                )
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    break
 
     return StreamingResponse(iterator(), media_type="text/event-stream")
 
@@ -102,6 +105,7 @@ async def register_webhook(
             run_id=payload.run_id,
             publish_job_id=payload.publish_job_id,
             enabled=payload.enabled,
+            batch_size=payload.batch_size,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
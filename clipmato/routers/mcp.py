@@ -124,7 +124,8 @@ def _preview_runtime_profile(profile: str) -> dict[str, Any]:
 
 
 def _records_summary(limit: int | None = None) -> dict[str, Any]:
-    records = get_record_query_service().list_recent_records(get_metadata_service(), get_progress_service())
+    # MCP clients read transcripts and generated copy from this resource, so it serves full records.
+    records = get_record_query_service().list_recent_records(get_metadata_service(), get_progress_service(), full=True)
     visible = records[:limit] if limit is not None else records
     return {"count": len(records), "records": visible}
 
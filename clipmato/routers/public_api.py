@@ -1,14 +1,16 @@
 """Versioned public API routes."""
 from __future__ import annotations
 
-from typing import Any
+from datetime import datetime
+from typing import Any, Literal
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Header, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Header, Query, UploadFile
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
 from ..api.contracts import (
+    ProcessingQueueMetricsResponse,
     ProgressStatusResponse,
     ProjectPresetListResponse,
     PublishJobUpdateResponse,
@@ -38,6 +40,8 @@ from ..dependencies import (
     get_record_query_service,
 )
 from ..runtime import get_runtime_status
+from ..services.processing_queue import QueueFullError
+from ..services.record_queries import InvalidCursorError, RecordFilters
 from ..utils import file_io as file_io_utils
 
 router = APIRouter(prefix="/api/v1", tags=["Public API"])
@@ -106,13 +110,48 @@ async def list_project_presets(project_preset_svc=Depends(get_project_preset_ser
 
 @router.get("/records", response_model=RecordListResponse, responses=error_responses())
 async def list_records(
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    sort: Literal["-upload_time", "upload_time", "-schedule_time", "schedule_time"] = Query(default="-upload_time"),
+    stage: str | None = Query(default=None),
+    scheduled: bool | None = Query(default=None),
+    published: bool | None = Query(default=None),
+    project_name: str | None = Query(default=None),
+    uploaded_after: datetime | None = Query(default=None),
+    uploaded_before: datetime | None = Query(default=None),
     metadata_svc=Depends(get_metadata_service),
     progress_svc=Depends(get_progress_service),
     record_queries=Depends(get_record_query_service),
 ) -> dict[str, Any]:
-    """List records using the versioned public summary contract."""
-    records = record_queries.list_recent_records(metadata_svc, progress_svc)
-    return {"records": [record_queries.build_summary_payload(record, detail_url_base="/api/v1/record") for record in records]}
+    """List records using the versioned public summary contract.
+
+    Without ``limit`` every matching record is returned. With ``limit``, pass
+    ``next_cursor`` from the previous response as ``cursor`` with the same
+    ``sort`` and filters to fetch the following page.
+    """
+    filters = RecordFilters(
+        stage=stage,
+        scheduled=scheduled,
+        published=published,
+        project_name=project_name,
+        uploaded_after=uploaded_after,
+        uploaded_before=uploaded_before,
+    )
+    try:
+        records, next_cursor = record_queries.page_records(
+            metadata_svc,
+            progress_svc,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            filters=filters,
+        )
+    except InvalidCursorError as exc:
+        raise ApiError(status_code=400, code="invalid_cursor", message=str(exc)) from exc
+    return {
+        "records": [record_queries.build_summary_payload(record, detail_url_base="/api/v1/record") for record in records],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/record/{record_id}", response_model=RecordDetailModel, responses=error_responses())
@@ -283,11 +322,21 @@ async def retry_youtube_publish(
     return body
 
 
+@router.get("/processing/queue", response_model=ProcessingQueueMetricsResponse, responses=error_responses())
+async def processing_queue_metrics(processing_svc=Depends(get_processing_service)) -> dict[str, Any]:
+    """Return processing queue depth, worker utilisation, per-stage slots, transcript cache, and Whisper model stats."""
+    return processing_svc.metrics()
+
+
+def _queue_full_error(message: str) -> ApiError:
+    return ApiError(status_code=503, code="processing_queue_full", message=message)
+
+
 @router.post("/upload", response_model=UploadAcceptedResponse, responses=error_responses())
 async def upload(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     remove_silence: bool = Form(False),
+    priority: Literal["high", "normal", "low"] = Form("normal"),
     selected_project_presets: list[str] = Form(default=[]),
     project_name: str = Form(""),
     project_summary: str = Form(""),
@@ -298,7 +347,6 @@ async def upload(
     file_io=Depends(get_file_io_service),
     project_preset_svc=Depends(get_project_preset_service),
     processing_svc=Depends(get_processing_service),
-    progress_svc=Depends(get_progress_service),
 ) -> dict[str, Any] | JSONResponse:
     """Accept an upload using the versioned public contract."""
     runtime_status = get_runtime_status()
@@ -320,6 +368,7 @@ async def upload(
 
     request_payload = {
         "remove_silence": remove_silence,
+        "priority": priority,
         "selected_project_presets": list(selected_project_presets),
         "project_name": project_name,
         "project_summary": project_summary,
@@ -332,6 +381,8 @@ async def upload(
         replay = _idempotency_replay("/api/v1/upload", idempotency_key, fingerprint)
         if replay is not None:
             return replay
+    if not processing_svc.has_capacity():
+        raise _queue_full_error("The processing queue is full. Retry the upload later.")
 
     try:
         file_path = file_io.save(file)
@@ -360,15 +411,18 @@ async def upload(
     else:
         message = "OpenAI Whisper API"
 
-    progress_svc.update(record_id, "transcribing", message)
-    background_tasks.add_task(
-        processing_svc.process,
-        file_path,
-        file.filename,
-        record_id,
-        remove_silence,
-        merged_project_context,
-    )
+    try:
+        processing_svc.enqueue(
+            file_path,
+            file.filename,
+            record_id,
+            remove_silence,
+            merged_project_context,
+            priority=priority,
+            message=message,
+        )
+    except QueueFullError as exc:
+        raise _queue_full_error(str(exc)) from exc
     body = {"id": record_id}
     _store_idempotent_response("/api/v1/upload", idempotency_key, fingerprint, body, 200)
     return body
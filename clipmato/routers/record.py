@@ -30,10 +30,10 @@ async def record_detail(
     record_queries=Depends(get_record_query_service),
 ):
     """Show detailed view for a processed record."""
-    records = record_queries.list_recent_records(metadata_svc, progress_svc)
-    record = record_queries.find_record(records, record_id)
+    record = record_queries.get_record(metadata_svc, progress_svc, record_id)
     if record is None:
         raise HTTPException(status_code=404, detail="Record not found")
+    records = record_queries.list_records(metadata_svc, progress_svc)
     return templates.TemplateResponse(
         request,
         "record.html",
@@ -111,6 +111,13 @@ async def delete_record(
             dst.unlink()
         except Exception:
             pass
+    edited = Path(rec["edited_audio"]) if rec.get("edited_audio") else None
+    # only remove edited files the pipeline wrote next to the upload
+    if edited is not None and edited.parent.resolve() == src.parent.resolve() and edited.exists():
+        try:
+            edited.unlink()
+        except Exception:
+            pass
     try:
         emit_event(
             "record.deleted",
@@ -3,7 +3,6 @@ Routes for handling file uploads and rendering upload/index pages.
 """
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     File,
     Form,
@@ -24,6 +23,7 @@ from ..dependencies import (
     get_templates,
 )
 from ..services.eventing import emit_event
+from ..services.processing_queue import PRIORITIES, QueueFullError
 from ..runtime import get_runtime_status
 from ..utils.presentation import workflow_metrics
 
@@ -58,9 +58,9 @@ async def index(
 
 @router.post("/upload")
 async def upload(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     remove_silence: bool = Form(False),
+    priority: str = Form("normal"),
     selected_project_presets: list[str] = Form(default=[]),
     project_name: str = Form(""),
     project_summary: str = Form(""),
@@ -70,13 +70,16 @@ async def upload(
     file_io=Depends(get_file_io_service),
     project_preset_svc=Depends(get_project_preset_service),
     processing_svc=Depends(get_processing_service),
-    progress_svc=Depends(get_progress_service),
 ) -> JSONResponse:
     """Handle uploaded file: save it, enqueue processing, and return a job ID."""
     runtime_status = get_runtime_status()
     blockers = runtime_status.get("blockers", [])
     if blockers:
         return JSONResponse({"detail": blockers[0]}, status_code=400)
+    if priority not in PRIORITIES:
+        return JSONResponse({"detail": f"Unknown priority: {priority}"}, status_code=400)
+    if not processing_svc.has_capacity():
+        return JSONResponse({"detail": "The processing queue is full. Retry the upload later."}, status_code=503)
 
     try:
         file_path = file_io.save(file)
@@ -101,7 +104,6 @@ async def upload(
             "project_prompt_suffix": project_prompt_suffix,
         },
     )
-    progress_svc.update(record_id, "transcribing", message)
     try:
         emit_event(
             "record.uploaded",
@@ -117,14 +119,18 @@ async def upload(
         )
     except Exception:
         pass
-    background_tasks.add_task(
-        processing_svc.process,
-        file_path,
-        file.filename,
-        record_id,
-        remove_silence,
-        merged_project_context,
-    )
+    try:
+        processing_svc.enqueue(
+            file_path,
+            file.filename,
+            record_id,
+            remove_silence,
+            merged_project_context,
+            priority=priority,
+            message=message,
+        )
+    except QueueFullError as exc:
+        return JSONResponse({"detail": str(exc)}, status_code=503)
     return JSONResponse({"id": record_id})
 
 
@@ -0,0 +1,187 @@
+"""In-process fan-out of appended events to live SSE subscribers.
+
+``EventingService.emit_event`` publishes every appended event into the hub,
+which matches it against each subscriber's filters once and pushes it into
+that subscriber's bounded queue. Events appended by other worker processes
+are picked up by a single per-process watcher that stats the event log
+sidecar and reads only the new tail, so idle streams cost nothing and busy
+streams never re-read history.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from . import event_log
+
+logger = logging.getLogger(__name__)
+
+EventPredicate = Callable[[dict[str, Any]], bool]
+
+
+class EventSubscription:
+    """A bounded per-client queue fed by :class:`EventHub`.
+
+    A ``None`` item means the subscriber fell behind and its queue was
+    dropped; the consumer must catch up from the event log from its cursor.
+    """
+
+    def __init__(self, predicate: EventPredicate, *, maxsize: int, start_sequence: int) -> None:
+        self.predicate = predicate
+        self.start_sequence = start_sequence
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=maxsize)
+
+    def _offer(self, event: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self) -> dict[str, Any] | None:
+        return await self.queue.get()
+
+    def nudge(self) -> None:
+        """Ask the consumer to re-check the event log; safe to call from any thread."""
+
+        def _mark() -> None:
+            if self.queue.empty():
+                self.queue.put_nowait(None)
+
+        self.loop.call_soon_threadsafe(_mark)
+
+    def drain(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class EventHub:
+    """Broadcast appended events to in-process subscribers."""
+
+    def __init__(
+        self,
+        path_factory: Callable[[], Path],
+        *,
+        queue_size: int = 1000,
+        poll_seconds: float = 0.5,
+    ) -> None:
+        self._path_factory = path_factory
+        self.queue_size = queue_size
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._subscribers: set[EventSubscription] = set()
+        self._published_sequence: int | None = None
+        self._watcher_task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, predicate: EventPredicate, *, maxsize: int | None = None) -> EventSubscription:
+        """Register a subscriber on the running loop and start the log watcher."""
+        with self._lock:
+            if self._published_sequence is None or not self._subscribers:
+                self._published_sequence = event_log.current_sequence(self._path_factory())
+            subscription = EventSubscription(
+                predicate,
+                maxsize=maxsize or self.queue_size,
+                start_sequence=self._published_sequence,
+            )
+            self._subscribers.add(subscription)
+        self._ensure_watcher()
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Fan out one freshly appended event; safe to call from any thread."""
+        sequence = event.get("sequence")
+        if not isinstance(sequence, int):
+            return
+        with self._lock:
+            if self._published_sequence is None or not self._subscribers:
+                self._published_sequence = max(sequence, self._published_sequence or 0)
+                return
+            if sequence <= self._published_sequence:
+                return
+            if sequence > self._published_sequence + 1:
+                # Another process appended in between; deliver its events first to keep order.
+                self._fan_out_from_log(until_sequence=sequence - 1)
+            self._fan_out([event])
+            self._published_sequence = sequence
+
+    def sync(self) -> None:
+        """Fan out events appended by other processes since the last publish."""
+        head = event_log.current_sequence(self._path_factory())
+        with self._lock:
+            if self._published_sequence is None or not self._subscribers:
+                self._published_sequence = head
+                return
+            if head > self._published_sequence:
+                self._fan_out_from_log(until_sequence=head)
+
+    def _fan_out_from_log(self, *, until_sequence: int) -> None:
+        batch: list[dict[str, Any]] = []
+        for event in event_log.iter_events(self._path_factory(), after_sequence=self._published_sequence or 0):
+            if event["sequence"] > until_sequence:
+                break
+            batch.append(event)
+        self._fan_out(batch)
+        if batch:
+            self._published_sequence = batch[-1]["sequence"]
+
+    def _fan_out(self, events: list[dict[str, Any]]) -> None:
+        closed: list[EventSubscription] = []
+        for subscription in self._subscribers:
+            matched = [event for event in events if subscription.predicate(event)]
+            if not matched:
+                continue
+            try:
+                for event in matched:
+                    subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                closed.append(subscription)
+        for subscription in closed:
+            self._subscribers.discard(subscription)
+
+    def _ensure_watcher(self) -> None:
+        task = self._watcher_task
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            return
+        self._watcher_task = asyncio.get_running_loop().create_task(
+            self._watch(),
+            name="clipmato-event-hub",
+        )
+
+    def _log_signature(self) -> tuple[tuple[int, int, int] | None, ...]:
+        path = self._path_factory()
+        signature: list[tuple[int, int, int] | None] = []
+        for candidate in (event_log.state_path(path), path):
+            try:
+                stat = os.stat(candidate)
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    async def _watch(self) -> None:
+        signature = self._log_signature()
+        while self._subscribers:
+            await asyncio.sleep(self.poll_seconds)
+            current = self._log_signature()
+            if current == signature:
+                continue
+            signature = current
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Event hub failed to catch up with the event log")
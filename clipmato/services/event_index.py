@@ -0,0 +1,162 @@
+"""Incremental secondary indexes over the segmented event log.
+
+The index maps record (record_id or aggregate_id), run, publish job, and
+event type values to the ordered sequences that carry them, plus a compact
+sequence-to-location table. Filtered queries walk the smallest matching
+posting list and read only those lines, so their cost tracks the number of
+matching events rather than the length of the log.
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from . import event_log
+from .event_log import EventLocation
+
+IndexKey = tuple[str, str]
+
+
+def _index_keys(event: dict[str, Any]) -> set[IndexKey]:
+    keys: set[IndexKey] = set()
+    for field in ("record_id", "aggregate_id"):
+        value = event.get(field)
+        if isinstance(value, str) and value:
+            keys.add(("record", value))
+    for kind, field in (("run", "run_id"), ("publish_job", "publish_job_id"), ("type", "type")):
+        value = event.get(field)
+        if isinstance(value, str) and value:
+            keys.add((kind, value))
+    return keys
+
+
+def _tail(postings: array, after_sequence: int) -> array:
+    return postings[bisect_right(postings, after_sequence):]
+
+
+class EventIndex:
+    """In-memory secondary indexes, updated on append and caught up from the log."""
+
+    def __init__(self, path_factory: Callable[[], Path]) -> None:
+        self._path_factory = path_factory
+        self._lock = threading.RLock()
+        self._reset(None)
+
+    def _reset(self, path: Path | None) -> None:
+        self._path = path
+        self._indexed_through = 0
+        self._sequences = array("q")
+        self._segments = array("q")
+        self._offsets = array("q")
+        self._postings: dict[IndexKey, array] = {}
+
+    @property
+    def indexed_through(self) -> int:
+        return self._indexed_through
+
+    def refresh(self) -> None:
+        """Index events appended since the last refresh, rebuilding if the log was replaced."""
+        path = self._path_factory()
+        head = event_log.current_sequence(path)
+        with self._lock:
+            if path != self._path or head < self._indexed_through:
+                self._reset(path)
+            if head <= self._indexed_through:
+                return
+            for location, event in event_log.iter_event_locations(path, after_sequence=self._indexed_through):
+                self._add_unlocked(location, event)
+
+    def add(self, location: EventLocation, event: dict[str, Any]) -> None:
+        """Index one just-appended event when it directly follows the indexed range."""
+        with self._lock:
+            if self._path is None or self._path != self._path_factory():
+                return
+            if event.get("sequence") != self._indexed_through + 1:
+                return  # a foreign append left a gap; the next refresh reads it from the log
+            self._add_unlocked(location, event)
+
+    def _add_unlocked(self, location: EventLocation, event: dict[str, Any]) -> None:
+        sequence = event.get("sequence")
+        if not isinstance(sequence, int) or sequence <= self._indexed_through:
+            return
+        self._sequences.append(sequence)
+        self._segments.append(location.segment)
+        self._offsets.append(location.offset)
+        for key in _index_keys(event):
+            postings = self._postings.get(key)
+            if postings is None:
+                postings = self._postings[key] = array("q")
+            postings.append(sequence)
+        self._indexed_through = sequence
+
+    def _candidates(
+        self,
+        *,
+        after_sequence: int,
+        record_id: str | None,
+        run_id: str | None,
+        publish_job_id: str | None,
+        event_types: Iterable[str] | None,
+    ) -> list[int]:
+        lists: list[Iterable[int]] = []
+        for kind, value in (("record", record_id), ("run", run_id), ("publish_job", publish_job_id)):
+            if value is not None:
+                lists.append(_tail(self._postings.get((kind, value), array("q")), after_sequence))
+        if event_types:
+            merged: set[int] = set()
+            for event_type in event_types:
+                merged.update(_tail(self._postings.get(("type", event_type), array("q")), after_sequence))
+            lists.append(sorted(merged))
+        return list(min(lists, key=len)) if lists else []
+
+    @staticmethod
+    def _locate(sequences: array, segments: array, offsets: array, sequence: int) -> EventLocation | None:
+        position = bisect_right(sequences, sequence) - 1
+        if position < 0 or sequences[position] != sequence:
+            return None
+        return EventLocation(segments[position], offsets[position])
+
+    def query(
+        self,
+        *,
+        after_sequence: int = 0,
+        record_id: str | None = None,
+        run_id: str | None = None,
+        publish_job_id: str | None = None,
+        event_types: list[str] | None = None,
+        matches: Callable[[dict[str, Any]], bool],
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return events after ``after_sequence`` selected through the posting lists.
+
+        Candidates come from the smallest posting list among the given
+        filters; ``matches`` applies the full filter to each candidate read.
+        """
+        self.refresh()
+        with self._lock:
+            candidates = self._candidates(
+                after_sequence=after_sequence,
+                record_id=record_id,
+                run_id=run_id,
+                publish_job_id=publish_job_id,
+                event_types=event_types,
+            )
+            # Arrays only grow until the next reset, which swaps in new ones,
+            # so lookups can run on these references outside the lock.
+            tables = (self._sequences, self._segments, self._offsets)
+        events: list[dict[str, Any]] = []
+        with event_log.SegmentReader(self._path_factory()) as reader:
+            for sequence in candidates:
+                location = self._locate(*tables, sequence)
+                if location is None:
+                    continue
+                event = reader.read(location)
+                if event is None or event.get("sequence") != sequence or not matches(event):
+                    continue
+                events.append(event)
+                if limit is not None and len(events) >= limit:
+                    break
+        return events
@@ -0,0 +1,440 @@
+"""Segmented append-only storage for the workflow event log.
+
+The active segment lives at ``EVENTS_PATH``. Once it grows past the configured
+event or byte budget it is sealed into ``<EVENTS_PATH>.segments/`` under a name
+that records its sequence range. Every segment keeps a sparse
+``<sequence> <byte offset>`` index next to it so readers can seek straight to
+the events after a cursor instead of decoding the whole history.
+
+Callers own locking: :func:`append_event` must run under the event log lock,
+while readers are lock-free and tolerate a concurrent append or rotation.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAX_EVENTS = max(int(os.getenv("CLIPMATO_EVENT_SEGMENT_MAX_EVENTS", "50000")), 1)
+SEGMENT_MAX_BYTES = max(int(os.getenv("CLIPMATO_EVENT_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024))), 1024)
+SPARSE_INDEX_INTERVAL = max(int(os.getenv("CLIPMATO_EVENT_INDEX_INTERVAL", "256")), 1)
+_TAIL_READ_BYTES = 8192
+
+
+@dataclass(frozen=True, slots=True)
+class EventLocation:
+    """Where one event line lives: the segment's first sequence and a byte offset."""
+
+    segment: int
+    offset: int
+
+
+@dataclass(frozen=True, slots=True)
+class SealedSegment:
+    """A rotated, read-only slice of the event log."""
+
+    path: Path
+    first_sequence: int
+    last_sequence: int
+
+
+def segments_dir(path: Path) -> Path:
+    return path.with_name(f"{path.name}.segments")
+
+
+def index_path(segment_path: Path) -> Path:
+    return segment_path.with_suffix(f"{segment_path.suffix}.idx")
+
+
+def state_path(path: Path) -> Path:
+    return path.with_suffix(f"{path.suffix}.seq")
+
+
+def list_sealed_segments(path: Path) -> list[SealedSegment]:
+    """Return sealed segments ordered by sequence range."""
+    directory = segments_dir(path)
+    if not directory.exists():
+        return []
+    segments: list[SealedSegment] = []
+    for candidate in directory.glob("*.jsonl"):
+        first, _, last = candidate.stem.partition("-")
+        try:
+            segments.append(SealedSegment(candidate, int(first), int(last)))
+        except ValueError:
+            logger.warning("Ignoring unrecognized event segment %s", candidate)
+    segments.sort(key=lambda segment: segment.first_sequence)
+    return segments
+
+
+def _parse_line(raw_line: bytes) -> dict[str, Any] | None:
+    line = raw_line.strip()
+    if not line:
+        return None
+    try:
+        event = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logger.exception("Ignoring malformed event line")
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def _read_state(path: Path) -> dict[str, int] | None:
+    sidecar = state_path(path)
+    if not sidecar.exists():
+        return None
+    try:
+        raw = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        logger.warning("Ignoring unreadable event sequence state at %s", sidecar)
+        return None
+    if not isinstance(raw, dict):
+        return None
+    state = {key: raw.get(key) for key in ("sequence", "size", "first_sequence")}
+    if not all(isinstance(value, int) for value in state.values()):
+        return None
+    return state
+
+
+def _write_state(path: Path, *, sequence: int, size: int, first_sequence: int) -> None:
+    """Persist the last appended sequence and the active segment size it was observed at.
+
+    The state file is a cache: it is rewritten without fsync because a lost or
+    stale copy is detected by size mismatch and rebuilt from the log tail.
+    """
+    sidecar = state_path(path)
+    temp_path = sidecar.with_suffix(f"{sidecar.suffix}.tmp")
+    temp_path.write_text(
+        json.dumps({"sequence": sequence, "size": size, "first_sequence": first_sequence}),
+        encoding="utf-8",
+    )
+    os.replace(temp_path, sidecar)
+
+
+def _tail_sequence(path: Path) -> int | None:
+    """Return the sequence of the last complete line, 0 when empty, or None when torn."""
+    if not path.exists():
+        return 0
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        buffer = b""
+        while position > 0:
+            read_size = min(_TAIL_READ_BYTES, position)
+            position -= read_size
+            handle.seek(position)
+            buffer = handle.read(read_size) + buffer
+            stripped = buffer.rstrip()
+            if not stripped:
+                continue
+            newline = stripped.rfind(b"\n")
+            if newline < 0 and position > 0:
+                continue
+            try:
+                event = json.loads(stripped[newline + 1 :])
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                return None
+            value = event.get("sequence") if isinstance(event, dict) else None
+            return value if isinstance(value, int) else None
+    return 0
+
+
+def _head_sequence(path: Path) -> int | None:
+    """Return the sequence of the first event in a segment, if any."""
+    if not path.exists():
+        return None
+    with path.open("rb") as handle:
+        return _segment_head(handle)
+
+
+def _scan_last_sequence(path: Path) -> int:
+    sequence = 0
+    if path.exists():
+        with path.open("rb") as handle:
+            for raw_line in handle:
+                event = _parse_line(raw_line)
+                if event is not None and isinstance(event.get("sequence"), int):
+                    sequence = max(sequence, event["sequence"])
+    return sequence
+
+
+def _resolve_state(path: Path) -> dict[str, int]:
+    """Return the sequence state of the active segment without scanning history.
+
+    The sidecar is trusted only when it matches the active segment size;
+    otherwise the last line is read from the tail, falling back to the newest
+    sealed segment for an empty active segment and to a full scan of the
+    active segment only for a torn tail.
+    """
+    size = path.stat().st_size if path.exists() else 0
+    state = _read_state(path)
+    if state is not None and state["size"] == size:
+        return state
+
+    sequence = _tail_sequence(path)
+    if sequence is None:
+        logger.warning("Rebuilding event sequence from a full scan of %s", path)
+        sequence = _scan_last_sequence(path)
+    if not sequence:
+        sealed = list_sealed_segments(path)
+        sequence = sealed[-1].last_sequence if sealed else 0
+    first_sequence = _head_sequence(path)
+    return {
+        "sequence": sequence,
+        "size": size,
+        "first_sequence": first_sequence if first_sequence is not None else sequence + 1,
+    }
+
+
+def current_sequence(path: Path) -> int:
+    """Return the last assigned sequence.
+
+    Appenders must hold the log lock; lock-free readers get a snapshot that
+    may trail a concurrent append.
+    """
+    return _resolve_state(path)["sequence"]
+
+
+def _append_line(path: Path, event: dict[str, Any]) -> tuple[int, int]:
+    line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+    with path.open("ab+") as handle:
+        handle.seek(0, os.SEEK_END)
+        if handle.tell() > 0:
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                # Terminate a torn line from an interrupted writer so this event stays parseable.
+                handle.write(b"\n")
+        offset = handle.tell()
+        handle.write(line)
+        return offset, handle.tell()
+
+
+def _seal_active_segment(path: Path, *, first_sequence: int, last_sequence: int) -> None:
+    directory = segments_dir(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{first_sequence:012d}-{last_sequence:012d}{path.suffix}"
+    os.replace(path, target)
+    active_index = index_path(path)
+    if active_index.exists():
+        os.replace(active_index, index_path(target))
+    logger.info("Sealed event segment %s", target.name)
+
+
+def append_event(
+    path: Path,
+    build_event: Callable[[int], dict[str, Any]],
+) -> tuple[dict[str, Any], EventLocation]:
+    """Assign the next sequence, append the event, index it, and rotate if needed.
+
+    ``build_event`` receives the assigned sequence and returns the event to
+    store together with where it was written. Callers must hold the event
+    log lock.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state = _resolve_state(path)
+    sequence = state["sequence"] + 1
+    first_sequence = state["first_sequence"] if state["size"] else sequence
+    event = build_event(sequence)
+    offset, size = _append_line(path, event)
+
+    if (sequence - first_sequence) % SPARSE_INDEX_INTERVAL == 0:
+        with index_path(path).open("a", encoding="utf-8") as handle:
+            handle.write(f"{sequence} {offset}\n")
+
+    location_segment = first_sequence
+    if size >= SEGMENT_MAX_BYTES or sequence - first_sequence + 1 >= SEGMENT_MAX_EVENTS:
+        _seal_active_segment(path, first_sequence=first_sequence, last_sequence=sequence)
+        size, first_sequence = 0, sequence + 1
+    try:
+        _write_state(path, sequence=sequence, size=size, first_sequence=first_sequence)
+    except OSError:
+        logger.exception("Failed to persist event sequence state for %s", path)
+    return event, EventLocation(segment=location_segment, offset=offset)
+
+
+def _read_sparse_index(segment_path: Path) -> tuple[list[int], list[int]]:
+    sequences: list[int] = []
+    offsets: list[int] = []
+    path = index_path(segment_path)
+    if not path.exists():
+        return sequences, offsets
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return sequences, offsets
+    for line in lines:
+        sequence, _, offset = line.partition(" ")
+        try:
+            sequences.append(int(sequence))
+            offsets.append(int(offset))
+        except ValueError:
+            continue
+    return sequences, offsets
+
+
+def _seek_after(handle: BinaryIO, segment_path: Path, after_sequence: int) -> None:
+    """Position ``handle`` at the closest indexed event not after ``after_sequence + 1``."""
+    sequences, offsets = _read_sparse_index(segment_path)
+    position = bisect_right(sequences, after_sequence + 1) - 1
+    if position < 0:
+        handle.seek(0)
+        return
+    handle.seek(offsets[position])
+    event = _parse_line(handle.readline())
+    if event is None or event.get("sequence") != sequences[position]:
+        # The index is stale (for example after a crash mid-rotation); fall back to a scan.
+        handle.seek(0)
+        return
+    handle.seek(offsets[position])
+
+
+def _iter_segment(
+    handle: BinaryIO,
+    segment_path: Path,
+    after_sequence: int,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    _seek_after(handle, segment_path, after_sequence)
+    while True:
+        offset = handle.tell()
+        raw_line = handle.readline()
+        if not raw_line.endswith(b"\n"):
+            break  # end of segment, or an append is still in flight; the next read picks it up
+        event = _parse_line(raw_line)
+        if event is None:
+            continue
+        sequence = event.get("sequence")
+        if isinstance(sequence, int) and sequence > after_sequence:
+            yield offset, event
+
+
+def _segment_head(handle: BinaryIO) -> int | None:
+    handle.seek(0)
+    for raw_line in handle:
+        event = _parse_line(raw_line)
+        if event is not None and isinstance(event.get("sequence"), int):
+            return event["sequence"]
+    return None
+
+
+def iter_event_locations(
+    path: Path,
+    *,
+    after_sequence: int = 0,
+) -> Iterator[tuple[EventLocation, dict[str, Any]]]:
+    """Yield ``(location, event)`` pairs after ``after_sequence`` in log order."""
+    # Open the active segment before listing sealed ones: if it is rotated in
+    # between, its events are read from the sealed copy and skipped here.
+    try:
+        active = path.open("rb")
+    except FileNotFoundError:
+        active = None
+    cursor = after_sequence
+    try:
+        for segment in list_sealed_segments(path):
+            if segment.last_sequence <= cursor:
+                continue
+            try:
+                with segment.path.open("rb") as handle:
+                    for offset, event in _iter_segment(handle, segment.path, cursor):
+                        cursor = event["sequence"]
+                        yield EventLocation(segment.first_sequence, offset), event
+            except FileNotFoundError:
+                continue  # pruned while reading
+        if active is not None:
+            head = _segment_head(active)
+            if head is None:
+                return
+            for offset, event in _iter_segment(active, path, cursor):
+                cursor = event["sequence"]
+                yield EventLocation(head, offset), event
+    finally:
+        if active is not None:
+            active.close()
+
+
+def iter_events(path: Path, *, after_sequence: int = 0) -> Iterator[dict[str, Any]]:
+    """Yield events with a sequence greater than ``after_sequence`` in log order."""
+    for _location, event in iter_event_locations(path, after_sequence=after_sequence):
+        yield event
+
+
+class SegmentReader:
+    """Read individual events by location, keeping segment handles open."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handles: dict[int, BinaryIO | None] = {}
+        self._sealed: dict[int, Path] | None = None
+
+    def __enter__(self) -> "SegmentReader":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            if handle is not None:
+                handle.close()
+        self._handles.clear()
+
+    def _open(self, segment: int) -> BinaryIO | None:
+        if segment in self._handles:
+            return self._handles[segment]
+        handle: BinaryIO | None = None
+        try:
+            active = self.path.open("rb")
+        except FileNotFoundError:
+            active = None
+        if active is not None and _segment_head(active) == segment:
+            handle = active
+        else:
+            if active is not None:
+                active.close()
+            if self._sealed is None or segment not in self._sealed:
+                self._sealed = {item.first_sequence: item.path for item in list_sealed_segments(self.path)}
+            sealed_path = self._sealed.get(segment)
+            if sealed_path is not None:
+                try:
+                    handle = sealed_path.open("rb")
+                except FileNotFoundError:
+                    handle = None
+        self._handles[segment] = handle
+        return handle
+
+    def read(self, location: EventLocation) -> dict[str, Any] | None:
+        """Return the event stored at ``location``, or None if it was pruned."""
+        handle = self._open(location.segment)
+        if handle is None:
+            return None
+        handle.seek(location.offset)
+        raw_line = handle.readline()
+        if not raw_line.endswith(b"\n"):
+            return None
+        return _parse_line(raw_line)
+
+
+def prune_segments(path: Path, *, before_sequence: int, retain_segments: int = 0) -> list[SealedSegment]:
+    """Delete sealed segments that end before ``before_sequence``.
+
+    The newest ``retain_segments`` sealed segments are always kept. Callers
+    should hold the event log lock.
+    """
+    segments = list_sealed_segments(path)
+    candidates = segments[: len(segments) - retain_segments] if retain_segments > 0 else segments
+    removed: list[SealedSegment] = []
+    for segment in candidates:
+        if segment.last_sequence >= before_sequence:
+            break
+        for target in (segment.path, index_path(segment.path)):
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                pass
+        removed.append(segment)
+    return removed
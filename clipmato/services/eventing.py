@@ -3,8 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import copy
-import hashlib
-import hmac
+import itertools
 import json
 import logging
 import os
@@ -14,19 +13,33 @@ from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, AsyncIterator
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
 from uuid import uuid4
 
 from .. import config as app_config
+from . import event_log
+from .event_hub import EventHub, EventSubscription
+from .event_index import EventIndex
+from .webhook_delivery import WebhookHttpClient, build_delivery
 
 logger = logging.getLogger(__name__)
 
 EVENT_STREAM_POLL_SECONDS = max(float(os.getenv("CLIPMATO_EVENT_STREAM_POLL_SECONDS", "0.5")), 0.1)
-WEBHOOK_POLL_SECONDS = max(float(os.getenv("CLIPMATO_WEBHOOK_POLL_SECONDS", "1.0")), 0.1)
+EVENT_STREAM_QUEUE_SIZE = max(int(os.getenv("CLIPMATO_EVENT_STREAM_QUEUE_SIZE", "1000")), 1)
+EVENT_STREAM_CATCHUP_PAGE_SIZE = 500
+# The webhook worker wakes on appended events; this poll is only a safety net.
+WEBHOOK_POLL_SECONDS = max(float(os.getenv("CLIPMATO_WEBHOOK_POLL_SECONDS", "30")), 0.1)
 WEBHOOK_MAX_ATTEMPTS = max(int(os.getenv("CLIPMATO_WEBHOOK_MAX_ATTEMPTS", "3")), 1)
 WEBHOOK_DELIVERY_TIMEOUT_SECONDS = max(float(os.getenv("CLIPMATO_WEBHOOK_TIMEOUT_SECONDS", "10")), 1.0)
+WEBHOOK_MAX_CONCURRENCY = max(int(os.getenv("CLIPMATO_WEBHOOK_MAX_CONCURRENCY", "8")), 1)
+WEBHOOK_MAX_BATCH_SIZE = 500
+WEBHOOK_CHECKPOINT_EVENTS = max(int(os.getenv("CLIPMATO_WEBHOOK_CHECKPOINT_EVENTS", "200")), 1)
+WEBHOOK_DELIVERY_WINDOW = max(int(os.getenv("CLIPMATO_WEBHOOK_DELIVERY_WINDOW", "5000")), 1)
+EVENT_RETAIN_SEGMENTS = (
+    max(int(os.environ["CLIPMATO_EVENT_RETAIN_SEGMENTS"]), 0)
+    if os.getenv("CLIPMATO_EVENT_RETAIN_SEGMENTS")
+    else None
+)
 
 
 def _events_path() -> Path:
@@ -87,47 +100,6 @@ def _write_json_file(path: Path, data: Any) -> None:
         raise
 
 
-def _read_event_lines() -> list[dict[str, Any]]:
-    path = _events_path()
-    if not path.exists():
-        return []
-    events: list[dict[str, Any]] = []
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            for raw_line in handle:
-                line = raw_line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                except json.JSONDecodeError:
-                    logger.exception("Ignoring malformed event line")
-                    continue
-                if isinstance(event, dict):
-                    events.append(event)
-    except Exception:
-        logger.exception("Failed to read event log from %s", path)
-    return events
-
-
-def _next_event_sequence(events: list[dict[str, Any]]) -> int:
-    sequence = 0
-    for event in reversed(events):
-        value = event.get("sequence")
-        if isinstance(value, int) and value > sequence:
-            sequence = value
-            break
-    return sequence + 1
-
-
-def _append_event_line(event: dict[str, Any]) -> None:
-    path = _events_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(event, separators=(",", ":")))
-        handle.write("\n")
-
-
 def _read_webhooks() -> list[dict[str, Any]]:
     raw = _read_json_file(_webhooks_path(), [])
     if not isinstance(raw, list):
@@ -143,6 +115,7 @@ def _normalize_webhook(raw: dict[str, Any]) -> dict[str, Any]:
     webhook = copy.deepcopy(raw)
     webhook.setdefault("event_types", [])
     webhook.setdefault("enabled", True)
+    webhook.setdefault("batch_size", 1)
     webhook.setdefault("last_delivered_sequence", 0)
     webhook.setdefault("delivery_attempts", 0)
     webhook.setdefault("last_delivery_at", None)
@@ -173,17 +146,25 @@ def _match_filters(
     return True
 
 
-def _resolve_sequence(events: list[dict[str, Any]], event_id: str) -> int | None:
-    for event in events:
+def _resolve_sequence(event_id: str) -> int | None:
+    for event in event_log.iter_events(_events_path()):
         if event.get("event_id") == event_id:
             value = event.get("sequence")
             return value if isinstance(value, int) else None
     return None
 
 
-def _build_signature(body: bytes, secret: str) -> str:
-    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
-    return f"sha256={digest}"
+def _delivered_state(cursor: int) -> dict[str, Any]:
+    return {
+        "last_delivered_sequence": cursor,
+        "last_delivery_at": _now_iso(),
+        "delivery_attempts": 0,
+        "last_failed_sequence": None,
+        "last_failed_event_id": None,
+        "last_error": None,
+        "dead_lettered_at": None,
+        "dead_letter_reason": None,
+    }
 
 
 def _validate_webhook_url(url: str) -> str:
@@ -199,6 +180,22 @@ class EventingService:
     def __init__(self) -> None:
         self._worker_task: asyncio.Task | None = None
         self._stop_event: asyncio.Event | None = None
+        self._hub = EventHub(
+            _events_path,
+            queue_size=EVENT_STREAM_QUEUE_SIZE,
+            poll_seconds=EVENT_STREAM_POLL_SECONDS,
+        )
+        self._index = EventIndex(_events_path)
+        self._worker_subscription: EventSubscription | None = None
+        self._webhooks_active = True
+        self._http_client = WebhookHttpClient(
+            timeout=WEBHOOK_DELIVERY_TIMEOUT_SECONDS,
+            max_connections=WEBHOOK_MAX_CONCURRENCY,
+        )
+
+    def warm(self) -> None:
+        """Build the secondary event indexes from the log."""
+        self._index.refresh()
 
     def emit_event(
         self,
@@ -223,10 +220,14 @@ class EventingService:
                 publish_job_id=publish_job_id,
                 source=source,
             )
-            return record
         except Exception:
             logger.exception("Failed to append event '%s'", event_type)
             return None
+        try:
+            self._hub.publish(record)
+        except Exception:
+            logger.exception("Failed to publish event '%s' to live subscribers", event_type)
+        return copy.deepcopy(record)
 
     def _append_event(
         self,
@@ -244,11 +245,10 @@ class EventingService:
         if scope_id is None:
             raise ValueError("An aggregate_id, record_id, run_id, or publish_job_id is required")
 
-        with _locked_file(_events_path()):
-            events = _read_event_lines()
-            event = {
+        def _build(sequence: int) -> dict[str, Any]:
+            return {
                 "event_id": uuid4().hex,
-                "sequence": _next_event_sequence(events),
+                "sequence": sequence,
                 "aggregate_id": scope_id,
                 "record_id": record_id,
                 "run_id": run_id,
@@ -260,8 +260,12 @@ class EventingService:
                 "schema_version": 1,
                 "source": source,
             }
-            _append_event_line(event)
-            return copy.deepcopy(event)
+
+        path = _events_path()
+        with _locked_file(path):
+            event, location = event_log.append_event(path, _build)
+        self._index.add(location, event)
+        return event
 
     def list_events(
         self,
@@ -273,22 +277,27 @@ class EventingService:
         event_types: list[str] | None = None,
         limit: int | None = None,
     ) -> list[dict[str, Any]]:
-        events = [
-            event
-            for event in _read_event_lines()
-            if isinstance(event.get("sequence"), int)
-            and event["sequence"] > after_sequence
-            and _match_filters(
-                event,
-                record_id=record_id,
-                run_id=run_id,
-                publish_job_id=publish_job_id,
-                event_types=event_types,
+        if limit is not None and limit <= 0:
+            return []
+        filters = {
+            "record_id": record_id,
+            "run_id": run_id,
+            "publish_job_id": publish_job_id,
+            "event_types": event_types,
+        }
+        if any(value is not None for value in (record_id, run_id, publish_job_id)) or event_types:
+            return self._index.query(
+                after_sequence=after_sequence,
+                matches=lambda event: _match_filters(event, **filters),
+                limit=limit,
+                **filters,
             )
-        ]
-        if limit is not None:
-            events = events[: max(limit, 0)]
-        return copy.deepcopy(events)
+        events: list[dict[str, Any]] = []
+        for event in event_log.iter_events(_events_path(), after_sequence=after_sequence):
+            events.append(event)
+            if limit is not None and len(events) >= limit:
+                break
+        return events
 
     async def stream_events(
         self,
@@ -299,21 +308,43 @@ class EventingService:
         publish_job_id: str | None = None,
         event_types: list[str] | None = None,
     ) -> AsyncIterator[dict[str, Any]]:
-        cursor = after_sequence
-        while True:
-            batch = self.list_events(
-                after_sequence=cursor,
-                record_id=record_id,
-                run_id=run_id,
-                publish_job_id=publish_job_id,
-                event_types=event_types,
-            )
-            if batch:
-                for event in batch:
-                    cursor = int(event["sequence"])
-                    yield event
-            else:
-                await asyncio.sleep(EVENT_STREAM_POLL_SECONDS)
+        """Yield matching events after ``after_sequence``, then live events as they are appended.
+
+        The backlog is read from the event log once; afterwards events arrive
+        through the in-process hub and the log is only re-read if this
+        subscriber falls further behind than its queue allows.
+        """
+        filters = {
+            "record_id": record_id,
+            "run_id": run_id,
+            "publish_job_id": publish_job_id,
+            "event_types": event_types,
+        }
+        subscription = self._hub.subscribe(lambda event: _match_filters(event, **filters))
+        try:
+            cursor = after_sequence
+            catch_up = True
+            while True:
+                while catch_up:
+                    batch = self.list_events(
+                        after_sequence=cursor,
+                        limit=EVENT_STREAM_CATCHUP_PAGE_SIZE,
+                        **filters,
+                    )
+                    for event in batch:
+                        cursor = int(event["sequence"])
+                        yield event
+                    catch_up = len(batch) >= EVENT_STREAM_CATCHUP_PAGE_SIZE
+                event = await subscription.get()
+                if event is None:
+                    catch_up = True
+                    continue
+                if event["sequence"] <= cursor:
+                    continue
+                cursor = int(event["sequence"])
+                yield copy.deepcopy(event)
+        finally:
+            self._hub.unsubscribe(subscription)
 
     def register_webhook(
         self,
@@ -325,8 +356,11 @@ class EventingService:
         run_id: str | None = None,
         publish_job_id: str | None = None,
         enabled: bool = True,
+        batch_size: int = 1,
     ) -> dict[str, Any]:
         validated_url = _validate_webhook_url(url)
+        if not 1 <= batch_size <= WEBHOOK_MAX_BATCH_SIZE:
+            raise ValueError(f"Webhook batch_size must be between 1 and {WEBHOOK_MAX_BATCH_SIZE}")
         webhook = {
             "webhook_id": uuid4().hex,
             "url": validated_url,
@@ -336,6 +370,7 @@ class EventingService:
             "run_id": run_id,
             "publish_job_id": publish_job_id,
             "enabled": enabled,
+            "batch_size": batch_size,
             "created_at": _now_iso(),
             "updated_at": _now_iso(),
             "last_delivered_sequence": 0,
@@ -352,7 +387,9 @@ class EventingService:
             webhooks.append(webhook)
             return copy.deepcopy(webhook)
 
-        return self._mutate_webhooks(_mutate)
+        registered = self._mutate_webhooks(_mutate)
+        self._wake_worker()
+        return registered
 
     def list_webhooks(self) -> list[dict[str, Any]]:
         return [_normalize_webhook(webhook) for webhook in _read_webhooks()]
@@ -380,9 +417,8 @@ class EventingService:
         from_sequence: int | None = None,
         from_event_id: str | None = None,
     ) -> dict[str, Any]:
-        events = _read_event_lines()
         if from_sequence is None and from_event_id is not None:
-            from_sequence = _resolve_sequence(events, from_event_id)
+            from_sequence = _resolve_sequence(from_event_id)
         webhook = self.get_webhook(webhook_id)
         if webhook is None:
             raise KeyError(webhook_id)
@@ -407,46 +443,135 @@ class EventingService:
             raise KeyError(webhook_id)
 
         updated = self._mutate_webhooks(_mutate)
+        self._wake_worker()
         return updated
 
-    async def deliver_pending_webhooks_once(self) -> None:
-        events = _read_event_lines()
-        for webhook in self.list_webhooks():
-            if not webhook.get("enabled", True):
-                continue
-            if webhook.get("dead_lettered_at"):
-                continue
-
-            cursor = int(webhook.get("last_delivered_sequence") or 0)
-            pending = [
-                event
-                for event in events
-                if isinstance(event.get("sequence"), int)
-                and event["sequence"] > cursor
-                and _match_filters(
-                    event,
-                    record_id=webhook.get("record_id"),
-                    run_id=webhook.get("run_id"),
-                    publish_job_id=webhook.get("publish_job_id"),
-                    event_types=list(webhook.get("event_types") or []),
-                )
-            ]
-            for event in pending:
-                delivered = await self._deliver_event_with_retries(webhook, event)
-                if not delivered:
-                    break
-                cursor = int(event["sequence"])
-                self._update_webhook_delivery_state(
-                    webhook["webhook_id"],
-                    last_delivered_sequence=cursor,
-                    last_delivery_at=_now_iso(),
-                    delivery_attempts=0,
-                    last_failed_sequence=None,
-                    last_failed_event_id=None,
-                    last_error=None,
-                    dead_lettered_at=None,
-                    dead_letter_reason=None,
-                )
+    async def deliver_pending_webhooks_once(self) -> int:
+        """Deliver one window of pending events to every active webhook.
+
+        Endpoints run concurrently up to ``CLIPMATO_WEBHOOK_MAX_CONCURRENCY``
+        while each endpoint receives its events in order, one event or one
+        opt-in batch per request. Cursors are checkpointed every
+        ``CLIPMATO_WEBHOOK_CHECKPOINT_EVENTS`` events and once at the end of
+        the pass. Returns the number of events delivered.
+        """
+        delivered, _progressed = await self._deliver_pending_window()
+        return delivered
+
+    async def _deliver_pending_window(self) -> tuple[int, bool]:
+        """
+        Run one delivery pass; return the delivered count and whether any
+        webhook's cursor or delivery state moved. Filtered-out events advance
+        cursors without counting as deliveries, so callers that drain a
+        backlog must loop on the second value.
+        """
+        webhooks = [
+            webhook
+            for webhook in self.list_webhooks()
+            if webhook.get("enabled", True) and not webhook.get("dead_lettered_at")
+        ]
+        self._webhooks_active = bool(webhooks)
+        if not webhooks:
+            return 0, False
+        floor = min(int(webhook.get("last_delivered_sequence") or 0) for webhook in webhooks)
+        events = list(
+            itertools.islice(
+                event_log.iter_events(_events_path(), after_sequence=floor),
+                WEBHOOK_DELIVERY_WINDOW,
+            )
+        )
+        if not events:
+            return 0, False
+        semaphore = asyncio.Semaphore(WEBHOOK_MAX_CONCURRENCY)
+
+        async def _bounded(webhook: dict[str, Any]) -> int:
+            async with semaphore:
+                return await self._deliver_to_webhook(webhook, events)
+
+        results = await asyncio.gather(*(_bounded(webhook) for webhook in webhooks))
+        checkpoints = {webhook["webhook_id"]: updates for webhook, (_count, updates) in zip(webhooks, results) if updates}
+        if checkpoints:
+            self._apply_delivery_updates(checkpoints)
+        return sum(count for count, _updates in results), bool(checkpoints)
+
+    async def _deliver_to_webhook(
+        self,
+        webhook: dict[str, Any],
+        events: list[dict[str, Any]],
+    ) -> tuple[int, dict[str, Any] | None]:
+        """Deliver pending events to one endpoint; return the count and its final state update."""
+        cursor = int(webhook.get("last_delivered_sequence") or 0)
+        pending = [
+            event
+            for event in events
+            if event["sequence"] > cursor
+            and _match_filters(
+                event,
+                record_id=webhook.get("record_id"),
+                run_id=webhook.get("run_id"),
+                publish_job_id=webhook.get("publish_job_id"),
+                event_types=list(webhook.get("event_types") or []),
+            )
+        ]
+        # Skipping non-matching events still advances the cursor past this window.
+        window_end = events[-1]["sequence"]
+        batch_size = max(int(webhook.get("batch_size") or 1), 1)
+        delivered = 0
+        unsaved = 0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            failure = await self._deliver_batch_with_retries(webhook, batch)
+            if failure is not None:
+                return delivered, {"last_delivered_sequence": cursor, **failure}
+            cursor = int(batch[-1]["sequence"])
+            delivered += len(batch)
+            unsaved += len(batch)
+            if unsaved >= WEBHOOK_CHECKPOINT_EVENTS:
+                self._apply_delivery_updates({webhook["webhook_id"]: _delivered_state(cursor)})
+                unsaved = 0
+        if unsaved or cursor < window_end:
+            return delivered, _delivered_state(max(cursor, window_end))
+        return delivered, None
+
+    def _apply_delivery_updates(self, updates_by_webhook: dict[str, dict[str, Any]]) -> None:
+        """Persist delivery state for several webhooks in one write."""
+
+        def _mutate(webhooks: list[dict[str, Any]]) -> None:
+            for webhook in webhooks:
+                updates = updates_by_webhook.get(webhook.get("webhook_id"))
+                if updates is not None:
+                    webhook.update(copy.deepcopy(updates))
+                    webhook["updated_at"] = _now_iso()
+
+        self._mutate_webhooks(_mutate)
+
+    def compact_events(self, *, retain_segments: int | None = None) -> list[dict[str, int]]:
+        """Delete sealed event segments that every active webhook has already consumed.
+
+        ``retain_segments`` keeps the newest sealed segments regardless of
+        webhook progress; it defaults to ``CLIPMATO_EVENT_RETAIN_SEGMENTS``.
+        """
+        if retain_segments is None:
+            if EVENT_RETAIN_SEGMENTS is None:
+                return []
+            retain_segments = EVENT_RETAIN_SEGMENTS
+        path = _events_path()
+        with _locked_file(path):
+            floor = event_log.current_sequence(path) + 1
+            for webhook in self.list_webhooks():
+                if webhook.get("enabled", True) and not webhook.get("dead_lettered_at"):
+                    floor = min(floor, int(webhook.get("last_delivered_sequence") or 0) + 1)
+            removed = event_log.prune_segments(path, before_sequence=floor, retain_segments=max(retain_segments, 0))
+        for segment in removed:
+            logger.info(
+                "Pruned event segment %s-%s",
+                segment.first_sequence,
+                segment.last_sequence,
+            )
+        return [
+            {"first_sequence": segment.first_sequence, "last_sequence": segment.last_sequence}
+            for segment in removed
+        ]
 
     async def start_worker(self) -> None:
         if self._worker_task and not self._worker_task.done():
@@ -465,24 +590,55 @@ class EventingService:
                 pass
         self._worker_task = None
         self._stop_event = None
+        await self._http_client.aclose()
+
+    def _wake_worker(self) -> None:
+        subscription = self._worker_subscription
+        self._webhooks_active = True
+        if subscription is not None:
+            try:
+                subscription.nudge()
+            except RuntimeError:
+                pass  # the worker loop has already shut down
+
+    async def _wait_for_wakeup(self, subscription: EventSubscription) -> None:
+        """Sleep until an event is appended, the worker stops, or the safety poll elapses."""
+        assert self._stop_event is not None
+        waiters = {
+            asyncio.ensure_future(subscription.get()),
+            asyncio.ensure_future(self._stop_event.wait()),
+        }
+        try:
+            await asyncio.wait(waiters, timeout=WEBHOOK_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        subscription.drain()
 
     async def _worker_loop(self) -> None:
         logger.info("Clipmato eventing worker started")
+        # Appends in this process and, through the hub's log watcher, in other
+        # processes wake the worker while any webhook is active.
+        subscription = self._hub.subscribe(lambda _event: self._webhooks_active, maxsize=1)
+        self._worker_subscription = subscription
         try:
             if self._stop_event is None:
                 return
             while not self._stop_event.is_set():
                 try:
-                    await self.deliver_pending_webhooks_once()
+                    _delivered, progressed = await self._deliver_pending_window()
+                    if progressed:
+                        continue  # more may be pending beyond this delivery window
+                    self.compact_events()
                 except Exception:
                     logger.exception("Eventing worker iteration failed")
-                try:
-                    await asyncio.wait_for(self._stop_event.wait(), timeout=WEBHOOK_POLL_SECONDS)
-                except asyncio.TimeoutError:
-                    continue
+                await self._wait_for_wakeup(subscription)
         except asyncio.CancelledError:
             logger.info("Clipmato eventing worker stopped")
             raise
+        finally:
+            self._worker_subscription = None
+            self._hub.unsubscribe(subscription)
 
     def _mutate_webhooks(self, mutator):
         with _locked_file(_webhooks_path()):
@@ -491,68 +647,43 @@ class EventingService:
             _write_webhooks(webhooks)
             return copy.deepcopy(result)
 
-    def _update_webhook_delivery_state(self, webhook_id: str, **updates: Any) -> None:
-        def _mutate(webhooks: list[dict[str, Any]]) -> None:
-            for webhook in webhooks:
-                if webhook.get("webhook_id") == webhook_id:
-                    webhook.update(copy.deepcopy(updates))
-                    webhook["updated_at"] = _now_iso()
-                    return
-
-        self._mutate_webhooks(_mutate)
-
-    async def _deliver_event_with_retries(self, webhook: dict[str, Any], event: dict[str, Any]) -> bool:
-        payload = json.dumps(event, separators=(",", ":")).encode("utf-8")
-        secret = str(webhook.get("secret") or "")
+    async def _deliver_batch_with_retries(
+        self,
+        webhook: dict[str, Any],
+        events: list[dict[str, Any]],
+    ) -> dict[str, Any] | None:
+        """Deliver one request with retries; return the dead-letter state on failure."""
+        body, headers = build_delivery(
+            events,
+            str(webhook.get("secret") or ""),
+            batched=int(webhook.get("batch_size") or 1) > 1,
+        )
         last_error: str | None = None
         for attempt in range(1, WEBHOOK_MAX_ATTEMPTS + 1):
             try:
-                await asyncio.to_thread(self._send_webhook_request, webhook["url"], payload, secret, event)
-                return True
+                status = await self._http_client.post(webhook["url"], body=body, headers=headers)
+                if status < 200 or status >= 300:
+                    raise RuntimeError(f"Unexpected webhook response status: {status}")
+                return None
             except Exception as exc:
-                last_error = str(exc)
+                last_error = str(exc) or exc.__class__.__name__
                 logger.warning(
                     "Webhook delivery failed for %s (attempt %s/%s): %s",
                     webhook.get("webhook_id"),
                     attempt,
                     WEBHOOK_MAX_ATTEMPTS,
-                    exc,
-                )
-                self._update_webhook_delivery_state(
-                    webhook["webhook_id"],
-                    delivery_attempts=attempt,
-                    last_failed_sequence=int(event.get("sequence") or 0),
-                    last_failed_event_id=event.get("event_id"),
-                    last_error=last_error,
+                    last_error,
                 )
                 if attempt < WEBHOOK_MAX_ATTEMPTS:
                     await asyncio.sleep(min(2 ** (attempt - 1), 10))
-        self._update_webhook_delivery_state(
-            webhook["webhook_id"],
-            dead_lettered_at=_now_iso(),
-            dead_letter_reason=last_error or "delivery_failed",
-        )
-        return False
-
-    def _send_webhook_request(
-        self,
-        url: str,
-        payload: bytes,
-        secret: str,
-        event: dict[str, Any],
-    ) -> None:
-        headers = {
-            "Content-Type": "application/json",
-            "X-Clipmato-Event-Id": str(event.get("event_id") or ""),
-            "X-Clipmato-Event-Type": str(event.get("type") or ""),
-            "X-Clipmato-Event-Sequence": str(event.get("sequence") or ""),
-            "X-Clipmato-Signature": _build_signature(payload, secret),
+        return {
+            "delivery_attempts": WEBHOOK_MAX_ATTEMPTS,
+            "last_failed_sequence": int(events[0].get("sequence") or 0),
+            "last_failed_event_id": events[0].get("event_id"),
+            "last_error": last_error,
+            "dead_lettered_at": _now_iso(),
+            "dead_letter_reason": last_error or "delivery_failed",
         }
-        request = Request(url, data=payload, headers=headers, method="POST")
-        with urlopen(request, timeout=WEBHOOK_DELIVERY_TIMEOUT_SECONDS) as response:
-            status = getattr(response, "status", 200)
-            if status < 200 or status >= 300:
-                raise RuntimeError(f"Unexpected webhook response status: {status}")
 
 
 eventing_service = EventingService()
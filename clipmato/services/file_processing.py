@@ -4,19 +4,22 @@ import asyncio
 import logging
 from uuid import uuid4
 from datetime import UTC, datetime
+from pathlib import Path
 
-from ..steps.transcription import transcribe_audio
+from ..steps.transcription import transcribe_record_audio
 from ..steps.description_generation import generate_descriptions_with_prompt_async
 from ..steps.entity_extraction import extract_entities_with_prompt_async
 from ..steps.title_suggestion import propose_titles_with_prompt_async
 from ..steps.script_generation import generate_script_with_prompt_async
-from ..steps.audio_editing import edit_audio_async
+from ..steps.audio_editing import edit_audio
 from ..steps.distribution import distribute_with_prompt_async
 from ..utils.progress import update_progress
 from ..services.eventing import emit_event
-from ..utils.metadata import append_metadata
+from ..utils.media_probe import media_payload
+from ..utils.metadata import append_metadata, get_metadata_record_view
+from ..utils.pipeline_checkpoints import claim, delete_checkpoint, load_checkpoint, save_checkpoint
 from ..utils.project_context import normalize_project_context
-from ..steps.silence_removal import remove_silence as remove_silence_step
+from ..steps.silence_removal import find_keep_intervals
 from typing import Any
 from ..orchestrator import Step, Pipeline
 
@@ -26,14 +29,52 @@ async def process_file_async(
     record_id: str | None = None,
     remove_silence: bool = False,
     project_context: dict[str, Any] | None = None,
-) -> dict:
+) -> dict | None:
     """
     Process an uploaded file through transcription, description & entity extraction,
     title suggestion, scripting, editing, and distribution. Returns a metadata record.
     If record_id is provided, it will be used; otherwise a new UUID is generated.
-    Progress is emitted via the progress status file at each stage.
+    Progress is recorded in the shared progress store as stages run. Stages
+    only wait for the stages whose outputs they read, so the prompt stages
+    run concurrently once the transcript exists and editing starts right away
+    (after silence detection when ``remove_silence`` is set).
+
+    The context is checkpointed after every stage. If a checkpoint for the
+    record already exists (the job was interrupted), its completed stages are
+    skipped. Returns None without doing anything when another process is
+    running the record or has already stored it.
     """
     rec_id = record_id or str(uuid4())
+    with claim(rec_id) as acquired:
+        if not acquired:
+            logging.getLogger(__name__).info(f"[{rec_id}] Already being processed by another worker; skipping")
+            return None
+        if load_checkpoint(rec_id) is None and get_metadata_record_view(rec_id) is not None:
+            logging.getLogger(__name__).info(f"[{rec_id}] Already processed; skipping")
+            return None
+        return await _process_claimed_file(file_path, filename, rec_id, remove_silence, project_context)
+
+
+def _describe_media(paths: list[str]) -> list[dict[str, Any]]:
+    """Return the cached probe of each existing file (the upload and its edited copy) for the record."""
+    described = []
+    for path in dict.fromkeys(paths):
+        if not path or not Path(path).is_file():
+            continue
+        try:
+            described.append(media_payload(path))
+        except Exception:
+            logging.getLogger(__name__).warning("Could not probe %s for the record", path, exc_info=True)
+    return described
+
+
+async def _process_claimed_file(
+    file_path: str,
+    filename: str,
+    rec_id: str,
+    remove_silence: bool,
+    project_context: dict[str, Any] | None,
+) -> dict:
     logger = logging.getLogger(__name__)
     logger.info(f"[{rec_id}] Starting processing file {file_path}, remove_silence={remove_silence}")
 
@@ -42,7 +83,26 @@ async def process_file_async(
         "file_path": file_path,
         "filename": filename,
         "project_context": normalize_project_context(project_context),
+        "keep_intervals": None,
+    }
+    job = {
+        "file_path": file_path,
+        "filename": filename,
+        "remove_silence": remove_silence,
+        "project_context": context["project_context"],
     }
+    checkpoint = load_checkpoint(rec_id)
+    completed_stages: list[str] = list(checkpoint["completed_stages"]) if checkpoint else []
+    priority = checkpoint.get("priority", "normal") if checkpoint else "normal"
+    if checkpoint:
+        context.update(checkpoint.get("context") or {})
+        if completed_stages:
+            logger.info(f"[{rec_id}] Resuming after completed stages: {', '.join(completed_stages)}")
+    else:
+        try:
+            save_checkpoint(rec_id, job)
+        except Exception:
+            logger.exception(f"[{rec_id}] Failed to write pipeline checkpoint")
     try:
         emit_event(
             "record.processing.started",
@@ -52,6 +112,7 @@ async def process_file_async(
                 "filename": filename,
                 "remove_silence": remove_silence,
                 "project_context": context["project_context"],
+                "resumed_stages": completed_stages,
             },
             correlation_id=rec_id,
             source="file_processing",
@@ -62,8 +123,8 @@ async def process_file_async(
     steps: list[Step] = [
         Step(
             "transcribing",
-            transcribe_audio,
-            input_keys=["file_path"],
+            transcribe_record_audio,
+            input_keys=["file_path", "rec_id"],
             output_keys="transcript",
             to_thread=True,
             log_result=lambda r: f"{len(r)} characters",
@@ -92,25 +153,29 @@ async def process_file_async(
             input_keys=["transcript", "project_context", "rec_id"],
             output_keys=["script", "script_prompt_run"],
         ),
-        Step(
-            "editing",
-            edit_audio_async,
-            input_keys=["file_path"],
-            output_keys="edited_audio",
-            log_result=lambda p: f"output file: {p}",
-        ),
     ]
     if remove_silence:
+        # Only detects the ranges to keep; editing cuts them in its own encode.
         steps.append(
             Step(
                 "remove_silence",
-                remove_silence_step,
-                input_keys=["edited_audio"],
-                output_keys=["original_duration", "trimmed_duration", "edited_audio"],
+                find_keep_intervals,
+                input_keys=["file_path"],
+                output_keys=["original_duration", "trimmed_duration", "keep_intervals"],
                 to_thread=True,
                 log_result=lambda res: f"original={res[0]:.2f}s trimmed={res[1]:.2f}s",
             )
         )
+    steps.append(
+        Step(
+            "editing",
+            edit_audio,
+            input_keys=["file_path", "keep_intervals"],
+            output_keys="edited_audio",
+            to_thread=True,
+            log_result=lambda p: f"output file: {p}",
+        )
+    )
     steps.append(
         Step(
             "distribution",
@@ -120,8 +185,20 @@ async def process_file_async(
         )
     )
 
+    steps_by_name = {step.name: step for step in steps}
+
+    def _checkpoint(step: Step, ctx: dict[str, Any]) -> None:
+        completed_stages.append(step.name)
+        outputs = {
+            key: ctx[key]
+            for name in completed_stages
+            if name in steps_by_name
+            for key in steps_by_name[name].output_keys
+        }
+        save_checkpoint(rec_id, job, completed_stages=completed_stages, context=outputs, priority=priority)
+
     try:
-        context = await Pipeline(steps).run(context)
+        context = await Pipeline(steps).run(context, completed=completed_stages, on_step_complete=_checkpoint)
 
         desc = context["desc"]
         entities = context["entities"]
@@ -154,9 +231,15 @@ async def process_file_async(
         }
         if remove_silence:
             record["original_duration"] = context["original_duration"]
-            record["trimmed_duration"] = context["trimmed_duration"]
+            if context["edited_audio"] != file_path:
+                record["trimmed_duration"] = context["trimmed_duration"]
+            else:
+                # editing fell back to the upload, so the silence cuts were never applied
+                logger.warning("[%s] Silence was detected but not removed", rec_id)
+        record["media"] = await asyncio.to_thread(_describe_media, [file_path, context["edited_audio"]])
 
         append_metadata(record)
+        delete_checkpoint(rec_id)
         update_progress(rec_id, "complete")
         try:
             emit_event(
@@ -191,6 +274,7 @@ async def process_file_async(
             "prompt_runs": {},
         }
         append_metadata(record)
+        delete_checkpoint(rec_id)
         try:
             emit_event(
                 "record.processing.failed",
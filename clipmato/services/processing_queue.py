@@ -0,0 +1,255 @@
+"""Bounded, prioritized queue for upload processing.
+
+Uploads used to start ``process_file_async`` as a FastAPI background task each,
+so a burst of uploads ran that many pipelines at once. Uploads now enqueue a
+job here and return; ``PROCESSING_WORKERS`` workers pull jobs in priority
+order (then FIFO) and run the pipeline, while ``stage_limits`` caps how many
+of each stage run across all workers. Once ``PROCESSING_QUEUE_MAX_DEPTH``
+jobs are waiting, new uploads are rejected instead of queuing without bound.
+
+Every accepted job gets a pipeline checkpoint, so ``resume_interrupted()``
+can re-queue jobs that were waiting or running when the process stopped.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..config import PROCESSING_QUEUE_MAX_DEPTH, PROCESSING_WORKERS
+from ..utils.metadata import get_metadata_record_view
+from ..utils.pipeline_checkpoints import delete_checkpoint, is_claimed, list_checkpoints, save_checkpoint
+from ..utils.progress import update_progress
+from ..utils.transcript_cache import transcript_cache
+from ..utils.whisper_models import collect_model_stats
+from .eventing import emit_event
+from .file_processing import process_file_async
+from .stage_limits import stage_limits
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES: dict[str, int] = {"high": 0, "normal": 1, "low": 2}
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the processing queue is at ``max_depth``."""
+
+
+@dataclass(order=True)
+class ProcessingJob:
+    rank: int
+    sequence: int
+    record_id: str = field(compare=False)
+    priority: str = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+class ProcessingQueue:
+    """Priority queue of processing jobs drained by a fixed pool of workers."""
+
+    def __init__(self, *, workers: int = PROCESSING_WORKERS, max_depth: int = PROCESSING_QUEUE_MAX_DEPTH) -> None:
+        self.workers = max(1, workers)
+        self.max_depth = max(1, max_depth)
+        self._sequence = itertools.count()
+        self._queue: asyncio.PriorityQueue[ProcessingJob] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+        # jobs in the priority queue by sequence, for positions and metrics
+        self._waiting: dict[int, ProcessingJob] = {}
+        self._running: dict[str, ProcessingJob] = {}
+        self._counters = {"enqueued": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def _ensure_started(self) -> asyncio.PriorityQueue[ProcessingJob]:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.PriorityQueue()
+            self._loop = loop
+            self._worker_tasks = []
+            self._waiting = {}
+        self._worker_tasks = [task for task in self._worker_tasks if not task.done()]
+        while len(self._worker_tasks) < self.workers:
+            index = len(self._worker_tasks)
+            self._worker_tasks.append(asyncio.create_task(self._worker_loop(), name=f"clipmato-processing-{index}"))
+        return self._queue
+
+    async def start(self) -> None:
+        self._ensure_started()
+
+    async def stop(self) -> None:
+        tasks, self._worker_tasks = self._worker_tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -- submission ---------------------------------------------------------
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def has_capacity(self) -> bool:
+        return self.depth() < self.max_depth
+
+    def submit(
+        self,
+        file_path: str,
+        filename: str,
+        record_id: str,
+        remove_silence: bool = False,
+        project_context: dict[str, Any] | None = None,
+        *,
+        priority: str = "normal",
+        message: str | None = None,
+        checkpoint: bool = True,
+    ) -> int:
+        """Queue a processing job and return its 1-based queue position.
+
+        Raises:
+            ValueError: for an unknown ``priority``.
+            QueueFullError: when ``max_depth`` jobs are already waiting.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown processing priority: {priority}")
+        queue = self._ensure_started()
+        if queue.qsize() >= self.max_depth:
+            self._counters["rejected"] += 1
+            raise QueueFullError(f"Processing queue is full ({self.max_depth} jobs waiting)")
+        job = ProcessingJob(
+            rank=PRIORITIES[priority],
+            sequence=next(self._sequence),
+            record_id=record_id,
+            priority=priority,
+            args=(file_path, filename, record_id, remove_silence, project_context),
+        )
+        if checkpoint:
+            save_checkpoint(
+                record_id,
+                {
+                    "file_path": file_path,
+                    "filename": filename,
+                    "remove_silence": remove_silence,
+                    "project_context": project_context,
+                },
+                priority=priority,
+            )
+        queue.put_nowait(job)
+        self._waiting[job.sequence] = job
+        self._counters["enqueued"] += 1
+        position = sum(1 for waiting in self._waiting.values() if waiting <= job)
+        queued_message = f"Queued at position {position}"
+        update_progress(record_id, "queued", f"{queued_message} · {message}" if message else queued_message)
+        try:
+            emit_event(
+                "record.processing.queued",
+                aggregate_id=record_id,
+                record_id=record_id,
+                payload={"priority": priority, "position": position, "depth": queue.qsize()},
+                correlation_id=record_id,
+                source="processing_queue",
+            )
+        except Exception:
+            logger.exception(f"[{record_id}] Failed to append queued event")
+        return position
+
+    # -- workers ------------------------------------------------------------
+
+    async def _worker_loop(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            job = await queue.get()
+            self._waiting.pop(job.sequence, None)
+            waited = time.monotonic() - job.enqueued_at
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+            self._running[job.record_id] = job
+            try:
+                record = await process_file_async(*job.args)
+                if record is None:
+                    outcome = "skipped"
+                else:
+                    outcome = "failed" if record.get("error") else "completed"
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"[{job.record_id}] Processing job crashed")
+                outcome = "failed"
+            finally:
+                self._running.pop(job.record_id, None)
+                queue.task_done()
+            if outcome != "skipped":
+                self._counters[outcome] += 1
+
+    def resume_interrupted(self) -> list[str]:
+        """Re-queue jobs whose checkpoints outlived the process that accepted them.
+
+        Jobs that had started resume ahead of new uploads; jobs that were
+        still waiting keep their priority. Returns the re-queued record IDs.
+        """
+        resumed: list[str] = []
+        for checkpoint in list_checkpoints():
+            record_id = str(checkpoint.get("record_id") or "")
+            if not record_id or is_claimed(record_id):
+                continue
+            if get_metadata_record_view(record_id) is not None:
+                delete_checkpoint(record_id)  # stored just before the restart
+                continue
+            job = checkpoint.get("job") or {}
+            stages = checkpoint.get("completed_stages") or []
+            priority = "high" if stages else checkpoint.get("priority", "normal")
+            message = f"Resuming after restart ({len(stages)} stages done)" if stages else "Re-queued after restart"
+            try:
+                self.submit(
+                    job["file_path"],
+                    job["filename"],
+                    record_id,
+                    bool(job.get("remove_silence")),
+                    job.get("project_context"),
+                    priority=priority if priority in PRIORITIES else "normal",
+                    message=message,
+                    checkpoint=False,
+                )
+            except QueueFullError:
+                logger.warning("Processing queue is full; %s stays checkpointed until the next restart", record_id)
+                break
+            except (KeyError, ValueError):
+                logger.exception(f"[{record_id}] Cannot resume from malformed pipeline checkpoint")
+                continue
+            resumed.append(record_id)
+        if resumed:
+            logger.info("Resumed %s interrupted processing jobs", len(resumed))
+        return resumed
+
+    # -- metrics ------------------------------------------------------------
+
+    def metrics(self) -> dict[str, Any]:
+        """Return queue depth, worker utilisation, throughput counters, stage slots, cache, and model pool stats."""
+        waiting = list(self._waiting.values())
+        now = time.monotonic()
+        started = self._counters["completed"] + self._counters["failed"] + len(self._running)
+        return {
+            "depth": len(waiting),
+            "max_depth": self.max_depth,
+            "depth_by_priority": {
+                name: sum(1 for job in waiting if job.priority == name) for name in PRIORITIES
+            },
+            "workers": self.workers,
+            "running": len(self._running),
+            "oldest_wait_seconds": round(max((now - job.enqueued_at for job in waiting), default=0.0), 3),
+            "average_wait_seconds": round(self._wait_seconds_total / started, 3) if started else 0.0,
+            "max_wait_seconds": round(self._wait_seconds_max, 3),
+            **self._counters,
+            "stages": stage_limits.snapshot(),
+            "transcript_cache": transcript_cache.stats(),
+            "whisper_models": collect_model_stats(),
+        }
+
+
+processing_queue = ProcessingQueue()
@@ -26,7 +26,7 @@ from ..providers import (
     YouTubePublisher,
 )
 from .eventing import emit_event
-from ..utils.metadata import get_metadata_record, mutate_metadata
+from ..utils.metadata import get_metadata_record, get_metadata_record_view, mutate_metadata, thaw
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +53,10 @@ class PublishingService:
         override_actor: str | None = None,
         override_reason: str | None = None,
     ) -> dict[str, Any]:
-        record = get_metadata_record(record_id)
+        record = get_metadata_record_view(record_id)
         if record is None:
             raise KeyError(record_id)
-        preview = copy.deepcopy(record)
+        preview = thaw(record)
         preview["schedule_time"] = schedule_time
         preview["publish_targets"] = list(publish_targets)
         if "YouTube" in publish_targets:
@@ -114,13 +114,13 @@ class PublishingService:
         override_reason: str | None = None,
     ) -> dict[str, Any]:
         schedule_time = datetime.now().replace(second=0, microsecond=0).isoformat()
-        record = get_metadata_record(record_id)
+        record = get_metadata_record_view(record_id)
         if record is None:
             raise KeyError(record_id)
         publish_targets = list(record.get("publish_targets") or [])
         if "YouTube" not in publish_targets:
             publish_targets.append("YouTube")
-        preview = copy.deepcopy(record)
+        preview = thaw(record)
         preview["schedule_time"] = schedule_time
         preview["publish_targets"] = publish_targets
         self._enforce_publish_policy(
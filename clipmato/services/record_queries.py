@@ -1,21 +1,97 @@
 """Reusable record query helpers for HTML and API entrypoints."""
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 
 from ..utils.presentation import present_record
+from ..utils.record_summary import SORT_FIELDS, summary_sort_key
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded for the requested sort."""
+
+
+@dataclass(slots=True)
+class RecordFilters:
+    """Server-side filters for paginated record listings."""
+
+    stage: str | None = None
+    scheduled: bool | None = None
+    published: bool | None = None
+    project_name: str | None = None
+    uploaded_after: datetime | None = None
+    uploaded_before: datetime | None = None
+
+    def matches_summary(self, summary: dict[str, Any]) -> bool:
+        """Apply every filter that the stored summary can answer without progress files."""
+        if self.scheduled is not None and bool(summary.get("schedule_time")) != self.scheduled:
+            return False
+        if self.published is not None:
+            youtube_job = (summary.get("publish_jobs") or {}).get("youtube") or {}
+            if (youtube_job.get("status") == "published") != self.published:
+                return False
+        if self.project_name is not None:
+            project_name = str((summary.get("project_context") or {}).get("project_name") or "")
+            if project_name.casefold() != self.project_name.casefold():
+                return False
+        if self.uploaded_after is not None or self.uploaded_before is not None:
+            uploaded = _parse_time(summary.get("upload_time"))
+            if uploaded is None:
+                return False
+            if self.uploaded_after is not None and uploaded < _as_utc(self.uploaded_after):
+                return False
+            if self.uploaded_before is not None and uploaded >= _as_utc(self.uploaded_before):
+                return False
+        return True
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _parse_time(value: Any) -> datetime | None:
+    try:
+        return _as_utc(datetime.fromisoformat(str(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def encode_cursor(sort: str, key: tuple[str, str]) -> str:
+    payload = json.dumps([sort, *key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, record_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise InvalidCursorError("Cursor is malformed") from exc
+    if cursor_sort != sort or not isinstance(value, str) or not isinstance(record_id, str):
+        raise InvalidCursorError("Cursor does not match the requested sort")
+    return value, record_id
 
 
 class RecordQueryService:
     """Build shared record views for route and API adapters."""
 
-    def list_records(self, metadata_svc, progress_svc) -> list[dict[str, Any]]:
-        """Return all records enriched with derived presentation fields."""
-        return [present_record(record) for record in progress_svc.enrich(metadata_svc.read())]
+    def list_records(self, metadata_svc, progress_svc, *, full: bool = False) -> list[dict[str, Any]]:
+        """Return record summaries enriched with derived presentation fields.
 
-    def list_recent_records(self, metadata_svc, progress_svc) -> list[dict[str, Any]]:
+        List views read the summary projection only; pass ``full=True`` for
+        whole records (transcript, descriptions, script, prompt runs).
+        """
+        records = metadata_svc.read() if full else metadata_svc.read_summaries()
+        return [present_record(record) for record in progress_svc.enrich(records)]
+
+    def list_recent_records(self, metadata_svc, progress_svc, *, full: bool = False) -> list[dict[str, Any]]:
         """Return records sorted by upload time descending."""
-        records = self.list_records(metadata_svc, progress_svc)
+        records = self.list_records(metadata_svc, progress_svc, full=full)
         records.sort(key=lambda record: record.get("upload_time", ""), reverse=True)
         return records
 
@@ -25,13 +101,54 @@ class RecordQueryService:
         records.sort(key=lambda record: record.get("schedule_time") or record.get("upload_time", ""))
         return records
 
+    def page_records(
+        self,
+        metadata_svc,
+        progress_svc,
+        *,
+        limit: int | None,
+        cursor: str | None = None,
+        sort: str = "-upload_time",
+        filters: RecordFilters | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one presented page of record summaries and the cursor for the next page.
+
+        ``sort`` is a field from ``SORT_FIELDS`` with an optional ``-`` prefix
+        for descending order. ``limit=None`` returns every record after
+        ``cursor``. Ordering and cursor seeks use the store's summary index;
+        progress is read only for candidates of this page.
+        """
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort: {sort}")
+        after = decode_cursor(cursor, sort) if cursor else None
+        filters = filters or RecordFilters()
+        page: list[dict[str, Any]] = []
+        has_more = False
+        for summary in metadata_svc.iter_summaries(sort=field, descending=descending, after=after):
+            if not filters.matches_summary(summary):
+                continue
+            record = present_record(progress_svc.enrich([summary])[0])
+            if filters.stage is not None and str(record.get("stage")) != filters.stage:
+                continue
+            if limit is not None and len(page) == limit:
+                has_more = True
+                break
+            page.append(record)
+        next_cursor = encode_cursor(sort, summary_sort_key(page[-1], field)) if has_more and page else None
+        return page, next_cursor
+
     def find_record(self, records: list[dict[str, Any]], record_id: str) -> dict[str, Any] | None:
         """Return one record from a preloaded record list."""
         return next((record for record in records if record.get("id") == record_id), None)
 
     def get_record(self, metadata_svc, progress_svc, record_id: str) -> dict[str, Any] | None:
-        """Return one enriched record by ID."""
-        return self.find_record(self.list_records(metadata_svc, progress_svc), record_id)
+        """Return one enriched record by ID without presenting the whole library."""
+        record = metadata_svc.get(record_id)
+        if record is None:
+            return None
+        return present_record(progress_svc.enrich([record])[0])
 
     def build_summary_payload(self, record: dict[str, Any], *, detail_url_base: str) -> dict[str, Any]:
         """Return a compact summary payload for HTML or JSON clients."""
@@ -68,6 +185,7 @@ class RecordQueryService:
                 "publish_targets": list(record.get("publish_targets") or []),
                 "publish_jobs": dict(record.get("publish_jobs") or {}),
                 "prompt_runs": dict(record.get("prompt_runs") or {}),
+                "media": list(record.get("media") or []),
             }
         )
         return payload
@@ -7,6 +7,8 @@ import logging
 from typing import Any, Callable, Optional
 
 from .eventing import emit_event
+from .stage_executor import stage_executor
+from .stage_limits import stage_limits
 from ..utils.progress import update_progress
 
 logger = logging.getLogger(__name__)
@@ -18,17 +20,22 @@ async def run_stage(
     *args,
     to_thread: bool = False,
     log_result: Optional[Callable[[Any], str]] = None,
+    track_progress: bool = True,
 ) -> Any:
     """
-    Run a service stage: update progress, log start/end, and execute the function.
+    Run a service stage: update progress, log start/end, and execute the function
+    while holding the stage's concurrency slot (see ``stage_limits``).
 
     Args:
         rec_id: record ID for progress tracking and logging.
         stage: name of the pipeline stage.
         func: the sync or async function to execute.
         *args: positional args to pass to func.
-        to_thread: whether to invoke func via asyncio.to_thread.
+        to_thread: whether func is blocking; it then runs on ``stage_executor``
+            (a thread, or a worker process when ``CLIPMATO_STAGE_EXECUTOR=process``).
         log_result: optional function(result) -> str for result logging.
+        track_progress: whether to record ``stage`` as the current progress;
+            ``Pipeline`` reports progress itself when stages overlap.
 
     Returns:
         The return value from func.
@@ -36,13 +43,15 @@ async def run_stage(
     Raises:
         Any exception raised by func is propagated after logging.
     """
-    update_progress(rec_id, stage)
+    if track_progress:
+        update_progress(rec_id, stage)
     logger.info(f"[{rec_id}] Starting stage '{stage}'")
     try:
-        if to_thread:
-            result = await asyncio.to_thread(func, *args)
-        else:
-            result = await func(*args)
+        async with stage_limits.slot(stage):
+            if to_thread:
+                result = await stage_executor.run(func, *args)
+            else:
+                result = await func(*args)
         result_summary = log_result(result) if log_result else None
         if log_result:
             logger.info(f"[{rec_id}] Stage '{stage}' result: {result_summary}")
@@ -60,6 +69,20 @@ async def run_stage(
         except Exception:
             logger.exception(f"[{rec_id}] Failed to append completion event for stage '{stage}'")
         return result
+    except asyncio.CancelledError:
+        logger.info(f"[{rec_id}] Stage '{stage}' cancelled")
+        try:
+            emit_event(
+                "workflow.stage.cancelled",
+                aggregate_id=rec_id,
+                record_id=rec_id,
+                payload={"stage": stage},
+                correlation_id=rec_id,
+                source="workflow",
+            )
+        except Exception:
+            logger.exception(f"[{rec_id}] Failed to append cancellation event for stage '{stage}'")
+        raise
     except Exception:
         logger.exception(f"[{rec_id}] Exception in stage '{stage}'")
         try:
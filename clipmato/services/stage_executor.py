@@ -0,0 +1,102 @@
+"""Execution backends for blocking pipeline stages.
+
+With ``CLIPMATO_STAGE_EXECUTOR=thread`` (the default), ``Step(to_thread=True)``
+stages run through ``asyncio.to_thread`` as before. With ``process`` they run
+in a ``ProcessPoolExecutor`` of ``CLIPMATO_STAGE_PROCESS_WORKERS`` spawned
+workers, so local Whisper and silence removal use other cores and never hold
+the web process's GIL. Each worker loads the local Whisper model once when it
+starts, and ``warm()`` starts the workers at app startup so the first upload
+does not pay for the model load.
+
+Functions sent to the pool must be importable module-level callables, and
+their arguments and results must be picklable.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from ..config import STAGE_EXECUTOR, STAGE_PROCESS_WORKERS
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "process")
+
+
+def _init_worker() -> None:
+    """Configure logging and warm the transcription model in a new worker process."""
+    logging.basicConfig(level=logging.INFO)
+    try:
+        from ..steps.transcription import warm_up_transcription
+
+        if warm_up_transcription():
+            logger.info("Stage worker warmed up the local Whisper model")
+    except Exception:
+        logger.exception("Stage worker warm-up failed; the model will load on first use")
+
+
+def _ready() -> bool:
+    return True
+
+
+class StageExecutor:
+    """Runs blocking stage functions in threads or in a lazily started process pool."""
+
+    def __init__(self, mode: str = STAGE_EXECUTOR, *, workers: int = STAGE_PROCESS_WORKERS) -> None:
+        if mode not in EXECUTOR_MODES:
+            logger.warning("Unknown CLIPMATO_STAGE_EXECUTOR %r; using threads", mode)
+            mode = "thread"
+        self.mode = mode
+        self.workers = max(1, workers)
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the web process has an event loop and threads.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm(self) -> list[Future]:
+        """Start every worker process (and its model warm-up) without waiting for it."""
+        if self.mode != "process":
+            return []
+        pool = self._process_pool()
+        return [pool.submit(_ready) for _ in range(self.workers)]
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` off the event loop and return its result."""
+        if self.mode != "process":
+            return await asyncio.to_thread(func, *args)
+        pool = self._process_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+        except BrokenProcessPool as exc:
+            # A worker died (e.g. out of memory); the next stage gets a fresh pool.
+            self._discard_pool(pool)
+            raise RuntimeError(f"Stage worker process exited unexpectedly while running {func.__name__}") from exc
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+stage_executor = StageExecutor()
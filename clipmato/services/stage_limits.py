@@ -0,0 +1,71 @@
+"""Per-stage concurrency limits shared by every pipeline running in a process.
+
+``run_stage`` holds a slot for the duration of each stage, so only
+``STAGE_CONCURRENCY["transcribing"]`` transcriptions (one local Whisper model
+by default) and a bounded number of LLM calls run at once, no matter how many
+records the processing queue has in flight. Stages without a configured
+limit run unbounded.
+"""
+from __future__ import annotations
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from ..config import STAGE_CONCURRENCY
+
+
+class StageLimits:
+    """Named semaphores, created per event loop so tests can use ``asyncio.run`` freely."""
+
+    def __init__(self, limits: dict[str, int]) -> None:
+        self.limits = dict(limits)
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._active: dict[str, int] = {}
+        self._waiting: dict[str, int] = {}
+
+    def _semaphore(self, stage: str) -> asyncio.Semaphore | None:
+        limit = self.limits.get(stage)
+        if not limit:
+            return None
+        per_loop = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = per_loop.get(stage)
+        if semaphore is None:
+            semaphore = per_loop[stage] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @asynccontextmanager
+    async def slot(self, stage: str) -> AsyncIterator[None]:
+        semaphore = self._semaphore(stage)
+        if semaphore is None:
+            yield
+            return
+        self._waiting[stage] = self._waiting.get(stage, 0) + 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[stage] -= 1
+        self._active[stage] = self._active.get(stage, 0) + 1
+        try:
+            yield
+        finally:
+            self._active[stage] -= 1
+            semaphore.release()
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """Return ``{stage: {"limit", "active", "waiting"}}`` for every limited stage."""
+        return {
+            stage: {
+                "limit": limit,
+                "active": self._active.get(stage, 0),
+                "waiting": self._waiting.get(stage, 0),
+            }
+            for stage, limit in self.limits.items()
+            if limit
+        }
+
+
+stage_limits = StageLimits(STAGE_CONCURRENCY)
@@ -0,0 +1,89 @@
+"""Pooled HTTP transport and payload framing for webhook delivery."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+from typing import Any
+
+import httpx
+
+
+def build_signature(body: bytes, secret: str) -> str:
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def build_delivery(events: list[dict[str, Any]], secret: str, *, batched: bool) -> tuple[bytes, dict[str, str]]:
+    """Return the signed request body and headers for one delivery.
+
+    Single-event deliveries keep the original body (the bare event). Batched
+    deliveries wrap events as ``{"events": [...]}`` and describe the range in
+    headers so receivers can acknowledge or dedupe by sequence.
+    """
+    last = events[-1]
+    if batched:
+        body = json.dumps({"events": events}, separators=(",", ":")).encode("utf-8")
+        headers = {
+            "X-Clipmato-Event-Count": str(len(events)),
+            "X-Clipmato-Event-First-Sequence": str(events[0].get("sequence") or ""),
+            "X-Clipmato-Event-Sequence": str(last.get("sequence") or ""),
+        }
+    else:
+        body = json.dumps(last, separators=(",", ":")).encode("utf-8")
+        headers = {
+            "X-Clipmato-Event-Id": str(last.get("event_id") or ""),
+            "X-Clipmato-Event-Type": str(last.get("type") or ""),
+            "X-Clipmato-Event-Sequence": str(last.get("sequence") or ""),
+        }
+    headers["Content-Type"] = "application/json"
+    headers["X-Clipmato-Signature"] = build_signature(body, secret)
+    return body, headers
+
+
+class WebhookHttpClient:
+    """Shared async HTTP client that keeps keep-alive connections per host.
+
+    ``httpx.AsyncClient`` is bound to the loop it was first used on, so the
+    client is recreated transparently when delivery runs on a new loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        max_connections: int = 8,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=30.0,
+                ),
+                follow_redirects=False,
+            )
+            self._loop = loop
+        return self._client
+
+    async def post(self, url: str, *, body: bytes, headers: dict[str, str]) -> int:
+        response = await self._get_client().post(url, content=body, headers=headers)
+        await response.aclose()
+        return response.status_code
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
@@ -1,5 +1,6 @@
 document.addEventListener("DOMContentLoaded", () => {
   const STAGE_INFO = {
+    queued: { label: "Waiting for a worker", percent: 10 },
     uploading: { label: "Uploading", percent: 10 },
     transcribing: { label: "Transcribing", percent: 20 },
     descriptions: { label: "Writing descriptions", percent: 30 },
@@ -550,11 +551,11 @@ document.addEventListener("DOMContentLoaded", () => {
         updateCard(card, {
           recordId,
           displayTitle: file.name,
-          badgeText: `${STAGE_INFO.transcribing.label} (${STAGE_INFO.transcribing.percent}%)`,
+          badgeText: `${STAGE_INFO.queued.label} (${STAGE_INFO.queued.percent}%)`,
           badgeKind: "brand",
-          detail: "Upload finished. Backend processing started.",
-          progress: STAGE_INFO.transcribing.percent,
-          stage: "transcribing",
+          detail: "Upload finished. Processing starts when a worker is free.",
+          progress: STAGE_INFO.queued.percent,
+          stage: "queued",
           hideProgress: false,
           track: true,
           canOpen: false,
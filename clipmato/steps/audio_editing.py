@@ -1,7 +1,179 @@
-def edit_audio(audio_input: str) -> str:
-    """Basic audio editing stub: return the input audio path."""
-    return audio_input
+import asyncio
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Sequence
 
-async def edit_audio_async(audio_input: str) -> str:
-    """Asynchronously basic audio editing stub: return the input audio path."""
-    return audio_input
\ No newline at end of file
+from ..config import (
+    EDIT_AUDIO_BITRATE,
+    EDIT_AUDIO_CODEC,
+    EDIT_HIGHPASS_HZ,
+    EDIT_LOUDNESS_RANGE_LU,
+    EDIT_LOUDNORM,
+    EDIT_NOISE_GATE_DB,
+    EDIT_SAMPLE_RATE,
+    EDIT_TARGET_LUFS,
+    EDIT_TRUE_PEAK_DB,
+)
+from ..utils.ffmpeg_graph import interval_graph, render_intervals, run_filter_graph
+from ..utils.media_probe import media_info
+
+logger = logging.getLogger(__name__)
+
+# loudnorm's first-pass report fields, in the order the second pass takes them.
+_LOUDNORM_MEASURES = (
+    ("input_i", "measured_I"),
+    ("input_tp", "measured_TP"),
+    ("input_lra", "measured_LRA"),
+    ("input_thresh", "measured_thresh"),
+    ("target_offset", "offset"),
+)
+# Video codecs the mp4 muxer takes as-is; anything else (VP8/VP9, Theora, ...) is re-encoded.
+_MP4_VIDEO_CODECS = frozenset({"h264", "hevc", "mpeg4", "av1"})
+_VIDEO_ENCODE_ARGS = ("-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-pix_fmt", "yuv420p")
+
+
+def edit_audio(audio_input: str, keep_intervals: Sequence[Sequence[int]] | None = None) -> str:
+    """
+    Produce the publish-ready version of an upload and return its path.
+
+    A first ffmpeg pass measures EBU R128 loudness after the high-pass and
+    noise gate; the second applies them with ``loudnorm`` set to the measured
+    values (linear gain, so dynamics are kept) and encodes AAC in the same
+    streaming pass, to ``<stem>_edited.m4a`` or, for video uploads, to
+    ``<stem>_edited.mp4`` with the video stream. ``keep_intervals`` are the
+    ranges (ms) the ``remove_silence`` stage decided to keep; both passes
+    select only those, so removing silence costs no extra encode.
+
+    Returns the input unchanged when there is nothing to apply. Editing is
+    best effort: if the input is not a file or has no audio track, or an
+    ffmpeg pass fails, the failure is logged and the episode continues with
+    the input. When ``keep_intervals`` were given, the silence cuts are
+    still applied on their own first (``<stem>_trimmed<suffix>``, default
+    codecs, no filters), so a broken encoder does not lose them.
+    """
+    src = Path(audio_input)
+    filters = _cleanup_filters()
+    if keep_intervals is None and not filters and not EDIT_LOUDNORM:
+        return audio_input
+    if not src.is_file():
+        logger.warning("edit_audio: %s is not a file; leaving it unedited", audio_input)
+        return audio_input
+    try:
+        return str(_edit(src, keep_intervals, filters))
+    except (OSError, RuntimeError) as exc:
+        logger.error("edit_audio: editing %s failed: %s", src, exc)
+    if keep_intervals is None:
+        return audio_input
+    trimmed = src.with_name(f"{src.stem}_trimmed{src.suffix}")
+    try:
+        render_intervals(src, trimmed, keep_intervals, keep_video=media_info(src).has_video)
+    except (OSError, RuntimeError) as exc:
+        logger.error("edit_audio: trimming %s failed; leaving it uncut: %s", src, exc)
+        trimmed.unlink(missing_ok=True)
+        return audio_input
+    logger.warning("edit_audio: wrote %s with the silence cuts only", trimmed)
+    return str(trimmed)
+
+
+async def edit_audio_async(audio_input: str, keep_intervals: Sequence[Sequence[int]] | None = None) -> str:
+    """Asynchronously run ``edit_audio`` in a worker thread."""
+    return await asyncio.to_thread(edit_audio, audio_input, keep_intervals)
+
+
+def _edit(src: Path, keep_intervals: Sequence[Sequence[int]] | None, filters: list[str]) -> Path:
+    """Run the analysis and encode passes; raises when either cannot complete."""
+    media = media_info(src)
+    if not media.has_audio:
+        raise RuntimeError("no audio track detected")
+
+    if EDIT_LOUDNORM:
+        measured = _measure_loudness(src, keep_intervals, filters)
+        if measured is None:
+            logger.warning("edit_audio: could not measure loudness of %s; leaving levels unchanged", src)
+        else:
+            filters.append(_loudnorm_filter(measured))
+    filters.append(f"aresample={EDIT_SAMPLE_RATE}")
+
+    trimmed_video = media.has_video and keep_intervals is not None
+    maps = ["-map", "[a]"]
+    if trimmed_video:
+        maps += ["-map", "[v]", *_VIDEO_ENCODE_ARGS]
+    elif media.has_video:
+        video = media.first_stream("video")
+        if video is not None and video.codec_name in _MP4_VIDEO_CODECS:
+            maps += ["-map", "0:v:0", "-c:v", "copy"]
+        else:
+            maps += ["-map", "0:v:0", *_VIDEO_ENCODE_ARGS]
+    output_path = src.with_name(f"{src.stem}_edited{'.mp4' if media.has_video else '.m4a'}")
+    proc = run_filter_graph(
+        src,
+        interval_graph(keep_intervals, audio_filters=filters, keep_video=trimmed_video),
+        [
+            *maps,
+            "-c:a",
+            EDIT_AUDIO_CODEC,
+            "-b:a",
+            EDIT_AUDIO_BITRATE,
+            "-movflags",
+            "+faststart",
+            str(output_path),
+        ],
+    )
+    if proc.returncode != 0:
+        output_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Audio editing failed: {proc.stderr.strip() or proc.stdout.strip()}")
+    logger.info("edit_audio: wrote %s (filters: %s)", output_path, ",".join(filters))
+    return output_path
+
+
+def _cleanup_filters() -> list[str]:
+    filters = []
+    if EDIT_HIGHPASS_HZ > 0:
+        filters.append(f"highpass=f={EDIT_HIGHPASS_HZ:g}")
+    if EDIT_NOISE_GATE_DB is not None:
+        # agate takes its threshold as a linear amplitude
+        filters.append(f"agate=threshold={10 ** (EDIT_NOISE_GATE_DB / 20):.6f}:ratio=4:attack=5:release=250")
+    return filters
+
+
+def _loudnorm_target() -> str:
+    return f"loudnorm=I={EDIT_TARGET_LUFS:g}:TP={EDIT_TRUE_PEAK_DB:g}:LRA={EDIT_LOUDNESS_RANGE_LU:g}"
+
+
+def _loudnorm_filter(measured: dict[str, float]) -> str:
+    applied = ":".join(f"{option}={measured[field]:.2f}" for field, option in _LOUDNORM_MEASURES)
+    return f"{_loudnorm_target()}:{applied}:linear=true"
+
+
+def _measure_loudness(
+    src: Path,
+    keep_intervals: Sequence[Sequence[int]] | None,
+    filters: list[str],
+) -> dict[str, float] | None:
+    """Run the analysis pass over the same cut and filters the encode will use."""
+    graph = interval_graph(keep_intervals, audio_filters=[*filters, f"{_loudnorm_target()}:print_format=json"])
+    proc = run_filter_graph(src, graph, ["-map", "[a]", "-f", "null", "-"], loglevel="info")
+    if proc.returncode != 0:
+        err = proc.stderr.strip() or proc.stdout.strip()
+        raise RuntimeError(f"Loudness analysis failed: {err}")
+    return _parse_loudnorm(proc.stderr)
+
+
+def _parse_loudnorm(stderr: str) -> dict[str, float] | None:
+    """
+    Read the JSON block loudnorm prints at the end of the analysis pass.
+    Returns None when it is missing or not finite (e.g. a silent input).
+    """
+    start, end = stderr.rfind("{"), stderr.rfind("}")
+    if start < 0 or end < start:
+        return None
+    try:
+        report = json.loads(stderr[start : end + 1])
+        measured = {field: float(report[field]) for field, _option in _LOUDNORM_MEASURES}
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not all(math.isfinite(value) for value in measured.values()):
+        return None
+    return measured
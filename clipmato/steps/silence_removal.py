@@ -1,6 +1,7 @@
+import importlib.util
 from pathlib import Path
 from pydub import AudioSegment
-from pydub.silence import split_on_silence
+from pydub.silence import detect_silence, split_on_silence
 
 import logging
 
@@ -14,34 +15,226 @@ builtins.buffer = memoryview
 import pydub.pyaudioop as pyaudioop
 pyaudioop._sample_count = lambda cp, size: len(cp) // size
 
-from ..config import MIN_SILENCE_LEN_MS, SILENCE_THRESH_DB, KEEP_SILENCE_MS
+from ..config import MIN_SILENCE_LEN_MS, SILENCE_THRESH_DB, KEEP_SILENCE_MS, SILENCE_REMOVAL_BACKEND
+from ..utils.audio_decode import MediaInfo, detect_silences, frame_energies
+from ..utils.media_probe import media_info
+from ..utils.ffmpeg_graph import render_intervals
+
+SILENCE_REMOVAL_BACKENDS = ("numpy", "ffmpeg", "pydub")
+# Detection runs on a 16 kHz mono decode, summed into 1 ms frames.
+_DETECT_SAMPLE_RATE = 16000
+_SAMPLES_PER_MS = _DETECT_SAMPLE_RATE // 1000
+
 
 def remove_silence(
     audio_path: str,
     min_silence_len: int = MIN_SILENCE_LEN_MS,
     silence_thresh: int = SILENCE_THRESH_DB,
     keep_silence: int = KEEP_SILENCE_MS,
+    backend: str = SILENCE_REMOVAL_BACKEND,
 ) -> tuple[float, float, str]:
     """
     Remove silent chunks from an audio file.
     Returns a tuple of (original_duration_sec, trimmed_duration_sec, output_path).
+
+    The ``numpy`` backend (default) finds silences from per-millisecond frame
+    energies streamed off an ffmpeg decode and writes the kept ranges with a
+    single ffmpeg pass. The ``ffmpeg`` backend leaves detection to ffmpeg's
+    ``silencedetect`` as well, so no audio passes through Python, and keeps
+    the video stream of video uploads. ``pydub`` is the original in-memory
+    implementation and is used when NumPy is not installed.
     """
     src = Path(audio_path)
+    # enforce integer thresholds (avoid floats in pydub range)
+    min_silence_len = int(min_silence_len)
+    silence_thresh = int(silence_thresh)
+    keep_silence = int(keep_silence)
+    backend = _resolve_backend(backend)
     logger.info(
-        "remove_silence: input=%s, min_silence_len=%d, silence_thresh=%d, keep_silence=%d",
+        "remove_silence: input=%s, backend=%s, min_silence_len=%d, silence_thresh=%d, keep_silence=%d",
         src,
+        backend,
         min_silence_len,
         silence_thresh,
         keep_silence,
     )
+    if backend == "pydub":
+        return _remove_silence_pydub(src, min_silence_len, silence_thresh, keep_silence)
+    return _trim_with_ffmpeg(src, backend, min_silence_len, silence_thresh, keep_silence)
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend not in SILENCE_REMOVAL_BACKENDS:
+        logger.warning("remove_silence: unknown backend %r, using numpy", backend)
+        backend = "numpy"
+    if backend == "numpy" and importlib.util.find_spec("numpy") is None:
+        logger.warning("remove_silence: NumPy is not installed, using the pydub backend")
+        backend = "pydub"
+    return backend
+
+
+def _keep_intervals(
+    energies,
+    total_ms: int,
+    *,
+    min_silence_len: int,
+    silence_thresh: int,
+    keep_silence: int,
+    samples_per_ms: int = _SAMPLES_PER_MS,
+) -> list[tuple[int, int]]:
+    """
+    Return the ``(start_ms, end_ms)`` ranges ``split_on_silence`` would keep,
+    computed from per-millisecond energies in one vectorized pass.
+
+    As in pydub, every ``min_silence_len`` window (stepping 1 ms) whose RMS is
+    at or below ``silence_thresh`` dBFS is silent, silent windows starting
+    within ``min_silence_len`` of each other form one silent range, and each
+    non-silent range is padded by ``keep_silence`` with overlapping padding
+    split halfway.
+    """
+    import numpy as np
+
+    if total_ms <= 0:
+        return []
+    if total_ms < min_silence_len:
+        return [(0, total_ms)]
+    energies = np.asarray(energies, dtype=np.float64)[:total_ms]
+    if energies.shape[0] < total_ms:
+        energies = np.pad(energies, (0, total_ms - energies.shape[0]))
+    cumulative = np.concatenate(([0.0], np.cumsum(energies)))
+    window_energy = cumulative[min_silence_len:] - cumulative[:-min_silence_len]
+    threshold = (10 ** (silence_thresh / 20)) ** 2 * min_silence_len * samples_per_ms
+    silent_starts = np.flatnonzero(window_energy <= threshold)
+    if silent_starts.shape[0] == 0:
+        return [(0, total_ms)]
+
+    breaks = np.flatnonzero(np.diff(silent_starts) > min_silence_len)
+    silence_begin = silent_starts[np.concatenate(([0], breaks + 1))]
+    silence_end = silent_starts[np.concatenate((breaks, [silent_starts.shape[0] - 1]))] + min_silence_len
+    silences = [(int(begin), int(end)) for begin, end in zip(silence_begin, silence_end)]
+    return _pad_voiced(silences, total_ms, keep_silence)
+
+
+def _pad_voiced(silences: list[tuple[int, int]], total_ms: int, keep_silence: int) -> list[tuple[int, int]]:
+    """
+    Turn sorted silent ranges (ms) into the ranges to keep: the gaps between
+    them, each padded by ``keep_silence`` with overlapping padding split
+    halfway, clamped to ``[0, total_ms]`` (pydub's ``split_on_silence`` rules).
+    """
+    bounds = [0] + [edge for silence in silences for edge in silence] + [total_ms]
+    ranges = [[start - keep_silence, end + keep_silence] for start, end in zip(bounds[::2], bounds[1::2]) if end > start]
+    for current, following in zip(ranges, ranges[1:]):
+        if following[0] < current[1]:
+            current[1] = following[0] = (current[1] + following[0]) // 2
+    clamped = [(max(start, 0), min(end, total_ms)) for start, end in ranges]
+    return [(start, end) for start, end in clamped if end > start]
+
+
+def _detect_intervals(
+    src: Path,
+    backend: str,
+    min_silence_len: int,
+    silence_thresh: int,
+    keep_silence: int,
+    media: MediaInfo | None = None,
+) -> tuple[int, list[tuple[int, int]]]:
+    """Return the source length and the ranges to keep, both in milliseconds."""
+    if backend == "pydub":
+        sound = AudioSegment.from_file(src)
+        silences = detect_silence(sound, min_silence_len=min_silence_len, silence_thresh=silence_thresh)
+        return len(sound), _pad_voiced([(start, end) for start, end in silences], len(sound), keep_silence)
+    if backend == "ffmpeg":
+        media = media or media_info(src)
+        if not media.has_audio or media.duration is None:
+            raise RuntimeError(f"Cannot remove silence from {src.name}: no audio stream with a known duration")
+        total_ms = round(media.duration * 1000)
+        silences = detect_silences(
+            src,
+            noise_db=silence_thresh,
+            min_silence_seconds=min_silence_len / 1000,
+            duration=media.duration,
+        )
+        return total_ms, _pad_voiced(
+            [(round(start * 1000), round(end * 1000)) for start, end in silences],
+            total_ms,
+            keep_silence,
+        )
+    energies, sample_count = frame_energies(src, sample_rate=_DETECT_SAMPLE_RATE, frame_samples=_SAMPLES_PER_MS)
+    total_ms = round(sample_count * 1000 / _DETECT_SAMPLE_RATE)
+    return total_ms, _keep_intervals(
+        energies,
+        total_ms,
+        min_silence_len=min_silence_len,
+        silence_thresh=silence_thresh,
+        keep_silence=keep_silence,
+    )
+
+
+def _kept_seconds(intervals: list[tuple[int, int]]) -> float:
+    return sum(end - start for start, end in intervals) / 1000.0
+
+
+def find_keep_intervals(
+    audio_path: str,
+    min_silence_len: int = MIN_SILENCE_LEN_MS,
+    silence_thresh: int = SILENCE_THRESH_DB,
+    keep_silence: int = KEEP_SILENCE_MS,
+    backend: str = SILENCE_REMOVAL_BACKEND,
+) -> tuple[float, float, list[tuple[int, int]]]:
+    """
+    Detect silences without writing a trimmed file.
+    Returns a tuple of (original_duration_sec, trimmed_duration_sec, keep_intervals_ms).
+
+    The pipeline's ``remove_silence`` stage uses this so the editing stage
+    can cut the silences in the same encode that normalizes loudness.
+    """
+    src = Path(audio_path)
+    backend = _resolve_backend(backend)
+    total_ms, intervals = _detect_intervals(src, backend, int(min_silence_len), int(silence_thresh), int(keep_silence))
+    logger.info(
+        "find_keep_intervals: %s (%s): %d chunks, %.2fs of %.2fs kept",
+        src,
+        backend,
+        len(intervals),
+        _kept_seconds(intervals),
+        total_ms / 1000.0,
+    )
+    return total_ms / 1000.0, _kept_seconds(intervals), intervals
+
+
+def _trim_with_ffmpeg(
+    src: Path,
+    backend: str,
+    min_silence_len: int,
+    silence_thresh: int,
+    keep_silence: int,
+) -> tuple[float, float, str]:
+    media = media_info(src)
+    total_ms, intervals = _detect_intervals(src, backend, min_silence_len, silence_thresh, keep_silence, media)
+    original_duration = total_ms / 1000.0
+    logger.info("remove_silence: original duration=%.2fs", original_duration)
+    logger.info("remove_silence: %d chunks detected", len(intervals))
+    output_path = src.with_name(f"{src.stem}_trimmed{src.suffix}")
+    render_intervals(src, output_path, intervals, keep_video=media.has_video)
+    trimmed_duration = _kept_seconds(intervals)
+    logger.info(
+        "remove_silence: trimmed duration=%.2fs, output=%s",
+        trimmed_duration,
+        output_path,
+    )
+    return original_duration, trimmed_duration, str(output_path)
+
+
+def _remove_silence_pydub(
+    src: Path,
+    min_silence_len: int,
+    silence_thresh: int,
+    keep_silence: int,
+) -> tuple[float, float, str]:
     sound = AudioSegment.from_file(src)
     original_duration = len(sound) / 1000.0
     logger.info("remove_silence: original duration=%.2fs", original_duration)
 
-    # enforce integer thresholds (avoid floats in pydub range)
-    min_silence_len = int(min_silence_len)
-    silence_thresh = int(silence_thresh)
-    keep_silence = int(keep_silence)
     logger.info(
         "remove_silence: splitting (min_silence_len=%d, silence_thresh=%d, keep_silence=%d)",
         min_silence_len,
@@ -60,10 +253,9 @@ def remove_silence(
         raise
     logger.info("remove_silence: %d chunks detected", len(chunks))
 
-    # build empty segment matching source parameters to avoid sample-width mismatch
-    combined = sound[:0]
-    for chunk in chunks:
-        combined += chunk
+    # join raw frames once (``+=`` re-copies the whole buffer per chunk);
+    # spawning from the source keeps its sample width and rate
+    combined = sound._spawn(b"".join(chunk.raw_data for chunk in chunks))
     output_path = src.with_name(f"{src.stem}_trimmed{src.suffix}")
     combined.export(output_path, format=src.suffix.lstrip('.'))
     trimmed_duration = len(combined) / 1000.0
@@ -1,7 +1,10 @@
+import hashlib
 import subprocess
 import math
 import tempfile
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
 
 from pathlib import Path
 import logging
@@ -14,6 +17,15 @@ from ..config import (
     FFMPEG_SAMPLE_RATE,
     FFMPEG_CHANNELS,
     FFMPEG_AUDIO_CODEC,
+    TRANSCRIPTION_LANGUAGE,
+    LOCAL_WHISPER_DECODE,
+    LOCAL_WHISPER_WINDOW_OVERLAP_SECONDS,
+    LOCAL_WHISPER_WINDOW_SECONDS,
+    OPENAI_BASE_URL,
+    OPENAI_TRANSCRIPTION_CONCURRENCY,
+    SPLIT_MIN_SILENCE_SECONDS,
+    SPLIT_SEARCH_WINDOW_RATIO,
+    SPLIT_SILENCE_THRESH_DB,
 )
 from ..runtime import (
     detect_local_whisper_device,
@@ -22,9 +34,18 @@ from ..runtime import (
     local_whisper_installed,
     resolve_transcription_backend,
 )
+from ..utils.audio_decode import MediaInfo, decode_pcm, detect_silences
+from ..utils.media_probe import media_info
+from ..utils.progress import update_progress
+from ..utils.transcript_cache import audio_sha256, transcript_cache
+from ..utils.whisper_models import WhisperModelPool
 
 logger = logging.getLogger(__name__)
 
+# (new segments, seconds transcribed so far, total seconds or None)
+SegmentCallback = Callable[[list[dict[str, Any]], float, float | None], None]
+_PROMPT_TAIL_CHARS = 200
+
 
 def _openai_client() -> OpenAI:
     api_key = get_openai_api_key()
@@ -33,11 +54,10 @@ def _openai_client() -> OpenAI:
             "No OpenAI API key is configured. Save one in Settings, or use "
             "CLIPMATO_TRANSCRIPTION_BACKEND=local-whisper for host-native transcription."
         )
-    return OpenAI(api_key=api_key, base_url="https://api.openai.com/v1")
+    return OpenAI(api_key=api_key, base_url=OPENAI_BASE_URL)
 
 
-@lru_cache(maxsize=4)
-def _load_local_whisper_model(model_name: str, device: str):
+def _read_local_whisper_model(model_name: str, device: str):
     if not local_whisper_installed():
         raise RuntimeError(
             "Local Whisper support is not installed. Install "
@@ -54,29 +74,54 @@ def _load_local_whisper_model(model_name: str, device: str):
     return whisper.load_model(model_name, device=device)
 
 
-def _prepare_audio_file(audio_path: str) -> Path:
+whisper_model_pool = WhisperModelPool(_read_local_whisper_model)
+
+
+def _load_local_whisper_model(model_name: str, device: str):
+    return whisper_model_pool.get(model_name, device)
+
+
+def _is_audio_only(src: Path) -> bool:
+    return src.suffix.lower().lstrip(".") in AUDIO_ONLY_EXTENSIONS
+
+
+def _source_fingerprint(src: Path, *, convert: bool) -> str:
+    """
+    Hash the upload plus the WAV conversion ``_prepare_audio_file`` would apply,
+    so a transcript cache lookup needs no ffmpeg decode.
+    """
+    upload_hash = audio_sha256(src)
+    if not convert or _is_audio_only(src):
+        return upload_hash
+    conversion = f"wav:{FFMPEG_AUDIO_CODEC}:{FFMPEG_SAMPLE_RATE}:{FFMPEG_CHANNELS}"
+    return hashlib.sha256(f"{upload_hash}\n{conversion}".encode("utf-8")).hexdigest()
+
+
+def _prepare_audio_file(audio_path: str, *, convert: bool = True) -> tuple[Path, MediaInfo | None]:
+    """
+    Return the file to transcribe plus its probed media info.
+
+    Audio-only uploads are used as-is and are only probed when ``convert`` is
+    False (streaming decode uses the duration to size its buffer). Other
+    uploads are probed once for an audio track and duration and, when
+    ``convert`` is True, converted to a 16 kHz WAV.
+    """
     src = Path(audio_path)
     logger.info("transcribe_audio: input file %s", src)
-    if src.suffix.lower().lstrip(".") in AUDIO_ONLY_EXTENSIONS:
-        return src
+    audio_only = _is_audio_only(src)
+    if audio_only and convert:
+        return src, None
 
-    logger.info("transcribe_audio: non-audio-only format detected, converting to WAV")
-    probe = subprocess.run(
-        [
-            "ffprobe", "-v", "error",
-            "-select_streams", "a",
-            "-show_entries", "stream=index",
-            "-of", "csv=p=0", str(src),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if not probe.stdout.strip():
+    media = media_info(src)
+    if not media.has_audio:
         raise RuntimeError(
             "No audio track detected. Please record with a microphone or choose "
             "webcam/screen+webcam recording."
         )
+    if audio_only or not convert:
+        return src, media
 
+    logger.info("transcribe_audio: non-audio-only format detected, converting to WAV")
     dst = src.with_suffix(".wav")
     proc = subprocess.run(
         [
@@ -93,87 +138,189 @@ def _prepare_audio_file(audio_path: str) -> Path:
         err = proc.stderr.strip() or proc.stdout.strip()
         logger.error("transcribe_audio: audio conversion failed: %s", err)
         raise RuntimeError(f"Audio conversion failed: {err}")
-    return dst
+    return dst, media
+
+
+def _detect_silences(src: Path) -> list[tuple[float, float]]:
+    try:
+        return detect_silences(src, noise_db=SPLIT_SILENCE_THRESH_DB, min_silence_seconds=SPLIT_MIN_SILENCE_SECONDS)
+    except RuntimeError:
+        logger.warning("transcribe_audio: silence detection failed, splitting at fixed offsets")
+        return []
+
+
+def _choose_split_points(
+    duration: float,
+    num_chunks: int,
+    silences: list[tuple[float, float]],
+    *,
+    window_ratio: float = SPLIT_SEARCH_WINDOW_RATIO,
+) -> list[float]:
+    """
+    Return ``num_chunks - 1`` increasing split offsets (seconds).
+
+    Each split sits in the middle of the silence closest to the evenly spaced
+    target offset, as long as it is within ``window_ratio`` of a chunk length
+    from the target; otherwise the target itself is used.
+    """
+    if num_chunks <= 1:
+        return []
+    chunk_duration = duration / num_chunks
+    window = chunk_duration * window_ratio
+    midpoints = [(start + end) / 2 for start, end in silences]
+    points: list[float] = []
+    for index in range(1, num_chunks):
+        target = chunk_duration * index
+        floor = points[-1] + 1.0 if points else 1.0
+        candidates = [point for point in midpoints if abs(point - target) <= window and point > floor]
+        point = min(candidates, key=lambda candidate: abs(candidate - target)) if candidates else target
+        points.append(round(max(point, floor), 3))
+    return points
+
+
+def _transcribe_file(client: OpenAI, path: Path, model: str, language: str | None) -> str:
+    logger.info("transcribe_audio: transcribing %s", path.name)
+    with open(path, "rb") as audio_file:
+        response = client.audio.transcriptions.create(
+            file=audio_file,
+            model=model,
+            response_format="text",
+            **_language_kwargs(language),
+        )
+    logger.info("transcribe_audio: completed %s", path.name)
+    return response
+
 
+def _transcribe_chunks(client: OpenAI, chunks: list[Path], model: str, language: str | None) -> list[str]:
+    """Transcribe ``chunks`` concurrently (bounded) and return the texts in chunk order."""
+    workers = max(1, min(OPENAI_TRANSCRIPTION_CONCURRENCY, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clipmato-transcribe") as pool:
+        return list(pool.map(lambda chunk: _transcribe_file(client, chunk, model, language), chunks))
 
-def _transcribe_with_openai(src: Path, model: str) -> str:
+
+def _transcribe_with_openai(
+    src: Path,
+    model: str,
+    language: str | None = None,
+    *,
+    duration: float | None = None,
+) -> str:
     client = _openai_client()
     file_size = src.stat().st_size
     logger.info("transcribe_audio: file size %d bytes", file_size)
-    if file_size > MAX_CHUNK_SIZE_BYTES:
-        logger.info(
-            "transcribe_audio: file exceeds max chunk size (%d bytes), splitting audio",
-            MAX_CHUNK_SIZE_BYTES,
-        )
-        result = subprocess.run(
+    if file_size <= MAX_CHUNK_SIZE_BYTES:
+        logger.info("transcribe_audio: file size within limit, performing direct transcription")
+        response = _transcribe_file(client, src, model, language)
+        logger.info("transcribe_audio: direct transcription complete")
+        return response
+
+    logger.info(
+        "transcribe_audio: file exceeds max chunk size (%d bytes), splitting audio at silences",
+        MAX_CHUNK_SIZE_BYTES,
+    )
+    if duration is None:
+        duration = media_info(src).duration
+    if duration is None:
+        raise RuntimeError(f"Cannot split {src.name}: its duration is unknown")
+    # Aim below the API limit so moving a split to a nearby silence cannot overflow a chunk.
+    num_chunks = math.ceil(file_size / (MAX_CHUNK_SIZE_BYTES * (1 - 2 * SPLIT_SEARCH_WINDOW_RATIO)))
+    split_points = _choose_split_points(duration, num_chunks, _detect_silences(src))
+    with tempfile.TemporaryDirectory(dir=src.parent) as tmpdir:
+        pattern = Path(tmpdir) / f"chunk_%03d{src.suffix}"
+        logger.info("transcribe_audio: splitting into %d chunks at %s", num_chunks, split_points)
+        subprocess.run(
             [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
+                "ffmpeg",
+                "-y",
+                "-i",
                 str(src),
+                "-f",
+                "segment",
+                "-segment_times",
+                ",".join(f"{point:.3f}" for point in split_points),
+                "-c",
+                "copy",
+                "-reset_timestamps",
+                "1",
+                str(pattern),
             ],
             check=True,
-            capture_output=True,
-            text=True,
         )
-        duration = float(result.stdout.strip())
-        num_chunks = math.ceil(file_size / MAX_CHUNK_SIZE_BYTES)
-        chunk_duration = math.ceil(duration / num_chunks)
-
-        transcripts: list[str] = []
-        with tempfile.TemporaryDirectory(dir=src.parent) as tmpdir:
-            pattern = Path(tmpdir) / f"chunk_%03d{src.suffix}"
-            logger.info(
-                "transcribe_audio: splitting into chunks with pattern %s, segment_time %ds",
-                pattern,
-                chunk_duration,
-            )
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-i",
-                    str(src),
-                    "-f",
-                    "segment",
-                    "-segment_time",
-                    str(chunk_duration),
-                    "-c",
-                    "copy",
-                    "-reset_timestamps",
-                    "1",
-                    str(pattern),
-                ],
-                check=True,
-            )
-            for chunk_file in sorted(Path(tmpdir).glob(f"chunk_*{src.suffix}")):
-                logger.info("transcribe_audio: transcribing chunk %s", chunk_file.name)
-                with open(chunk_file, "rb") as audio_file:
-                    response = client.audio.transcriptions.create(
-                        file=audio_file,
-                        model=model,
-                        response_format="text",
-                    )
-                transcripts.append(response)
-                logger.info("transcribe_audio: completed chunk %s", chunk_file.name)
-        return "\n".join(transcripts)
-
-    with open(src, "rb") as audio_file:
-        logger.info("transcribe_audio: file size within limit, performing direct transcription")
-        response = client.audio.transcriptions.create(
-            file=audio_file,
-            model=model,
-            response_format="text",
+        chunks = sorted(Path(tmpdir).glob(f"chunk_*{src.suffix}"))
+        transcripts = _transcribe_chunks(client, chunks, model, language)
+    return "\n".join(transcripts)
+
+
+def _language_kwargs(language: str | None) -> dict[str, str]:
+    return {"language": language} if language else {}
+
+
+def _transcribe_windowed(
+    model,
+    src: Path,
+    *,
+    device: str,
+    language: str | None,
+    total: float | None,
+    on_segments: SegmentCallback | None,
+) -> str:
+    """
+    Transcribe ``src`` one decoded window at a time.
+
+    Windows are ``LOCAL_WHISPER_WINDOW_SECONDS`` long plus an overlap into the
+    next one. Segments starting in the overlap are left to the next window,
+    and segments whose midpoint falls before the end of the last kept segment
+    are dropped as repeats. The tail of the text so far is passed as the
+    next window's prompt, and the first detected language is kept.
+    """
+    window = LOCAL_WHISPER_WINDOW_SECONDS
+    span = window + LOCAL_WHISPER_WINDOW_OVERLAP_SECONDS
+    segments: list[dict[str, Any]] = []
+    committed_end = 0.0
+    start = 0.0
+    while True:
+        audio = decode_pcm(src, sample_rate=FFMPEG_SAMPLE_RATE, start=start, length=span)
+        if len(audio) == 0:
+            break
+        last = len(audio) < int(span * FFMPEG_SAMPLE_RATE)
+        prompt = " ".join(segment["text"] for segment in segments)[-_PROMPT_TAIL_CHARS:]
+        result = model.transcribe(
+            audio,
+            fp16=device == "cuda",
+            verbose=False,
+            initial_prompt=prompt or None,
+            **_language_kwargs(language),
         )
-    logger.info("transcribe_audio: direct transcription complete")
-    return response
+        language = language or result.get("language")
+        fresh: list[dict[str, Any]] = []
+        for raw in result.get("segments") or []:
+            seg_start = start + float(raw["start"])
+            seg_end = start + float(raw["end"])
+            text = (raw.get("text") or "").strip()
+            if not last and seg_start >= start + window:
+                break
+            if not text or (seg_start + seg_end) / 2 < committed_end:
+                continue
+            fresh.append({"start": round(seg_start, 2), "end": round(seg_end, 2), "text": text})
+            committed_end = seg_end
+        segments.extend(fresh)
+        processed = start + len(audio) / FFMPEG_SAMPLE_RATE if last else start + window
+        logger.info("transcribe_audio: transcribed %.0fs of %s (%d segments)", processed, src.name, len(segments))
+        if on_segments is not None:
+            on_segments(fresh, processed, total)
+        if last:
+            break
+        start += window
+    return " ".join(segment["text"] for segment in segments)
 
 
-def _transcribe_with_local_whisper(src: Path) -> str:
+def _transcribe_with_local_whisper(
+    src: Path,
+    language: str | None = None,
+    *,
+    media: MediaInfo | None = None,
+    on_segments: SegmentCallback | None = None,
+) -> str:
     model_name = get_local_whisper_model()
     device = detect_local_whisper_device()
     logger.info(
@@ -182,17 +329,118 @@ def _transcribe_with_local_whisper(src: Path) -> str:
         device,
     )
     model = _load_local_whisper_model(model_name, device)
-    result = model.transcribe(str(src), fp16=device == "cuda", verbose=False)
+    duration = media.duration if media else None
+    windowed = LOCAL_WHISPER_WINDOW_SECONDS > 0 and (
+        duration is None or duration > LOCAL_WHISPER_WINDOW_SECONDS + LOCAL_WHISPER_WINDOW_OVERLAP_SECONDS
+    )
+    if windowed:
+        return _transcribe_windowed(
+            model,
+            src,
+            device=device,
+            language=language,
+            total=duration,
+            on_segments=on_segments,
+        )
+    if LOCAL_WHISPER_DECODE == "stream":
+        audio = decode_pcm(src, sample_rate=FFMPEG_SAMPLE_RATE, duration=duration)
+    else:
+        audio = str(src)
+    result = model.transcribe(audio, fp16=device == "cuda", verbose=False, **_language_kwargs(language))
     return (result.get("text") or "").strip()
 
-def transcribe_audio(audio_path: str, model: str = WHISPER_MODEL) -> str:
+
+def warm_up_transcription() -> bool:
+    """
+    Load the local Whisper model ahead of the first job when it is the
+    resolved backend. Returns whether a model was loaded.
+    """
+    if resolve_transcription_backend() != "local-whisper" or not local_whisper_installed():
+        return False
+    _load_local_whisper_model(get_local_whisper_model(), detect_local_whisper_device())
+    return True
+
+
+def transcribe_audio(
+    audio_path: str,
+    model: str = WHISPER_MODEL,
+    language: str | None = TRANSCRIPTION_LANGUAGE,
+    *,
+    on_segments: SegmentCallback | None = None,
+) -> str:
     """
     Transcribe an audio file to text using either OpenAI Whisper or a
     local Whisper model depending on runtime configuration.
+
+    Transcripts are cached by the upload's content hash (plus the WAV
+    conversion settings when it would be converted), backend, model, and
+    language. The lookup happens before any conversion, so identical
+    re-uploads skip both ffmpeg and Whisper.
+    With local Whisper in the default ``stream`` decode mode, the upload is
+    decoded straight into memory instead of being converted to a WAV first.
+    Long uploads are transcribed in windows (``LOCAL_WHISPER_WINDOW_SECONDS``)
+    and ``on_segments`` receives each window's timestamped segments.
     """
-    src = _prepare_audio_file(audio_path)
     backend = resolve_transcription_backend()
     logger.info("transcribe_audio: resolved backend '%s'", backend)
+    stream = backend == "local-whisper" and LOCAL_WHISPER_DECODE == "stream"
+    model_name = get_local_whisper_model() if backend == "local-whisper" else model
+    audio_hash = _source_fingerprint(Path(audio_path), convert=not stream)
+    cache_key = transcript_cache.key(audio_hash, backend=backend, model=model_name, language=language)
+    cached = transcript_cache.get(cache_key)
+    if cached is not None:
+        logger.info("transcribe_audio: transcript cache hit for %s (%s/%s)", Path(audio_path).name, backend, model_name)
+        return cached
+
+    src, media = _prepare_audio_file(audio_path, convert=not stream)
     if backend == "local-whisper":
-        return _transcribe_with_local_whisper(src)
-    return _transcribe_with_openai(src, model=model)
+        transcript = _transcribe_with_local_whisper(src, language=language, media=media, on_segments=on_segments)
+    else:
+        transcript = _transcribe_with_openai(
+            src,
+            model=model,
+            language=language,
+            duration=media.duration if media else None,
+        )
+    transcript_cache.put(
+        cache_key,
+        transcript,
+        audio_sha256=audio_hash,
+        backend=backend,
+        model=model_name,
+        language=language,
+    )
+    return transcript
+
+
+def _format_offset(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes // 60}:{minutes % 60:02d}:{secs:02d}" if minutes >= 60 else f"{minutes}:{secs:02d}"
+
+
+def _report_partial_transcript(
+    record_id: str,
+    segments: list[dict[str, Any]],
+    processed: float,
+    total: float | None,
+) -> None:
+    message = f"Transcribed {_format_offset(processed)}"
+    if total:
+        message += f" of {_format_offset(total)}"
+    details: dict[str, Any] = {
+        "partial_transcript": segments,
+        "transcribed_seconds": round(processed, 2),
+        "total_seconds": round(total, 2) if total else None,
+    }
+    try:
+        update_progress(record_id, "transcribing", message, details=details)
+    except Exception:
+        logger.exception("[%s] Failed to report partial transcript", record_id)
+
+
+def transcribe_record_audio(audio_path: str, record_id: str) -> str:
+    """
+    Pipeline entry point for ``transcribe_audio`` that reports partial
+    transcripts for ``record_id`` as progress updates while it runs.
+    """
+    return transcribe_audio(audio_path, on_segments=partial(_report_partial_transcript, record_id))
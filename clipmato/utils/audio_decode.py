@@ -0,0 +1,306 @@
+"""ffprobe/ffmpeg helpers that let stages read audio without intermediate files.
+
+``probe_media`` reads the container and stream layout (audio presence,
+duration, codecs, sample rate) with a single ffprobe call. ``decode_pcm``
+pipes ffmpeg's mono float32 PCM output straight into a NumPy buffer
+preallocated from that duration, which is the input format Whisper's
+``transcribe`` accepts, so video uploads no longer need a full 16 kHz WAV
+written next to them and decoded a second time. ``frame_energies`` reduces
+the same stream to per-frame energies for silence detection without holding
+the audio at all, and ``detect_silences`` leaves detection to ffmpeg's
+``silencedetect`` filter entirely.
+
+NumPy is imported lazily: it ships with the optional local Whisper install,
+and nothing else in the default install needs it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..config import FFMPEG_SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK_BYTES = 1 << 20
+_FLOAT32_BYTES = 4
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    index: int
+    codec_type: str
+    codec_name: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    channel_layout: str | None = None
+    width: int | None = None
+    height: int | None = None
+    duration: float | None = None
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    has_audio: bool
+    duration: float | None
+    has_video: bool = False
+    format_name: str | None = None
+    bit_rate: int | None = None
+    streams: tuple[StreamInfo, ...] = ()
+
+    def first_stream(self, codec_type: str) -> StreamInfo | None:
+        return next((stream for stream in self.streams if stream.codec_type == codec_type), None)
+
+
+def _number(value: Any, kind: type = float) -> Any:
+    """Parse an ffprobe numeric field, returning None for missing, "N/A" or non-finite values."""
+    try:
+        number = kind(value)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(number, float) and not math.isfinite(number):
+        return None
+    return number
+
+
+def _parse_probe(payload: str) -> MediaInfo:
+    """Build a ``MediaInfo`` from ffprobe's JSON, preferring the audio stream's own duration."""
+    try:
+        data = json.loads(payload or "{}")
+    except ValueError:
+        return MediaInfo(has_audio=False, duration=None)
+    fmt = data.get("format") or {}
+    streams = tuple(
+        StreamInfo(
+            index=int(stream.get("index", position)),
+            codec_type=str(stream.get("codec_type") or "unknown"),
+            codec_name=stream.get("codec_name"),
+            sample_rate=_number(stream.get("sample_rate"), int),
+            channels=_number(stream.get("channels"), int),
+            channel_layout=stream.get("channel_layout"),
+            width=_number(stream.get("width"), int),
+            height=_number(stream.get("height"), int),
+            duration=_number(stream.get("duration")),
+        )
+        for position, stream in enumerate(data.get("streams") or [])
+    )
+    audio_streams = [stream for stream in streams if stream.codec_type == "audio"]
+    durations = [stream.duration for stream in audio_streams] + [_number(fmt.get("duration"))]
+    duration = next((value for value in durations if value is not None and value > 0), None)
+    return MediaInfo(
+        has_audio=bool(audio_streams),
+        duration=duration,
+        has_video=any(stream.codec_type == "video" for stream in streams),
+        format_name=fmt.get("format_name"),
+        bit_rate=_number(fmt.get("bit_rate"), int),
+        streams=streams,
+    )
+
+
+def probe_media(path: Path) -> MediaInfo:
+    """
+    Describe ``path``'s container and streams from one ffprobe call.
+
+    Stages should go through ``utils.media_probe.media_info``, which caches
+    the result per file.
+    """
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-of", "json", str(path)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        logger.warning("probe_media: ffprobe failed for %s: %s", path, proc.stderr.strip())
+    return _parse_probe(proc.stdout)
+
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[0-9.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[0-9.]+)")
+
+
+def parse_silencedetect(ffmpeg_stderr: str, *, duration: float | None = None) -> list[tuple[float, float]]:
+    """
+    Return ``(start, end)`` pairs from ffmpeg ``silencedetect`` output.
+
+    A silence still open at the end of the input is closed at ``duration``
+    when it is given and dropped otherwise.
+    """
+    silences: list[tuple[float, float]] = []
+    start: float | None = None
+    for line in ffmpeg_stderr.splitlines():
+        if (match := _SILENCE_START.search(line)) is not None:
+            start = max(float(match.group(1)), 0.0)
+        elif (match := _SILENCE_END.search(line)) is not None and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    if start is not None and duration is not None and duration > start:
+        silences.append((start, duration))
+    return silences
+
+
+def detect_silences(
+    path: Path,
+    *,
+    noise_db: float,
+    min_silence_seconds: float,
+    duration: float | None = None,
+) -> list[tuple[float, float]]:
+    """
+    Run ffmpeg ``silencedetect`` over ``path`` and return its silences in seconds.
+
+    ffmpeg decodes and measures the audio itself, so Python only reads the
+    detector's log lines. Raises ``RuntimeError`` when ffmpeg fails.
+    """
+    proc = subprocess.run(
+        [
+            "ffmpeg",
+            "-nostdin",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(path),
+            "-vn",
+            "-af",
+            f"silencedetect=noise={noise_db}dB:d={min_silence_seconds}",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Silence detection failed: {proc.stderr.strip()[-500:]}")
+    return parse_silencedetect(proc.stderr, duration=duration)
+
+
+def _require_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError(
+            "Decoding audio in Python needs NumPy. Install the fast-audio extra "
+            "(`pip install -e '.[fast-audio]'`), or avoid the NumPy paths with "
+            "CLIPMATO_LOCAL_WHISPER_DECODE=file (transcription) or "
+            "CLIPMATO_SILENCE_REMOVAL_BACKEND=ffmpeg (silence removal)."
+        ) from exc
+    return numpy
+
+
+def _pcm_blocks(path: Path, *, sample_rate: int, start: float = 0.0, length: float | None = None) -> Iterator[Any]:
+    """Yield float32 NumPy blocks of ffmpeg's mono PCM output for ``path`` as they arrive."""
+    np = _require_numpy()
+    window_args = ["-ss", f"{start:.3f}"] if start > 0 else []
+    if length is not None:
+        window_args += ["-t", f"{length:.3f}"]
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-nostdin",
+                "-v",
+                "error",
+                *window_args,
+                "-i",
+                str(path),
+                "-vn",
+                "-ac",
+                "1",
+                "-ar",
+                str(sample_rate),
+                "-f",
+                "f32le",
+                "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        assert proc.stdout is not None
+        pending = b""
+        try:
+            while True:
+                chunk = proc.stdout.read(_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                chunk = pending + chunk
+                usable = len(chunk) - len(chunk) % _FLOAT32_BYTES
+                pending = chunk[usable:]
+                if usable:
+                    yield np.frombuffer(chunk, dtype=np.float32, count=usable // _FLOAT32_BYTES)
+        finally:
+            proc.stdout.close()
+            if proc.poll() is None and sys.exc_info()[0] is not None:
+                proc.kill()
+            returncode = proc.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode("utf-8", "replace").strip()
+            raise RuntimeError(f"Audio decode failed: {message or f'ffmpeg exited with {returncode}'}")
+
+
+def decode_pcm(
+    path: Path,
+    *,
+    sample_rate: int = FFMPEG_SAMPLE_RATE,
+    duration: float | None = None,
+    start: float = 0.0,
+    length: float | None = None,
+):
+    """
+    Decode the first audio stream of ``path`` to a mono float32 NumPy array.
+
+    ffmpeg writes raw samples to a pipe that is read straight into a buffer
+    sized from ``length`` or ``duration`` (when known), so peak memory is one
+    copy of the decoded audio. The buffer grows if the estimate was short.
+    ``start``/``length`` (seconds) decode only that window of the input; the
+    result is shorter than ``length`` once the window reaches the end.
+    """
+    np = _require_numpy()
+    expected = length if length is not None else (duration - start if duration else None)
+    capacity = int(math.ceil(max(expected or 60.0, 0.0) * sample_rate)) + sample_rate
+    samples = np.empty(capacity, dtype=np.float32)
+    filled = 0
+    for block in _pcm_blocks(path, sample_rate=sample_rate, start=start, length=length):
+        count = block.shape[0]
+        if filled + count > samples.shape[0]:
+            samples = np.resize(samples, max(samples.shape[0] * 2, filled + count))
+        samples[filled : filled + count] = block
+        filled += count
+    logger.info("decode_pcm: decoded %.1fs of audio from %s", filled / sample_rate, path.name)
+    return samples[:filled]
+
+
+def frame_energies(path: Path, *, sample_rate: int = FFMPEG_SAMPLE_RATE, frame_samples: int = 16):
+    """
+    Return ``(energies, sample_count)`` for the mono decode of ``path``.
+
+    ``energies[i]`` is the sum of squared samples in frame ``i`` (the last,
+    partial frame included). Samples are folded in as they come off the
+    ffmpeg pipe, so memory is one float per frame rather than the decoded
+    audio (about 14 MB per hour at 1 ms frames).
+    """
+    np = _require_numpy()
+    sums: list[Any] = []
+    carry = np.empty(0, dtype=np.float32)
+    total = 0
+    for block in _pcm_blocks(path, sample_rate=sample_rate):
+        total += block.shape[0]
+        if carry.shape[0]:
+            block = np.concatenate((carry, block))
+        whole = block.shape[0] - block.shape[0] % frame_samples
+        squared = np.square(block[:whole], dtype=np.float64)
+        sums.append(squared.reshape(-1, frame_samples).sum(axis=1))
+        carry = block[whole:]
+    if carry.shape[0]:
+        sums.append(np.array([np.square(carry, dtype=np.float64).sum()]))
+    energies = np.concatenate(sums) if sums else np.empty(0, dtype=np.float64)
+    logger.info("frame_energies: %d frames from %.1fs of audio in %s", energies.shape[0], total / sample_rate, path.name)
+    return energies, total
@@ -0,0 +1,125 @@
+"""Filter graphs for the ffmpeg passes that trim and edit uploads.
+
+Silence removal and the editing stage both cut an upload down to its kept
+ranges and run audio filters over the result. Building the graph in one place lets
+the editing stage apply the silence cuts inside its own encode instead of
+re-reading a separately trimmed file. Graphs are handed to ffmpeg with
+``-filter_complex_script`` so long interval lists do not hit the argument
+length limit; the audio output is labelled ``[a]`` and video ``[v]``.
+"""
+from __future__ import annotations
+
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Iterable, Sequence
+
+
+def interval_graph(
+    intervals: Iterable[Sequence[int]] | None,
+    *,
+    audio_filters: Sequence[str] = (),
+    keep_video: bool = False,
+) -> str:
+    """
+    Build a graph keeping ``intervals`` (ms) of input 0 and applying
+    ``audio_filters`` after the cut. ``None`` keeps the whole input and an
+    empty list keeps nothing. With ``keep_video`` the matching video is cut
+    the same way as ``[v]``; no video chain is built when nothing is cut.
+
+    Each range is trimmed on its own and restamped from zero
+    (``setpts=PTS-STARTPTS``), then ``concat`` joins them. Audio and video
+    timestamps both come from the source, so variable frame rate video stays
+    in sync with the audio.
+    """
+    audio_filters = list(audio_filters)
+    ranges = None if intervals is None else [
+        f"start={start / 1000:.3f}:end={end / 1000:.3f}" for start, end in intervals
+    ]
+    if ranges is None or len(ranges) <= 1:
+        audio: list[str] = []
+        video: list[str] = []
+        if ranges == []:
+            audio, video = ["atrim=end=0"], ["trim=end=0"]
+        elif ranges:
+            audio = [f"atrim={ranges[0]}", "asetpts=PTS-STARTPTS"]
+            video = [f"trim={ranges[0]}", "setpts=PTS-STARTPTS"]
+        graph = [f"[0:a]{','.join([*audio, *audio_filters] or ['anull'])}[a]"]
+        if keep_video and video:
+            graph.append(f"[0:v]{','.join(video)}[v]")
+        return ";\n".join(graph)
+
+    count = len(ranges)
+    graph = [f"[0:a]asplit={count}{''.join(f'[a{index}]' for index in range(count))}"]
+    if keep_video:
+        graph.append(f"[0:v]split={count}{''.join(f'[v{index}]' for index in range(count))}")
+    segments = ""
+    for index, trim in enumerate(ranges):
+        graph.append(f"[a{index}]atrim={trim},asetpts=PTS-STARTPTS[as{index}]")
+        if keep_video:
+            graph.append(f"[v{index}]trim={trim},setpts=PTS-STARTPTS[vs{index}]")
+            segments += f"[vs{index}]"
+        segments += f"[as{index}]"
+    if not keep_video:
+        graph.append(f"{segments}{','.join([f'concat=n={count}:v=0:a=1', *audio_filters])}[a]")
+    elif audio_filters:
+        graph.append(f"{segments}concat=n={count}:v=1:a=1[v][cut]")
+        graph.append(f"[cut]{','.join(audio_filters)}[a]")
+    else:
+        graph.append(f"{segments}concat=n={count}:v=1:a=1[v][a]")
+    return ";\n".join(graph)
+
+
+def render_intervals(
+    src: Path,
+    dst: Path,
+    intervals: Iterable[Sequence[int]],
+    *,
+    keep_video: bool = False,
+) -> None:
+    """
+    Write the ``intervals`` (ms) of ``src`` to ``dst`` in one streaming ffmpeg
+    pass with the output container's default codecs, cutting the video the
+    same way when ``keep_video`` is set. Raises RuntimeError when ffmpeg fails.
+    """
+    maps = ["-map", "[a]"] + (["-map", "[v]"] if keep_video else [])
+    proc = run_filter_graph(src, interval_graph(intervals, keep_video=keep_video), [*maps, str(dst)])
+    if proc.returncode != 0:
+        raise RuntimeError(f"Trimming failed: {proc.stderr.strip() or proc.stdout.strip()}")
+
+
+def run_filter_graph(
+    src: Path,
+    graph: str,
+    args: Sequence[str],
+    *,
+    loglevel: str = "error",
+) -> subprocess.CompletedProcess[str]:
+    """
+    Run ``ffmpeg -i src`` with ``graph`` as its filter script followed by
+    ``args`` (maps, codecs and the output). Returns the finished process so
+    callers can read stderr and report failures their own way.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".filter", delete=False) as script:
+        script.write(graph)
+    try:
+        return subprocess.run(
+            [
+                "ffmpeg",
+                "-nostdin",
+                "-y",
+                "-hide_banner",
+                "-nostats",
+                "-v",
+                loglevel,
+                "-i",
+                str(src),
+                "-filter_complex_script",
+                script.name,
+                *args,
+            ],
+            capture_output=True,
+            text=True,
+        )
+    finally:
+        Path(script.name).unlink(missing_ok=True)
@@ -0,0 +1,165 @@
+"""Per-file cache of ffprobe results.
+
+Transcription, silence removal and editing each need an upload's duration
+and stream layout, and YouTube publishing needs to know whether a file has
+video. ``media_info(path)`` runs ``probe_media`` (one ``ffprobe -show_streams
+-show_format`` call) the first time a file is asked about and answers later
+calls from memory. Entries are keyed by the resolved path, size and mtime, so
+a file rewritten in place is probed again, and the least recently used
+entries are dropped past ``max_entries``.
+
+The pipeline stores ``media_payload()`` results in the record under
+``media``. They name the file by its basename only, so records and API
+responses never carry server paths. ``seed_media_info()`` loads them back
+for files in a given directory, so publishing (or another process) skips
+ffprobe for files that have not changed since. Stage worker processes keep
+their own cache.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from . import audio_decode
+from .audio_decode import MediaInfo, StreamInfo
+
+logger = logging.getLogger(__name__)
+
+_MAX_ENTRIES = 256
+_STREAM_FIELDS = {field.name for field in fields(StreamInfo)}
+
+_Key = tuple[str, int, int]
+
+
+def _file_key(path: str | Path) -> _Key:
+    resolved = Path(path).expanduser().resolve()
+    stat = os.stat(resolved)
+    return str(resolved), stat.st_size, stat.st_mtime_ns
+
+
+def media_info_to_payload(info: MediaInfo) -> dict[str, Any]:
+    """Return ``info`` as plain JSON-ready data."""
+    return asdict(info)
+
+
+def media_info_from_payload(payload: Mapping[str, Any]) -> MediaInfo:
+    """Rebuild a ``MediaInfo`` from ``media_info_to_payload`` / ``media_payload`` output."""
+    return MediaInfo(
+        has_audio=bool(payload.get("has_audio")),
+        duration=payload.get("duration"),
+        has_video=bool(payload.get("has_video")),
+        format_name=payload.get("format_name"),
+        bit_rate=payload.get("bit_rate"),
+        streams=tuple(
+            StreamInfo(**{name: value for name, value in stream.items() if name in _STREAM_FIELDS})
+            for stream in payload.get("streams") or []
+        ),
+    )
+
+
+class MediaProbeCache:
+    """LRU cache of ``MediaInfo`` keyed by (resolved path, size, mtime)."""
+
+    def __init__(
+        self,
+        probe: Callable[[Path], MediaInfo] | None = None,
+        *,
+        max_entries: int = _MAX_ENTRIES,
+    ) -> None:
+        self._probe = probe
+        self.max_entries = max_entries
+        self._entries: OrderedDict[_Key, MediaInfo] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "seeded": 0}
+
+    def _run_probe(self, path: Path) -> MediaInfo:
+        # looked up at call time so tests can patch audio_decode.probe_media
+        return (self._probe or audio_decode.probe_media)(path)
+
+    def _store_locked(self, key: _Key, info: MediaInfo) -> None:
+        self._entries[key] = info
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, path: str | Path) -> MediaInfo:
+        """Return the media info of ``path``, probing it only when it is new or has changed."""
+        try:
+            key = _file_key(path)
+        except OSError:
+            # let ffprobe report the missing file the way callers already handle
+            return self._run_probe(Path(path))
+        with self._lock:
+            info = self._entries.get(key)
+            if info is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return info
+            self._counters["misses"] += 1
+        info = self._run_probe(Path(key[0]))
+        with self._lock:
+            self._store_locked(key, info)
+        return info
+
+    def payload(self, path: str | Path) -> dict[str, Any]:
+        """Return ``path``'s media info plus the file name, size and mtime it is valid for."""
+        info = self.get(path)
+        resolved, size, mtime_ns = _file_key(path)
+        return {"name": Path(resolved).name, "size": size, "mtime_ns": mtime_ns, **media_info_to_payload(info)}
+
+    def seed(self, payload: Mapping[str, Any], directory: str | Path) -> bool:
+        """
+        Cache a stored ``payload`` for the file of that name in ``directory``
+        if it still has the recorded size and mtime. Returns whether it was
+        accepted.
+        """
+        name = payload.get("name")
+        if not isinstance(name, str) or not name or Path(name).name != name:
+            return False
+        try:
+            key = _file_key(Path(directory) / name)
+        except OSError:
+            return False
+        if key[1:] != (payload.get("size"), payload.get("mtime_ns")):
+            return False
+        try:
+            info = media_info_from_payload(payload)
+        except (TypeError, ValueError):
+            logger.debug("Ignoring malformed stored media info for %s", key[0], exc_info=True)
+            return False
+        with self._lock:
+            self._store_locked(key, info)
+            self._counters["seeded"] += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), **self._counters}
+
+
+media_probe_cache = MediaProbeCache()
+
+
+def media_info(path: str | Path) -> MediaInfo:
+    """Return the (cached) media info of ``path``."""
+    return media_probe_cache.get(path)
+
+
+def media_payload(path: str | Path) -> dict[str, Any]:
+    """Return the (cached) media info of ``path`` in the form stored on records."""
+    return media_probe_cache.payload(path)
+
+
+def seed_media_info(payloads: Iterable[Mapping[str, Any]] | None, directory: str | Path) -> None:
+    """Preload the cache from a record's stored ``media`` entries for files in ``directory``."""
+    for payload in payloads or []:
+        media_probe_cache.seed(payload, directory)
@@ -1,4 +1,10 @@
-"""Thread-safe helpers for Clipmato record metadata."""
+"""Thread-safe helpers for Clipmato record metadata.
+
+Records live in ``metadata.json`` by default. ``CLIPMATO_METADATA_BACKEND``
+selects a store that updates one record per change instead of rewriting the
+whole file: ``sqlite`` (:class:`~clipmato.utils.metadata_sqlite.SqliteMetadataStore`)
+or ``sharded`` (:class:`~clipmato.utils.metadata_shards.ShardedMetadataStore`).
+"""
 from __future__ import annotations
 
 import copy
@@ -6,68 +12,239 @@ import json
 import logging
 import os
 import tempfile
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+import threading
+from dataclasses import dataclass, field
 from contextlib import contextmanager
-from typing import Callable, TypeVar
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
 
 import fcntl
 
-from ..config import METADATA_PATH
+from ..config import METADATA_BACKEND, METADATA_DB_PATH, METADATA_PATH, METADATA_SHARDS_DIR
+from .metadata_shards import ShardedMetadataStore
+from .metadata_sqlite import SqliteMetadataStore
+from .record_summary import summarize_record, summary_sort_key
 
 
 metadata_path = METADATA_PATH
 metadata_lock_path = metadata_path.with_suffix(f"{metadata_path.suffix}.lock")
+metadata_backend = METADATA_BACKEND
+metadata_db_path = METADATA_DB_PATH
+metadata_shards_dir = METADATA_SHARDS_DIR
 logger = logging.getLogger(__name__)
 _T = TypeVar("_T")
+_RecordStore = SqliteMetadataStore | ShardedMetadataStore
+_record_stores: dict[tuple[str, Path], _RecordStore] = {}
+_record_stores_lock = threading.Lock()
+
+
+def _record_store() -> _RecordStore | None:
+    """Return the configured per-record store, or None for the ``metadata.json`` backend."""
+    if metadata_backend == "sqlite":
+        key = ("sqlite", metadata_db_path)
+    elif metadata_backend == "sharded":
+        key = ("sharded", metadata_shards_dir)
+    else:
+        return None
+    with _record_stores_lock:
+        store = _record_stores.get(key)
+        if store is None:
+            if key[0] == "sqlite":
+                store = SqliteMetadataStore(metadata_db_path, legacy_json_path=metadata_path)
+            else:
+                store = ShardedMetadataStore(metadata_shards_dir, legacy_json_path=metadata_path)
+            _record_stores[key] = store
+        return store
+
+
+class FrozenDict(dict):
+    """A read-only ``dict`` handed out by the metadata read path.
+
+    It stays a real ``dict`` so JSON encoding, templates, and ``{**record}``
+    keep working. Mutating methods raise ``TypeError``; callers that need
+    to change a record take a mutable copy with :func:`thaw` (or
+    ``dict(record)`` for a shallow one), so copies happen only on write.
+    Nested arrays are :class:`FrozenList` for the same reason.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *_args, **_kwargs):
+        raise TypeError("metadata record views are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """A read-only ``list`` used for array values inside :class:`FrozenDict`."""
+
+    __slots__ = ()
+
+    def _readonly(self, *_args, **_kwargs):
+        raise TypeError("metadata record views are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo) -> list:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value):
+    """Return a read-only view of a decoded JSON value (dicts and lists recursively)."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable deep copy of a value produced by :func:`freeze`."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
 
 
 @dataclass(slots=True)
 class _MetadataSnapshot:
     mtime_ns: int | None
     size: int | None
-    records: list[dict]
+    records: tuple[FrozenDict, ...]
+    by_id: dict[str, FrozenDict] = field(default_factory=dict)
+    summaries: tuple[FrozenDict, ...] | None = None
+
+    @classmethod
+    def build(cls, signature: tuple[int | None, int | None], records: list[dict]) -> "_MetadataSnapshot":
+        views = tuple(freeze(record) for record in records)
+        by_id: dict[str, FrozenDict] = {}
+        for view in views:
+            record_id = view.get("id")
+            if record_id is not None:
+                by_id.setdefault(str(record_id), view)
+        return cls(mtime_ns=signature[0], size=signature[1], records=views, by_id=by_id)
 
 
 class MetadataCache:
-    """Per-process metadata cache invalidated by file size and mtime."""
+    """Per-process metadata cache invalidated by file size and mtime.
+
+    Per-record backends supply their own signature (see ``signature()`` on
+    each store). Records
+    are held as frozen views built once per reload, so readers share them
+    without copying and single-record lookups go through an id index.
+    """
 
     def __init__(self) -> None:
-        self._snapshot = _MetadataSnapshot(mtime_ns=None, size=None, records=[])
+        self._snapshot = _MetadataSnapshot(mtime_ns=None, size=None, records=())
+        self._index_summaries: tuple[tuple[int | None, int | None], tuple[FrozenDict, ...]] | None = None
+        self._orderings: tuple[tuple[FrozenDict, ...], dict[str, tuple[list, list]]] = ((), {})
 
     def _stat_signature(self) -> tuple[int | None, int | None]:
+        store = _record_store()
+        if store is not None:
+            return store.signature()
         if not metadata_path.exists():
             return None, None
         stat = metadata_path.stat()
         return stat.st_mtime_ns, stat.st_size
 
-    def _read_from_disk(self) -> list[dict]:
-        records = _read_records_unlocked()
-        self._snapshot = _MetadataSnapshot(
-            mtime_ns=self._stat_signature()[0],
-            size=self._stat_signature()[1],
-            records=records,
-        )
-        return records
+    def _read_from_disk(self) -> None:
+        store = _record_store()
+        if store is not None:
+            signature, records = store.read_all()
+            self._snapshot = _MetadataSnapshot.build(signature, records)
+            return
+        signature = self._stat_signature()
+        self._snapshot = _MetadataSnapshot.build(signature, _read_records_unlocked())
 
-    def warm(self) -> None:
-        """Preload metadata into memory."""
-        self.records()
-
-    def records(self) -> list[dict]:
-        """Return a detached record list, reloading when the file changed."""
+    def _current(self) -> _MetadataSnapshot:
         mtime_ns, size = self._stat_signature()
         if (mtime_ns, size) != (self._snapshot.mtime_ns, self._snapshot.size):
             self._read_from_disk()
-        return copy.deepcopy(self._snapshot.records)
+        return self._snapshot
 
-    def write_through(self, records: list[dict]) -> None:
+    def warm(self) -> None:
+        """Preload metadata into memory."""
+        self._current()
+
+    def views(self) -> tuple[FrozenDict, ...]:
+        """Return the shared read-only records, reloading when the file changed."""
+        return self._current().records
+
+    def get(self, record_id: str) -> FrozenDict | None:
+        """Return the shared read-only record for ``record_id``, if present."""
+        return self._current().by_id.get(record_id)
+
+    def summaries(self) -> tuple[FrozenDict, ...]:
+        """Return the read-only summary projection of every record, in record order.
+
+        The sharded backend materializes the projection in its index file, so
+        this reads no record shards there; other backends derive it once per
+        snapshot, i.e. once after each metadata mutation.
+        """
+        store = _record_store()
+        if isinstance(store, ShardedMetadataStore):
+            cached = self._index_summaries
+            if cached is None or cached[0] != store.signature():
+                signature, summaries = store.read_summaries()
+                cached = (signature, tuple(freeze(summary) for summary in summaries))
+                self._index_summaries = cached
+            return cached[1]
+        snapshot = self._current()
+        if snapshot.summaries is None:
+            snapshot.summaries = tuple(freeze(summarize_record(record)) for record in snapshot.records)
+        return snapshot.summaries
+
+    def ordered_summaries(self, field: str) -> tuple[list[tuple[str, str]], list[FrozenDict]]:
+        """Return summaries sorted ascending by ``field`` plus their parallel sort keys.
+
+        The ordering is built once per summary snapshot so paginated queries
+        can seek to a cursor with a binary search.
+        """
+        summaries = self.summaries()
+        owner, orderings = self._orderings
+        if owner is not summaries:
+            orderings = {}
+            self._orderings = (summaries, orderings)
+        ordering = orderings.get(field)
+        if ordering is None:
+            keyed = sorted(((summary_sort_key(summary, field), summary) for summary in summaries), key=lambda item: item[0])
+            ordering = ([key for key, _ in keyed], [summary for _, summary in keyed])
+            orderings[field] = ordering
+        return ordering
+
+    def records(self) -> list[dict]:
+        """Return a detached, mutable record list, reloading when the file changed."""
+        return [thaw(record) for record in self.views()]
+
+    def write_through(
+        self,
+        records: list[dict],
+        signature: tuple[int | None, int | None] | None = None,
+    ) -> None:
         """Update the cache immediately after a successful write."""
-        mtime_ns, size = self._stat_signature()
-        self._snapshot = _MetadataSnapshot(
-            mtime_ns=mtime_ns,
-            size=size,
-            records=copy.deepcopy(records),
-        )
+        self._snapshot = _MetadataSnapshot.build(signature or self._stat_signature(), records)
 
 
 metadata_cache = MetadataCache()
@@ -125,7 +302,12 @@ def read_metadata() -> list[dict]:
 
 def mutate_metadata(mutator: Callable[[list[dict]], _T]) -> _T:
     """Apply a read-modify-write mutation to metadata under a process lock."""
+    store = _record_store()
     try:
+        if store is not None:
+            result, signature, records = store.mutate(mutator)
+            metadata_cache.write_through(records, signature)
+            return copy.deepcopy(result)
         with _locked_metadata_file() as handle:
             _ = handle  # lock lifetime only
             records = _read_records_unlocked()
@@ -140,6 +322,10 @@ def mutate_metadata(mutator: Callable[[list[dict]], _T]) -> _T:
 
 def append_metadata(record: dict) -> None:
     """Append a new record to the metadata file."""
+    store = _record_store()
+    if store is not None:
+        store.append(record)
+        return
 
     def _append(records: list[dict]) -> None:
         records.append(copy.deepcopy(record))
@@ -149,6 +335,9 @@ def append_metadata(record: dict) -> None:
 
 def update_metadata(record_id: str, updates: dict) -> dict | None:
     """Merge updates into an existing record and return the updated record."""
+    store = _record_store()
+    if store is not None:
+        return store.update(record_id, updates)
 
     def _update(records: list[dict]) -> dict | None:
         for rec in records:
@@ -162,14 +351,75 @@ def update_metadata(record_id: str, updates: dict) -> dict | None:
 
 def get_metadata_record(record_id: str) -> dict | None:
     """Return a detached record by ID, if present."""
-    for rec in read_metadata():
-        if rec.get("id") == record_id:
-            return copy.deepcopy(rec)
-    return None
+    store = _record_store()
+    if store is not None:
+        try:
+            return store.get(record_id)
+        except Exception:
+            logger.exception("Failed to read metadata record %s", record_id)
+            return None
+    view = get_metadata_record_view(record_id)
+    return thaw(view) if view is not None else None
+
+
+def read_metadata_view() -> tuple[FrozenDict, ...]:
+    """Return the cached records as shared read-only views without copying."""
+    try:
+        return metadata_cache.views()
+    except Exception:
+        logger.exception("Failed to read metadata; returning empty list")
+        return ()
+
+
+def get_metadata_record_view(record_id: str) -> FrozenDict | None:
+    """Return a read-only view of one record by ID in O(1), if present.
+
+    Every backend serves the shared view from the cache snapshot, which is
+    reloaded only when the store's signature changes.
+    """
+    try:
+        return metadata_cache.get(record_id)
+    except Exception:
+        logger.exception("Failed to read metadata record %s", record_id)
+        return None
+
+
+def read_metadata_summaries() -> tuple[FrozenDict, ...]:
+    """Return read-only record summaries (see :mod:`clipmato.utils.record_summary`) for list views."""
+    try:
+        return metadata_cache.summaries()
+    except Exception:
+        logger.exception("Failed to read metadata summaries; returning empty list")
+        return ()
+
+
+def iter_metadata_summaries(
+    *,
+    sort: str = "upload_time",
+    descending: bool = False,
+    after: tuple[str, str] | None = None,
+) -> Iterator[FrozenDict]:
+    """Yield summaries in ``sort`` order, starting strictly after the ``after`` key.
+
+    ``after`` is a :func:`~clipmato.utils.record_summary.summary_sort_key`
+    value taken from the last item of the previous page.
+    """
+    keys, ordered = metadata_cache.ordered_summaries(sort)
+    if descending:
+        start = bisect_left(keys, tuple(after)) if after is not None else len(keys)
+        for index in range(start - 1, -1, -1):
+            yield ordered[index]
+    else:
+        start = bisect_right(keys, tuple(after)) if after is not None else 0
+        for index in range(start, len(keys)):
+            yield ordered[index]
 
 
 def remove_metadata(record_id: str) -> dict | None:
     """Remove a record from metadata and return it, or None if not found."""
+    store = _record_store()
+    if store is not None:
+        return store.remove(record_id)
 
     def _remove(records: list[dict]) -> dict | None:
         for index, rec in enumerate(records):
@@ -0,0 +1,328 @@
+"""Sharded record store used when ``CLIPMATO_METADATA_BACKEND=sharded``.
+
+Layout under ``metadata.d/``::
+
+    index.json          ordered [{file, <summary projection>}] entries
+    records/<file>.json one JSON document per record
+    changes             append-only change counter (one byte per write)
+    locks/              per-record lock files plus the store and index locks
+
+``update_metadata`` locks only the target record (plus a shared store lock),
+rewrites that record's shard, and touches the small index only when the
+record's summary projection changed, so updates to different records run in
+parallel and list views read the index without loading any record shard.
+Whole-list ``mutate_metadata`` calls take the store lock exclusively.
+Readers detect writes from any process by the ``changes`` file's size and
+re-parse only the shards whose stat signature changed.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+import fcntl
+
+from .record_summary import summarize_record
+
+logger = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.-]{1,120}$")
+_CHANGES_ROTATE_BYTES = 1 << 20
+
+
+def shard_name(record_id: str) -> str:
+    """Return the shard file stem for ``record_id`` (hashed when not filename-safe)."""
+    if _SAFE_ID.match(record_id) and not record_id.startswith("."):
+        return record_id
+    return "h-" + hashlib.sha1(record_id.encode("utf-8")).hexdigest()
+
+
+def _index_entry(record: dict, name: str) -> dict[str, Any]:
+    return {"file": name, **summarize_record(record)}
+
+
+def _atomic_write_json(path: Path, payload: Any) -> None:
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ShardedMetadataStore:
+    """One-file-per-record metadata store with a compact id index."""
+
+    def __init__(self, root: Path, *, legacy_json_path: Path | None = None) -> None:
+        self.root = Path(root)
+        self.records_dir = self.root / "records"
+        self.locks_dir = self.root / "locks"
+        self.index_path = self.root / "index.json"
+        self.changes_path = self.root / "changes"
+        self.legacy_json_path = Path(legacy_json_path) if legacy_json_path is not None else None
+        self._parsed: dict[str, tuple[tuple[int, int, int], dict]] = {}
+        self._parsed_lock = threading.Lock()
+        self._ready = False
+
+    # -- locking ------------------------------------------------------------------
+
+    @contextmanager
+    def _flock(self, name: str, mode: int) -> Iterator[None]:
+        self.locks_dir.mkdir(parents=True, exist_ok=True)
+        with (self.locks_dir / f"{name}.lock").open("a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _ensure_ready(self) -> None:
+        if self._ready:
+            return
+        self.records_dir.mkdir(parents=True, exist_ok=True)
+        if not self.index_path.exists():
+            with self._flock(".store", fcntl.LOCK_EX):
+                if not self.index_path.exists():
+                    self._import_legacy_json()
+        self._ready = True
+
+    def _import_legacy_json(self) -> int:
+        """Split ``metadata.json`` into shards once; the index file is the completion marker."""
+        source = self.legacy_json_path
+        records: list[dict] = []
+        if source is not None and source.exists():
+            records = json.loads(source.read_text(encoding="utf-8"))
+        entries = self._write_all(records, previous=[])
+        _atomic_write_json(self.index_path, entries)
+        self._record_change()
+        if records and source is not None:
+            backup = source.with_name(f"{source.name}.imported.bak")
+            shutil.copy2(source, backup)
+            logger.info("Imported %s records from %s into %s (backup at %s)", len(records), source, self.root, backup)
+        return len(records)
+
+    def _record_change(self) -> None:
+        # Every write path lands here, so the counter is rotated here too;
+        # the lock keeps concurrent single-record writers from rotating twice.
+        with self._flock(".changes", fcntl.LOCK_EX):
+            self._rotate_changes_if_large()
+            fd = os.open(self.changes_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, b".")
+            finally:
+                os.close(fd)
+
+    # -- index and shard IO -------------------------------------------------------------
+
+    def _read_index(self) -> list[dict[str, Any]]:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return []
+
+    def _shard_path(self, name: str) -> Path:
+        return self.records_dir / f"{name}.json"
+
+    def _read_shard(self, name: str) -> dict | None:
+        path = self._shard_path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._parsed_lock:
+            cached = self._parsed.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        record = json.loads(path.read_text(encoding="utf-8"))
+        with self._parsed_lock:
+            self._parsed[name] = (signature, record)
+        return record
+
+    def _write_shard(self, name: str, record: dict) -> None:
+        _atomic_write_json(self._shard_path(name), record)
+
+    def _delete_shard(self, name: str) -> None:
+        try:
+            os.remove(self._shard_path(name))
+        except FileNotFoundError:
+            pass
+        with self._parsed_lock:
+            self._parsed.pop(name, None)
+
+    def _update_index(self, mutator: Callable[[list[dict[str, Any]]], bool]) -> None:
+        with self._flock(".index", fcntl.LOCK_EX):
+            entries = self._read_index()
+            if mutator(entries):
+                _atomic_write_json(self.index_path, entries)
+
+    def _write_all(self, records: list[dict], *, previous: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Persist ``records`` as the full library, writing only changed shards."""
+        names: list[str] = []
+        for record in records:
+            if record.get("id") is None:
+                raise ValueError("sharded metadata records need an 'id'")
+            names.append(shard_name(str(record["id"])))
+        kept = set(names)
+        if len(kept) != len(names):
+            raise ValueError("sharded metadata records need unique ids")
+        entries: list[dict[str, Any]] = []
+        for name, record in zip(names, records):
+            if self._read_shard(name) != record:
+                self._write_shard(name, record)
+            entries.append(_index_entry(record, name))
+        for entry in previous:
+            if entry["file"] not in kept:
+                self._delete_shard(entry["file"])
+        return entries
+
+    # -- public API -------------------------------------------------------------------------
+
+    def signature(self) -> tuple[int | None, int | None]:
+        """Return ``(inode, size)`` of the change counter; it grows on every write."""
+        self._ensure_ready()
+        try:
+            stat = os.stat(self.changes_path)
+        except FileNotFoundError:
+            return None, None
+        return stat.st_ino, stat.st_size
+
+    def read_summaries(self) -> tuple[tuple[int | None, int | None], list[dict[str, Any]]]:
+        """Return ``(signature, summaries)`` straight from the index file."""
+        signature = self.signature()
+        with self._flock(".index", fcntl.LOCK_SH):
+            entries = self._read_index()
+        return signature, [{key: value for key, value in entry.items() if key != "file"} for entry in entries]
+
+    def read_all(self) -> tuple[tuple[int | None, int | None], list[dict]]:
+        """Return ``(signature, records)``, re-parsing only shards that changed.
+
+        The records are the store's parsed shards; callers must not mutate them.
+        """
+        signature = self.signature()
+        with self._flock(".store", fcntl.LOCK_SH):
+            records = [
+                record
+                for record in (self._read_shard(entry["file"]) for entry in self._read_index())
+                if record is not None
+            ]
+        return signature, records
+
+    def get(self, record_id: str) -> dict | None:
+        self._ensure_ready()
+        record = self._read_shard(shard_name(record_id))
+        return copy.deepcopy(record) if record is not None else None
+
+    def append(self, record: dict) -> None:
+        self._ensure_ready()
+        name = shard_name(str(record["id"]))
+        with ExitStack() as stack:
+            stack.enter_context(self._flock(".store", fcntl.LOCK_SH))
+            stack.enter_context(self._flock(name, fcntl.LOCK_EX))
+            if self._read_shard(name) is not None:
+                raise ValueError(f"duplicate metadata record id: {record['id']}")
+            self._write_shard(name, record)
+
+            def _add(entries: list[dict[str, Any]]) -> bool:
+                entries.append(_index_entry(record, name))
+                return True
+
+            self._update_index(_add)
+            self._record_change()
+
+    def update(self, record_id: str, updates: dict) -> dict | None:
+        self._ensure_ready()
+        name = shard_name(record_id)
+        with ExitStack() as stack:
+            stack.enter_context(self._flock(".store", fcntl.LOCK_SH))
+            stack.enter_context(self._flock(name, fcntl.LOCK_EX))
+            current = self._read_shard(name)
+            if current is None:
+                return None
+            record = copy.deepcopy(current)
+            record.update(copy.deepcopy(updates))
+            self._write_shard(name, record)
+            if summarize_record(record) != summarize_record(current):
+
+                def _reindex(entries: list[dict[str, Any]]) -> bool:
+                    for index, entry in enumerate(entries):
+                        if entry["file"] == name:
+                            entries[index] = _index_entry(record, name)
+                            return True
+                    return False
+
+                self._update_index(_reindex)
+            self._record_change()
+            return record
+
+    def remove(self, record_id: str) -> dict | None:
+        self._ensure_ready()
+        name = shard_name(record_id)
+        with ExitStack() as stack:
+            stack.enter_context(self._flock(".store", fcntl.LOCK_SH))
+            stack.enter_context(self._flock(name, fcntl.LOCK_EX))
+            current = self._read_shard(name)
+            if current is None:
+                return None
+
+            def _drop(entries: list[dict[str, Any]]) -> bool:
+                entries[:] = [entry for entry in entries if entry["file"] != name]
+                return True
+
+            self._update_index(_drop)
+            self._delete_shard(name)
+            self._record_change()
+            return copy.deepcopy(current)
+
+    def mutate(self, mutator: Callable[[list[dict]], _T]) -> tuple[_T, tuple[int | None, int | None], list[dict]]:
+        """Run a whole-list mutator with the store locked exclusively.
+
+        Only shards whose record changed are rewritten. Returns
+        ``(result, signature, records)`` for cache write-through.
+        """
+        self._ensure_ready()
+        with self._flock(".store", fcntl.LOCK_EX):
+            previous = self._read_index()
+            records = [
+                copy.deepcopy(record)
+                for record in (self._read_shard(entry["file"]) for entry in previous)
+                if record is not None
+            ]
+            result = mutator(records)
+            entries = self._write_all(records, previous=previous)
+            if entries != previous:
+                with self._flock(".index", fcntl.LOCK_EX):
+                    _atomic_write_json(self.index_path, entries)
+            self._record_change()
+            signature = self.signature()
+        return result, signature, records
+
+    def _rotate_changes_if_large(self) -> None:
+        try:
+            size = os.stat(self.changes_path).st_size
+        except FileNotFoundError:
+            return
+        if size < _CHANGES_ROTATE_BYTES:
+            return
+        # A fresh inode keeps signatures unique even though the size restarts.
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".changes_")
+        os.close(fd)
+        os.replace(temp_path, self.changes_path)
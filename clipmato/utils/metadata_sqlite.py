@@ -0,0 +1,302 @@
+"""SQLite-backed record store used when ``CLIPMATO_METADATA_BACKEND=sqlite``.
+
+Each record is one row holding its JSON document, ordered by an integer
+position so ``read_metadata`` keeps the append order of ``metadata.json``.
+Single-record operations touch only their row; whole-list mutators are
+diffed against the loaded rows so only changed, added, or removed records
+are written. A ``revision`` counter in the ``store_meta`` table lets the
+per-process cache detect writes from other processes with one cheap query.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+SCHEMA_VERSION = 1
+_IMPORT_MARKER = "imported_from_json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    position INTEGER PRIMARY KEY,
+    record_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_record_id ON records(record_id, position);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"), sort_keys=True)
+
+
+def _record_id(record: dict) -> str | None:
+    value = record.get("id")
+    return str(value) if value is not None else None
+
+
+class SqliteMetadataStore:
+    """Row-per-record metadata store with WAL journaling.
+
+    Connections are opened per thread; write transactions use
+    ``BEGIN IMMEDIATE`` so concurrent writers queue on SQLite's own lock
+    instead of the metadata flock file.
+    """
+
+    def __init__(self, db_path: Path, *, legacy_json_path: Path | None = None) -> None:
+        self.db_path = Path(db_path)
+        self.legacy_json_path = Path(legacy_json_path) if legacy_json_path is not None else None
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # -- connection management -------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        self._local.connection = connection
+        self._ensure_schema(connection)
+        return connection
+
+    def _ensure_schema(self, connection: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            connection.executescript(_SCHEMA)
+            with self._write(connection):
+                connection.execute(
+                    "INSERT OR IGNORE INTO store_meta(key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+                connection.execute("INSERT OR IGNORE INTO store_meta(key, value) VALUES ('revision', '0')")
+                self._import_legacy_json(connection)
+            self._initialized = True
+
+    @contextmanager
+    def _write(self, connection: sqlite3.Connection | None = None) -> Iterator[sqlite3.Connection]:
+        connection = connection or self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close this thread's connection (other threads keep theirs)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # -- legacy import ----------------------------------------------------------
+
+    def _import_legacy_json(self, connection: sqlite3.Connection) -> int:
+        """Copy ``metadata.json`` into an empty store once and record a marker."""
+        source = self.legacy_json_path
+        if source is None:
+            return 0
+        marker = connection.execute(
+            "SELECT value FROM store_meta WHERE key = ?", (_IMPORT_MARKER,)
+        ).fetchone()
+        if marker is not None:
+            return 0
+        records: list[dict] = []
+        if source.exists():
+            existing = connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+            if existing:
+                logger.warning("Metadata store already has %s records; skipping import of %s", existing, source)
+            else:
+                records = json.loads(source.read_text(encoding="utf-8"))
+                self._insert_all(connection, records)
+                backup = source.with_name(f"{source.name}.imported.bak")
+                shutil.copy2(source, backup)
+                logger.info("Imported %s records from %s (backup at %s)", len(records), source, backup)
+        connection.execute(
+            "INSERT INTO store_meta(key, value) VALUES (?, ?)",
+            (_IMPORT_MARKER, datetime.now(timezone.utc).isoformat()),
+        )
+        if records:
+            self._bump_revision(connection)
+        return len(records)
+
+    # -- helpers ----------------------------------------------------------------
+
+    @staticmethod
+    def _bump_revision(connection: sqlite3.Connection) -> None:
+        connection.execute("UPDATE store_meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'revision'")
+
+    @staticmethod
+    def _insert_all(connection: sqlite3.Connection, records: list[dict], *, start: int = 1) -> None:
+        connection.executemany(
+            "INSERT INTO records(position, record_id, data) VALUES (?, ?, ?)",
+            [(start + offset, _record_id(record), _dumps(record)) for offset, record in enumerate(records)],
+        )
+
+    @staticmethod
+    def _load_rows(connection: sqlite3.Connection) -> list[tuple[int, str | None, str]]:
+        return connection.execute("SELECT position, record_id, data FROM records ORDER BY position").fetchall()
+
+    @staticmethod
+    def _find(connection: sqlite3.Connection, record_id: str) -> tuple[int, str] | None:
+        return connection.execute(
+            "SELECT position, data FROM records WHERE record_id = ? ORDER BY position LIMIT 1",
+            (record_id,),
+        ).fetchone()
+
+    # -- public API -------------------------------------------------------------
+
+    def revision(self) -> int:
+        row = self._connect().execute("SELECT value FROM store_meta WHERE key = 'revision'").fetchone()
+        return int(row[0]) if row else 0
+
+    def signature(self) -> tuple[int | None, int | None]:
+        """Return the cache signature ``(revision, None)``."""
+        return self.revision(), None
+
+    def read_all(self) -> tuple[tuple[int | None, int | None], list[dict]]:
+        """Return ``(signature, records)`` from one consistent read."""
+        connection = self._connect()
+        connection.execute("BEGIN")
+        try:
+            signature = self.signature()
+            records = [json.loads(row[2]) for row in self._load_rows(connection)]
+        finally:
+            connection.execute("COMMIT")
+        return signature, records
+
+    def get(self, record_id: str) -> dict | None:
+        row = self._find(self._connect(), record_id)
+        return json.loads(row[1]) if row else None
+
+    def append(self, record: dict) -> None:
+        with self._write() as connection:
+            connection.execute(
+                "INSERT INTO records(position, record_id, data) "
+                "VALUES ((SELECT COALESCE(MAX(position), 0) + 1 FROM records), ?, ?)",
+                (_record_id(record), _dumps(record)),
+            )
+            self._bump_revision(connection)
+
+    def update(self, record_id: str, updates: dict) -> dict | None:
+        with self._write() as connection:
+            row = self._find(connection, record_id)
+            if row is None:
+                return None
+            record = json.loads(row[1])
+            record.update(copy.deepcopy(updates))
+            connection.execute("UPDATE records SET data = ? WHERE position = ?", (_dumps(record), row[0]))
+            self._bump_revision(connection)
+            return record
+
+    def remove(self, record_id: str) -> dict | None:
+        with self._write() as connection:
+            row = self._find(connection, record_id)
+            if row is None:
+                return None
+            connection.execute("DELETE FROM records WHERE position = ?", (row[0],))
+            self._bump_revision(connection)
+            return json.loads(row[1])
+
+    def mutate(self, mutator: Callable[[list[dict]], _T]) -> tuple[_T, tuple[int | None, int | None], list[dict]]:
+        """Run a whole-list mutator and persist only the rows it changed.
+
+        Returns ``(result, signature, records)`` so callers can refresh caches
+        without re-reading the store.
+        """
+        with self._write() as connection:
+            rows = self._load_rows(connection)
+            records = [json.loads(row[2]) for row in rows]
+            result = mutator(records)
+            if self._apply_diff(connection, rows, records):
+                self._bump_revision(connection)
+            signature = self.signature()
+        return result, signature, records
+
+    def _apply_diff(
+        self,
+        connection: sqlite3.Connection,
+        rows: list[tuple[int, str | None, str]],
+        records: list[dict],
+    ) -> bool:
+        """Write the difference between ``rows`` and ``records``; return whether anything changed."""
+        before = {record_id: (position, data) for position, record_id, data in rows if record_id is not None}
+        after_ids = [_record_id(record) for record in records]
+        keyed = (
+            len(before) == len(rows)
+            and None not in after_ids
+            and len(set(after_ids)) == len(after_ids)
+        )
+        plan: list[tuple[str, Any]] = []
+        if keyed:
+            last_position = 0
+            next_position = (rows[-1][0] if rows else 0) + 1
+            appending = False
+            for record_id, record in zip(after_ids, records):
+                data = _dumps(record)
+                existing = before.get(record_id)
+                if existing is None:
+                    plan.append(("insert", (next_position, record_id, data)))
+                    next_position += 1
+                    appending = True
+                    continue
+                position, previous = existing
+                if appending or position < last_position:
+                    keyed = False  # reordered or inserted mid-list; rewrite below
+                    break
+                last_position = position
+                if data != previous:
+                    plan.append(("update", (data, position)))
+        if not keyed:
+            new_rows = [(after_ids[index], _dumps(record)) for index, record in enumerate(records)]
+            if [(row[1], row[2]) for row in rows] == new_rows:
+                return False
+            connection.execute("DELETE FROM records")
+            self._insert_all(connection, records)
+            return True
+        removed = set(before) - set(after_ids)
+        for record_id in removed:
+            connection.execute("DELETE FROM records WHERE position = ?", (before[record_id][0],))
+        for action, params in plan:
+            if action == "insert":
+                connection.execute("INSERT INTO records(position, record_id, data) VALUES (?, ?, ?)", params)
+            else:
+                connection.execute("UPDATE records SET data = ? WHERE position = ?", params)
+        return bool(removed or plan)
+
+
+def import_json_metadata(json_path: Path, db_path: Path) -> int:
+    """Import ``json_path`` into the SQLite store at ``db_path`` if not done yet.
+
+    Returns the number of imported records (0 when the import already ran).
+    """
+    store = SqliteMetadataStore(db_path)
+    try:
+        store._connect()
+        store.legacy_json_path = Path(json_path)
+        with store._write() as connection:
+            return store._import_legacy_json(connection)
+    finally:
+        store.close()
@@ -0,0 +1,162 @@
+"""Durable per-record checkpoints for the processing pipeline.
+
+The processing queue writes ``pipeline_checkpoints/<id>.json`` when a job is
+accepted. ``process_file_async`` rewrites it after every completed stage with
+the stage names and their context outputs, and deletes it once the record is
+stored. On startup, any checkpoint still on disk is an interrupted job: it is
+re-queued and the pipeline skips the stages it already completed.
+
+A job holds ``<id>.lock`` (a non-blocking ``flock``) while it runs, so a
+second web worker scanning checkpoints at startup does not resume a job that
+is still running elsewhere. The lock file is only unlinked by a process
+holding the lock, once the checkpoint is gone. Claimers re-check after
+locking that the path still names the inode they locked, so a claim can
+never succeed on an unlinked lock file.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+import fcntl
+
+from ..config import PIPELINE_CHECKPOINTS_DIR
+
+logger = logging.getLogger(__name__)
+
+checkpoints_dir = PIPELINE_CHECKPOINTS_DIR
+CHECKPOINT_VERSION = 1
+
+
+def _checkpoint_path(record_id: str) -> Path:
+    return Path(checkpoints_dir) / f"{record_id}.json"
+
+
+def _lock_path(record_id: str) -> Path:
+    return Path(checkpoints_dir) / f"{record_id}.lock"
+
+
+def load_checkpoint(record_id: str) -> dict[str, Any] | None:
+    """Return the checkpoint for ``record_id``, or None when missing or unreadable."""
+    try:
+        payload = json.loads(_checkpoint_path(record_id).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable pipeline checkpoint for %s", record_id)
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != CHECKPOINT_VERSION:
+        return None
+    return payload
+
+
+def save_checkpoint(
+    record_id: str,
+    job: dict[str, Any],
+    *,
+    completed_stages: list[str] | None = None,
+    context: dict[str, Any] | None = None,
+    priority: str = "normal",
+) -> dict[str, Any]:
+    """Atomically write the checkpoint for ``record_id`` and return it."""
+    now = datetime.now(UTC).isoformat()
+    previous = load_checkpoint(record_id) or {}
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "record_id": record_id,
+        "job": job,
+        "priority": priority,
+        "completed_stages": list(completed_stages or []),
+        "context": dict(context or {}),
+        "created_at": previous.get("created_at", now),
+        "updated_at": now,
+    }
+    path = _checkpoint_path(record_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{record_id}_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return payload
+
+
+def delete_checkpoint(record_id: str) -> None:
+    """
+    Remove the checkpoint. The lock file is left to whoever holds the run
+    lock (it drops it on release), or dropped here when nobody does.
+    """
+    try:
+        os.remove(_checkpoint_path(record_id))
+    except FileNotFoundError:
+        pass
+    with claim(record_id):
+        pass
+
+
+def list_checkpoints() -> list[dict[str, Any]]:
+    """Return every readable checkpoint, oldest first."""
+    directory = Path(checkpoints_dir)
+    if not directory.exists():
+        return []
+    checkpoints = [
+        checkpoint
+        for checkpoint in (load_checkpoint(path.stem) for path in directory.glob("*.json"))
+        if checkpoint is not None
+    ]
+    return sorted(checkpoints, key=lambda checkpoint: checkpoint.get("created_at", ""))
+
+
+@contextmanager
+def claim(record_id: str) -> Iterator[bool]:
+    """Hold the record's run lock; yields False when another process holds it."""
+    path = _lock_path(record_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        handle = path.open("a+", encoding="utf-8")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            yield False
+            return
+        try:
+            current = os.stat(path).st_ino
+        except FileNotFoundError:
+            current = None
+        if current == os.fstat(handle.fileno()).st_ino:
+            break
+        # a finished job unlinked the file between our open and flock; lock the new one
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+    try:
+        yield True
+    finally:
+        try:
+            if not _checkpoint_path(record_id).exists():
+                path.unlink(missing_ok=True)  # still locked, so no claimer can be using this inode
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+
+
+def is_claimed(record_id: str) -> bool:
+    """Return whether some process currently holds the record's run lock."""
+    if not _lock_path(record_id).exists():
+        return False
+    with claim(record_id) as acquired:
+        return not acquired
@@ -31,12 +31,31 @@ def present_record(record: dict[str, Any]) -> dict[str, Any]:
     presented["is_processing"] = presented.get("progress", 100) < 100 and not presented.get("error")
     presented["is_failed"] = bool(presented.get("error")) or presented.get("stage") == "error"
     presented["is_published"] = youtube_job.get("status") == "published"
+    presented["media_items"] = [_describe_media(item) for item in presented.get("media") or []]
     presented["display_title"] = presented.get("selected_title") or presented.get("filename") or "Untitled episode"
     presented["display_title_helper"] = helper_text["title_helper"]
     presented["display_subtitle_helper"] = helper_text["subtitle_helper"]
     return presented
 
 
+def _describe_media(media: dict[str, Any]) -> dict[str, str]:
+    """Summarize a record's stored probe as a file name plus one line of container and stream details."""
+    parts = [str(media.get("format_name") or "unknown format").split(",")[0]]
+    if media.get("duration"):
+        parts.append(f"{media['duration']:.1f}s")
+    for stream in media.get("streams") or []:
+        details = [stream.get("codec_name") or stream.get("codec_type") or "unknown"]
+        if stream.get("codec_type") == "audio":
+            if stream.get("sample_rate"):
+                details.append(f"{stream['sample_rate'] / 1000:g} kHz")
+            if stream.get("channel_layout") or stream.get("channels"):
+                details.append(str(stream.get("channel_layout") or f"{stream['channels']} ch"))
+        elif stream.get("width") and stream.get("height"):
+            details.append(f"{stream['width']}x{stream['height']}")
+        parts.append(" ".join(details))
+    return {"name": str(media.get("name") or ""), "summary": " · ".join(parts)}
+
+
 def workflow_metrics(records: list[dict[str, Any]]) -> dict[str, int]:
     """Summarize the current workflow state for the shared app shell."""
     processing = 0
@@ -1,33 +1,119 @@
 import json
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from .file_io import upload_dir
-from ..config import STAGE_PROGRESS
+from .progress_store import ProgressStore
+from ..config import PROGRESS_LOG_PATH, STAGE_PROGRESS
 from ..services.eventing import emit_event
 
 logger = logging.getLogger(__name__)
 
+_LEGACY_SUFFIX = ".status.json"
+_PENDING = {"stage": "pending", "progress": 0}
+_UNREADABLE = {
+    "stage": "error",
+    "progress": 0,
+    "error": "invalid_progress_file",
+    "message": "Progress data is unreadable. Please retry or restart this job.",
+}
+_stores: dict[Path, ProgressStore] = {}
+_stores_lock = threading.Lock()
+
 
 def get_status_file(record_id: str) -> Path:
-    """Return the path to the status file for a given record ID."""
-    return Path(upload_dir) / f"{record_id}.status.json"
+    """Return the path to the legacy per-record status file for a given record ID."""
+    return Path(upload_dir) / f"{record_id}{_LEGACY_SUFFIX}"
+
+
+def _progress_store() -> ProgressStore:
+    path = Path(upload_dir) / PROGRESS_LOG_PATH.name
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ProgressStore(path)
+        return store
 
 
-def update_progress(record_id: str, stage: str, message: str | None = None) -> None:
-    """Write the current stage, its mapped percentage, and optional message to the status file."""
+class _LegacyStatusFiles:
+    """Read-only view of pre-existing ``<id>.status.json`` files.
+
+    The directory listing is cached until the directory's mtime changes, so
+    bulk lookups for records without a legacy file cost no extra syscalls;
+    files that do exist are re-parsed only when their stat signature changes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._signature: tuple[Path, int] | None = None
+        self._names: set[str] = set()
+        self._parsed: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+    def _refresh(self, directory: Path) -> None:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            self._signature, self._names, self._parsed = None, set(), {}
+            return
+        if self._signature == (directory, mtime_ns):
+            return
+        with os.scandir(directory) as entries:
+            self._names = {entry.name for entry in entries if entry.name.endswith(_LEGACY_SUFFIX)}
+        self._parsed = {}
+        self._signature = (directory, mtime_ns)
+
+    def lookup(self, record_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        directory = Path(upload_dir)
+        with self._lock:
+            self._refresh(directory)
+            found: dict[str, dict[str, Any]] = {}
+            for record_id in record_ids:
+                name = f"{record_id}{_LEGACY_SUFFIX}"
+                if name not in self._names:
+                    continue
+                path = directory / name
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                cached = self._parsed.get(name)
+                if cached is None or cached[0] != signature:
+                    cached = (signature, _read_status_file(path) or dict(_PENDING))
+                    self._parsed[name] = cached
+                found[record_id] = dict(cached[1])
+            return found
+
+
+_legacy_status_files = _LegacyStatusFiles()
+
+
+def update_progress(
+    record_id: str,
+    stage: str,
+    message: str | None = None,
+    *,
+    details: dict[str, Any] | None = None,
+) -> None:
+    """Record the current stage, its mapped percentage, and optional message in the progress store.
+
+    ``details`` (e.g. partial transcript segments) are added to the
+    ``record.progress.updated`` event only and are not kept in the store.
+    """
     percent = STAGE_PROGRESS.get(stage, 0)
     status: dict[str, object] = {"stage": stage, "progress": percent}
     if message:
         status["message"] = message
-    _atomic_write(get_status_file(record_id), status)
+    _progress_store().write(record_id, status)
     try:
         emit_event(
             "record.progress.updated",
             aggregate_id=record_id,
             record_id=record_id,
-            payload=status,
+            payload={**status, **details} if details else status,
             correlation_id=record_id,
             source="progress",
         )
@@ -37,28 +123,45 @@ def update_progress(record_id: str, stage: str, message: str | None = None) -> N
 
 def read_progress(record_id: str) -> dict:
     """Read and return the progress status for a given record ID."""
-    status_file = get_status_file(record_id)
-    if status_file.exists():
-        try:
-            raw_status = json.loads(status_file.read_text())
-            return _validate_status(raw_status)
-        except Exception:
-            return {
-                "stage": "error",
-                "progress": 0,
-                "error": "invalid_progress_file",
-                "message": "Progress data is unreadable. Please retry or restart this job.",
-            }
-    return {"stage": "pending", "progress": 0}
+    status = _progress_store().get(record_id)
+    if status is not None:
+        return _validate_or_unreadable(status)
+    return _read_status_file(get_status_file(record_id)) or dict(_PENDING)
+
 
+def read_progress_many(record_ids: Iterable[str]) -> dict[str, dict]:
+    """Return the progress status for every ID with one store lookup.
+
+    IDs missing from the progress store fall back to legacy status files and
+    then to ``pending``.
+    """
+    record_ids = list(record_ids)
+    statuses = {
+        record_id: _validate_or_unreadable(status)
+        for record_id, status in _progress_store().get_many(record_ids).items()
+    }
+    missing = [record_id for record_id in record_ids if record_id not in statuses]
+    if missing:
+        statuses.update(_legacy_status_files.lookup(missing))
+    return {record_id: statuses.get(record_id) or dict(_PENDING) for record_id in record_ids}
+
+
+def _read_status_file(path: Path) -> dict[str, Any] | None:
+    """Read one legacy status file; None when it does not exist."""
+    try:
+        raw_status = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception:
+        return dict(_UNREADABLE)
+    return _validate_or_unreadable(raw_status)
 
-def _atomic_write(path: Path, data: dict[str, Any]) -> None:
-    """Atomically write JSON data to ``path`` to avoid partial writes."""
 
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
-    tmp_path.write_text(json.dumps(data))
-    tmp_path.replace(path)
+def _validate_or_unreadable(raw: Any) -> dict[str, Any]:
+    try:
+        return _validate_status(raw)
+    except Exception:
+        return dict(_UNREADABLE)
 
 
 def _validate_status(raw: Any) -> dict[str, Any]:
@@ -95,13 +198,19 @@ def enrich_with_progress(records: list[dict]) -> list[dict]:
     """
     Merge each record dict with its current progress status (stage & percentage).
     """
+    statuses = read_progress_many(str(rec.get("id", "")) for rec in records)
     enriched = []
     for rec in records:
-        status = read_progress(rec.get("id", ""))
+        status = statuses[str(rec.get("id", ""))]
         if status.get("stage") == "pending":
             if rec.get("error"):
                 status = {"stage": "error", "progress": 0, "message": rec.get("error")}
-            elif rec.get("transcript") or rec.get("titles") or rec.get("short_description"):
+            elif (
+                rec.get("transcript")
+                or rec.get("titles")
+                or rec.get("short_description")
+                or rec.get("has_generated_content")
+            ):
                 status = {"stage": "complete", "progress": 100}
         merged = {**rec, **status}
         enriched.append(merged)
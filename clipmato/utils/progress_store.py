@@ -0,0 +1,119 @@
+"""Shared progress table backed by one append-only JSONL log.
+
+Every ``update_progress`` call appends one ``{"record_id", "status"}`` line
+to ``progress.jsonl``. Each process keeps the latest status per record in
+memory and tails the log from its last offset, so a bulk lookup for a whole
+library costs one ``stat`` (plus reading any new lines) instead of one file
+open per record. The log is compacted to one line per record once it grows
+well past the number of records; readers notice the new inode and reload.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import fcntl
+
+logger = logging.getLogger(__name__)
+
+COMPACT_MIN_LINES = 1000
+COMPACT_RATIO = 4
+
+
+class ProgressStore:
+    """In-memory progress table kept in sync with an append-only log file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self._lock = threading.Lock()
+        self._table: dict[str, dict[str, Any]] = {}
+        self._inode: int | None = None
+        self._offset = 0
+        self._lines = 0
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _refresh_locked(self) -> None:
+        """Apply lines appended since the last refresh; caller holds ``self._lock``."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._table, self._inode, self._offset, self._lines = {}, None, 0, 0
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._table, self._inode, self._offset, self._lines = {}, stat.st_ino, 0, 0
+        if stat.st_size == self._offset:
+            return
+        with self.path.open("rb") as handle:
+            handle.seek(self._offset)
+            chunk = handle.read(stat.st_size - self._offset)
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return  # a writer is mid-line; pick it up next time
+        for line in chunk[: end + 1].splitlines():
+            self._lines += 1
+            try:
+                entry = json.loads(line)
+                self._table[str(entry["record_id"])] = dict(entry["status"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Skipping malformed progress log line in %s", self.path)
+        self._offset += end + 1
+
+    def get(self, record_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            self._refresh_locked()
+            status = self._table.get(record_id)
+            return dict(status) if status is not None else None
+
+    def get_many(self, record_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the known statuses for ``record_ids`` after a single refresh."""
+        with self._lock:
+            self._refresh_locked()
+            return {record_id: dict(self._table[record_id]) for record_id in record_ids if record_id in self._table}
+
+    def write(self, record_id: str, status: dict[str, Any]) -> None:
+        line = json.dumps({"record_id": record_id, "status": status}, separators=(",", ":")) + "\n"
+        with self._locked():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as handle:
+                handle.write(line.encode("utf-8"))
+                handle.flush()
+            with self._lock:
+                self._refresh_locked()
+                if self._lines >= COMPACT_MIN_LINES and self._lines > COMPACT_RATIO * len(self._table):
+                    self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        """Rewrite the log with one line per record; caller holds both locks."""
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.stem}_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                for record_id, status in self._table.items():
+                    handle.write(json.dumps({"record_id": record_id, "status": status}, separators=(",", ":")) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            logger.exception("Failed to compact progress log %s", self.path)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self._inode = None
+        self._refresh_locked()
@@ -0,0 +1,51 @@
+"""Summary projection of metadata records for list views.
+
+List pages, ``/api/v1/records``, and ``workflow_metrics`` only need a dozen
+small fields per record. The projection keeps exactly those, replacing the
+transcript, descriptions, and title suggestions with a single
+``has_generated_content`` flag, so list views never touch the large fields.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+SUMMARY_FIELDS = (
+    "id",
+    "filename",
+    "selected_title",
+    "upload_time",
+    "schedule_time",
+    "error",
+    "project_context",
+    "publish_targets",
+)
+
+
+def summarize_record(record: dict[str, Any]) -> dict[str, Any]:
+    """Return the list-view projection of one record."""
+    summary = {field: record.get(field) for field in SUMMARY_FIELDS if field in record}
+    youtube_job = (record.get("publish_jobs") or {}).get("youtube")
+    if youtube_job:
+        summary["publish_jobs"] = {"youtube": youtube_job}
+    summary["has_generated_content"] = bool(
+        record.get("transcript") or record.get("titles") or record.get("short_description")
+    )
+    return summary
+
+
+SORT_FIELDS = ("upload_time", "schedule_time")
+
+
+def summary_sort_key(summary: dict[str, Any], field: str) -> tuple[str, str]:
+    """Return the ``(value, id)`` ordering key for ``field``; ids break ties.
+
+    ``schedule_time`` falls back to ``upload_time`` for unscheduled records,
+    matching the scheduler's ordering.
+    """
+    if field == "schedule_time":
+        value = summary.get("schedule_time") or summary.get("upload_time")
+    elif field == "upload_time":
+        value = summary.get("upload_time")
+    else:
+        raise ValueError(f"Unsupported sort field: {field}")
+    return str(value or ""), str(summary.get("id") or "")
@@ -0,0 +1,181 @@
+"""Content-addressed cache of finished transcripts.
+
+Entries are keyed by the SHA-256 of the uploaded file (combined with the WAV
+conversion settings when the upload gets converted) plus the transcription
+backend, model, and language, so re-uploading the same
+recording (e.g. to retry with different presets or prompt versions) reuses
+the transcript instead of running Whisper again. Each entry is one JSON file
+under ``transcript_cache/<k[:2]>/<k>.json``. A hit refreshes the entry's
+mtime, and once the cache grows past ``max_bytes`` the least recently used
+entries are deleted.
+
+Hit/miss/store/eviction counters live in ``stats.json`` so they add up
+across web and stage worker processes. Cache failures are logged and never
+fail a transcription.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+import fcntl
+
+from ..config import TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("hits", "misses", "stores", "evictions")
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def audio_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of ``path``'s bytes."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class TranscriptCache:
+    """On-disk LRU cache of transcripts addressed by audio hash and transcription settings."""
+
+    def __init__(self, root: Path, *, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(audio_hash: str, *, backend: str, model: str, language: str | None) -> str:
+        material = "\n".join([audio_hash, backend, model, language or "auto"])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / ".lock").open("a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_counters(self) -> dict[str, int]:
+        try:
+            raw = json.loads((self.root / "stats.json").read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            raw = {}
+        return {name: int(raw.get(name, 0)) for name in _COUNTERS}
+
+    def _count(self, **increments: int) -> None:
+        with self._locked():
+            counters = self._read_counters()
+            for name, amount in increments.items():
+                counters[name] += amount
+            _atomic_write_json(self.root / "stats.json", counters)
+
+    def _entries(self) -> list[os.DirEntry]:
+        entries: list[os.DirEntry] = []
+        if not self.root.exists():
+            return entries
+        with os.scandir(self.root) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    entries.extend(entry for entry in files if entry.name.endswith(".json"))
+        return entries
+
+    def get(self, key: str) -> str | None:
+        """Return the cached transcript for ``key`` (refreshing its LRU position) or None."""
+        path = self._entry_path(key)
+        try:
+            transcript = json.loads(path.read_text(encoding="utf-8"))["transcript"]
+            os.utime(path)
+        except FileNotFoundError:
+            transcript = None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable transcript cache entry %s", path)
+            transcript = None
+        try:
+            self._count(**({"hits": 1} if transcript is not None else {"misses": 1}))
+        except OSError:
+            logger.warning("Failed to update transcript cache counters", exc_info=True)
+        return transcript
+
+    def put(self, key: str, transcript: str, **details: Any) -> None:
+        """Store ``transcript`` under ``key`` and evict least recently used entries past ``max_bytes``."""
+        payload = {"transcript": transcript, "created_at": datetime.now(UTC).isoformat(), **details}
+        try:
+            with self._locked():
+                _atomic_write_json(self._entry_path(key), payload)
+                evicted = self._evict_locked()
+                counters = self._read_counters()
+                counters["stores"] += 1
+                counters["evictions"] += evicted
+                _atomic_write_json(self.root / "stats.json", counters)
+        except OSError:
+            logger.warning("Failed to store transcript cache entry %s", key, exc_info=True)
+
+    def _evict_locked(self) -> int:
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _mtime, size, _path in entries)
+        evicted = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        return evicted
+
+    def stats(self) -> dict[str, int]:
+        """Return the shared counters plus the current entry count and size."""
+        sizes = []
+        for entry in self._entries():
+            try:
+                sizes.append(entry.stat().st_size)
+            except FileNotFoundError:
+                continue
+        return {
+            **self._read_counters(),
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+        }
+
+
+transcript_cache = TranscriptCache(TRANSCRIPT_CACHE_DIR, max_bytes=TRANSCRIPT_CACHE_MAX_BYTES)
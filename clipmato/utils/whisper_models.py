@@ -0,0 +1,270 @@
+"""Process-wide pool of loaded local Whisper models.
+
+Models used to live in an ``lru_cache(maxsize=4)``, so switching models in
+Settings could pin four large models in memory until restart. The pool keeps
+models up to a memory budget (``CLIPMATO_LOCAL_WHISPER_MEMORY_MB``) instead,
+measured from each model's parameter and buffer sizes, and evicts the least
+recently used ones past it. The model being requested is always kept, even
+when it alone exceeds the budget. Before loading, room is made from the
+model's known parameter count so two large models are not resident at once.
+Concurrent requests for the same model wait for one load.
+
+Every process that transcribes (the web process in thread mode, each stage
+worker in process mode) has its own pool and publishes a snapshot to
+``whisper_models/<pid>.json``; ``collect_model_stats()`` merges the live
+snapshots so the web process can report load times and resident sizes.
+"""
+from __future__ import annotations
+
+import atexit
+import gc
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from ..config import LOCAL_WHISPER_MEMORY_BYTES, WHISPER_MODEL_STATS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Parameter counts of the published openai-whisper checkpoints (float32 once loaded).
+_KNOWN_PARAMETERS = {
+    "tiny": 39_000_000,
+    "base": 74_000_000,
+    "small": 244_000_000,
+    "medium": 769_000_000,
+    "large": 1_550_000_000,
+    "turbo": 809_000_000,
+}
+
+
+def estimated_model_bytes(model_name: str) -> int:
+    """Return the expected resident size of ``model_name``, or 0 when unknown."""
+    name = model_name.split(".", 1)[0]  # "base.en" -> "base"
+    if name.endswith("turbo"):
+        name = "turbo"
+    elif name.startswith("large"):
+        name = "large"
+    return _KNOWN_PARAMETERS.get(name, 0) * 4
+
+
+def model_resident_bytes(model: Any) -> int:
+    """Sum the tensor sizes of a torch module's parameters and buffers (0 for other objects)."""
+    total = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(model, attr, None)
+        if not callable(tensors):
+            continue
+        try:
+            total += sum(tensor.numel() * tensor.element_size() for tensor in tensors())
+        except Exception:
+            logger.debug("Could not measure Whisper model %s", attr, exc_info=True)
+    return total
+
+
+def _release_accelerator_memory(device: str) -> None:
+    gc.collect()
+    if device != "cuda":
+        return
+    try:
+        import torch
+
+        torch.cuda.empty_cache()
+    except Exception:
+        logger.debug("Could not release CUDA cache", exc_info=True)
+
+
+@dataclass
+class LoadedModel:
+    model_name: str
+    device: str
+    resident_bytes: int
+    load_seconds: float
+    loaded_at: str
+    last_used_at: str
+    uses: int = 0
+
+    def touch(self) -> None:
+        self.uses += 1
+        self.last_used_at = datetime.now(UTC).isoformat()
+
+
+class WhisperModelPool:
+    """Memory-budgeted LRU pool of Whisper models keyed by (model name, device)."""
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], Any],
+        *,
+        max_bytes: int = LOCAL_WHISPER_MEMORY_BYTES,
+        stats_dir: Path | None = WHISPER_MODEL_STATS_DIR,
+    ) -> None:
+        self._loader = loader
+        self.max_bytes = max_bytes
+        self.stats_dir = Path(stats_dir) if stats_dir is not None else None
+        self._models: OrderedDict[tuple[str, str], tuple[Any, LoadedModel]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._counters = {"loads": 0, "evictions": 0}
+        self._published = False
+
+    def _cached(self, key: tuple[str, str]) -> Any | None:
+        cached = self._models.get(key)
+        if cached is None:
+            return None
+        self._models.move_to_end(key)
+        cached[1].touch()
+        return cached[0]
+
+    def get(self, model_name: str, device: str) -> Any:
+        """Return the loaded model, loading it (and evicting others past the budget) if needed."""
+        key = (model_name, device)
+        with self._lock:
+            model = self._cached(key)
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        if model is not None:
+            self._publish()
+            return model
+        with load_lock:
+            with self._lock:
+                model = self._cached(key)
+                if model is not None:
+                    return model
+                evicted = self._evict_locked(keep=key, reserve=estimated_model_bytes(model_name))
+            if evicted:
+                _release_accelerator_memory(device)
+            started = time.perf_counter()
+            model = self._loader(model_name, device)
+            elapsed = time.perf_counter() - started
+            now = datetime.now(UTC).isoformat()
+            entry = LoadedModel(
+                model_name=model_name,
+                device=device,
+                resident_bytes=model_resident_bytes(model),
+                load_seconds=round(elapsed, 3),
+                loaded_at=now,
+                last_used_at=now,
+                uses=1,
+            )
+            with self._lock:
+                self._models[key] = (model, entry)
+                self._counters["loads"] += 1
+                evicted = self._evict_locked(keep=key)
+        logger.info(
+            "Loaded Whisper model '%s' on %s in %.1fs (%.0f MB resident)",
+            model_name,
+            device,
+            elapsed,
+            entry.resident_bytes / (1024 * 1024),
+        )
+        if evicted:
+            _release_accelerator_memory(device)
+        self._publish()
+        return model
+
+    def _evict_locked(self, *, keep: tuple[str, str], reserve: int = 0) -> int:
+        evicted = 0
+        for key in list(self._models):
+            total = sum(entry.resident_bytes for _model, entry in self._models.values())
+            if total + reserve <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            _model, entry = self._models.pop(key)
+            logger.info("Evicting Whisper model '%s' on %s to stay within the memory budget", *key)
+            evicted += 1
+        self._counters["evictions"] += evicted
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+        gc.collect()
+        self._publish()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            models = [asdict(entry) for _model, entry in self._models.values()]
+            counters = dict(self._counters)
+        return {
+            "pid": os.getpid(),
+            "max_bytes": self.max_bytes,
+            "resident_bytes": sum(model["resident_bytes"] for model in models),
+            **counters,
+            "models": models,
+        }
+
+    def _snapshot_path(self) -> Path | None:
+        return self.stats_dir / f"{os.getpid()}.json" if self.stats_dir is not None else None
+
+    def _publish(self) -> None:
+        path = self._snapshot_path()
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(self.stats(), handle)
+            os.replace(temp_path, path)
+        except OSError:
+            logger.warning("Failed to publish Whisper model pool stats", exc_info=True)
+            return
+        if not self._published:
+            self._published = True
+            atexit.register(self._unpublish)
+
+    def _unpublish(self) -> None:
+        path = self._snapshot_path()
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect_model_stats(stats_dir: Path = WHISPER_MODEL_STATS_DIR) -> dict[str, Any]:
+    """Merge the published pool snapshots of all live processes."""
+    merged: dict[str, Any] = {
+        "max_bytes": LOCAL_WHISPER_MEMORY_BYTES,
+        "resident_bytes": 0,
+        "loads": 0,
+        "evictions": 0,
+        "processes": 0,
+        "models": [],
+    }
+    try:
+        paths = sorted(Path(stats_dir).glob("*.json"))
+    except OSError:
+        return merged
+    for path in paths:
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if not _pid_alive(pid):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        merged["processes"] += 1
+        for name in ("resident_bytes", "loads", "evictions"):
+            merged[name] += int(snapshot.get(name, 0))
+        merged["models"].extend({**model, "pid": pid} for model in snapshot.get("models") or [])
+    return merged
@@ -1,6 +1,7 @@
 """Main FastAPI application entrypoint."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -11,6 +12,9 @@ from . import __version__
 from .api.errors import correlation_id_middleware, register_api_exception_handlers
 from .config import STATIC_BUILD_DIR
 from .dependencies import get_eventing_service, get_publishing_service
+from .services.processing_queue import processing_queue
+from .services.stage_executor import stage_executor
+from .steps.transcription import warm_up_transcription
 from .routers import list_routers
 from .utils.metadata import metadata_cache
 from .utils.static_assets import CachedStaticFiles, build_static_assets
@@ -19,18 +23,38 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _warm_up_transcription() -> None:
+    try:
+        if warm_up_transcription():
+            logger.info("Local Whisper model loaded at startup")
+    except Exception:
+        logger.exception("Local Whisper warm-up failed; the model will load on first use")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Start and stop background services for the web app."""
     build_static_assets()
     metadata_cache.warm()
     eventing_service = get_eventing_service()
+    eventing_service.warm()
     publishing_service = get_publishing_service()
     await eventing_service.start_worker()
     await publishing_service.start_worker()
+    stage_executor.warm()
+    # Stage worker processes warm their own model; in thread mode this process transcribes.
+    model_warm_up = (
+        asyncio.create_task(asyncio.to_thread(_warm_up_transcription)) if stage_executor.mode == "thread" else None
+    )
+    await processing_queue.start()
+    processing_queue.resume_interrupted()
     try:
         yield
     finally:
+        await processing_queue.stop()
+        if model_warm_up is not None:
+            await asyncio.gather(model_warm_up, return_exceptions=True)
+        await asyncio.to_thread(stage_executor.shutdown)
         await publishing_service.stop_worker()
         await eventing_service.stop_worker()
 
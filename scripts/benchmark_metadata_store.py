@@ -0,0 +1,83 @@
+"""Compare record update latency across the JSON, SQLite, and sharded metadata backends.
+
+Usage: python scripts/benchmark_metadata_store.py [--records 10000] [--updates 200]
+
+The script points ``CLIPMATO_DATA_DIR`` at a temporary directory, seeds the
+same library into each backend, and reports per-update latency for
+``update_metadata`` and a single-record ``mutate_metadata`` call.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _record(index: int) -> dict:
+    return {
+        "id": f"record-{index:06d}",
+        "filename": f"episode-{index}.mp3",
+        "selected_title": f"Episode {index}",
+        "titles": [f"Episode {index} option {option}" for option in range(5)],
+        "short_description": "A short description " * 4,
+        "long_description": "A longer description of the episode. " * 20,
+        "transcript": "word " * 400,
+    }
+
+
+def _measure(label: str, action, iterations: int) -> None:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--updates", type=int, default=200)
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp(prefix="clipmato-metadata-bench-"))
+    os.environ["CLIPMATO_DATA_DIR"] = str(data_dir)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from clipmato.utils import metadata
+
+    records = [_record(index) for index in range(args.records)]
+    ids = [record["id"] for record in records]
+    metadata.metadata_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    print(f"{args.records} records, {metadata.metadata_path.stat().st_size / 1e6:.1f} MB metadata.json")
+
+    def _update() -> None:
+        metadata.update_metadata(random.choice(ids), {"selected_title": f"Title {random.random()}"})
+
+    def _mutate() -> None:
+        target = random.choice(ids)
+
+        def _select(items: list[dict]) -> None:
+            for item in items:
+                if item["id"] == target:
+                    item["selected_title"] = f"Title {random.random()}"
+                    return
+
+        metadata.mutate_metadata(_select)
+
+    for backend in ("json", "sqlite", "sharded"):
+        metadata.metadata_backend = backend
+        metadata.metadata_cache.records()  # import (sqlite/sharded) and warm the cache outside the timings
+        _measure(f"{backend} update_metadata", _update, args.updates)
+        _measure(f"{backend} mutate_metadata", _mutate, args.updates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compare the pydub and NumPy silence-removal backends.
+
+Usage: python scripts/benchmark_silence_removal.py [--minutes 2] [--repeat 3]
+
+The script synthesises a 16 kHz mono episode of tone bursts separated by
+pauses and times, for each backend, silence detection plus joining the kept
+audio in memory: the original ``split_on_silence`` + ``combined += chunk``
+loop against per-millisecond frame energies + ``_keep_intervals``. When
+ffmpeg is on PATH it also times ``remove_silence`` end to end on a WAV copy
+of the episode. Needs NumPy.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+RATE = 16000
+
+
+def _episode(np, minutes: float):
+    rng = np.random.default_rng(7)
+    pieces = []
+    total = 0
+    while total < minutes * 60 * RATE:
+        speech = int(rng.uniform(2, 12) * RATE)
+        pause = int(rng.uniform(0.3, 3) * RATE)
+        t = np.arange(speech) / RATE
+        pieces.append(0.25 * np.sin(2 * math.pi * rng.uniform(120, 300) * t) + rng.normal(0, 0.01, speech))
+        pieces.append(rng.normal(0, 0.0005, pause))
+        total += speech + pause
+    return (np.clip(np.concatenate(pieces), -1, 1) * 32767).astype(np.int16)
+
+
+def _measure(label: str, action, repeat: int) -> float:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = action()
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    print(f"{label:<34} median {median * 1000:10.1f} ms   ({result})")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=2.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import numpy as np
+    from pydub import AudioSegment
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from clipmato.config import KEEP_SILENCE_MS, MIN_SILENCE_LEN_MS, SILENCE_THRESH_DB
+    from clipmato.steps import silence_removal
+
+    samples = _episode(np, args.minutes)
+    print(f"{len(samples) / RATE / 60:.1f} min synthetic episode, {samples.nbytes / 1e6:.1f} MB PCM")
+    options = {"min_silence_len": MIN_SILENCE_LEN_MS, "silence_thresh": SILENCE_THRESH_DB, "keep_silence": KEEP_SILENCE_MS}
+
+    def _pydub() -> str:
+        sound = AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=RATE, channels=1)
+        combined = sound[:0]
+        chunks = silence_removal.split_on_silence(sound, **options)
+        for chunk in chunks:
+            combined += chunk
+        return f"{len(chunks)} chunks, {len(combined) / 1000:.1f}s kept"
+
+    def _numpy() -> str:
+        floats = samples.astype(np.float32) / 32768
+        whole = len(floats) - len(floats) % 16
+        energies = np.square(floats[:whole], dtype=np.float64).reshape(-1, 16).sum(axis=1)
+        intervals = silence_removal._keep_intervals(energies, round(len(samples) * 1000 / RATE), **options)
+        kept = np.concatenate([samples[start * 16 : end * 16] for start, end in intervals])
+        return f"{len(intervals)} chunks, {len(kept) / RATE:.1f}s kept"
+
+    pydub_seconds = _measure("pydub split_on_silence + concat", _pydub, args.repeat)
+    numpy_seconds = _measure("numpy frame energies + intervals", _numpy, args.repeat)
+    print(f"speed-up: {pydub_seconds / numpy_seconds:.0f}x")
+
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg not found; skipping the end-to-end remove_silence comparison")
+        return
+    with tempfile.TemporaryDirectory(prefix="clipmato-silence-bench-") as tmpdir:
+        src = Path(tmpdir) / "episode.wav"
+        with wave.open(str(src), "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(2)
+            handle.setframerate(RATE)
+            handle.writeframes(samples.tobytes())
+        for backend in silence_removal.SILENCE_REMOVAL_BACKENDS:
+            _measure(
+                f"remove_silence backend={backend}",
+                lambda: "{:.1f}s -> {:.1f}s".format(*silence_removal.remove_silence(str(src), backend=backend)[:2]),
+                args.repeat,
+            )
+
+
+if __name__ == "__main__":
+    main()
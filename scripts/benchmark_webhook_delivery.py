@@ -0,0 +1,83 @@
+"""Measure webhook delivery throughput against a local stub receiver.
+
+Usage: python scripts/benchmark_webhook_delivery.py [--events 2000] [--webhooks 4] [--batch-size 1]
+
+The script points ``CLIPMATO_DATA_DIR`` at a temporary directory, appends
+events, registers webhooks against an in-process HTTP/1.1 keep-alive stub,
+and reports delivered events per second.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class _StubReceiver(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        with _StubReceiver.lock:
+            _StubReceiver.requests += 1
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_args) -> None:
+        return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--webhooks", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="clipmato-webhook-bench-")
+    os.environ["CLIPMATO_DATA_DIR"] = data_dir
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from clipmato.services.eventing import eventing_service
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubReceiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+
+    for index in range(args.events):
+        eventing_service.emit_event("benchmark.tick", record_id=f"record-{index % 50}", payload={"index": index})
+    for _ in range(args.webhooks):
+        eventing_service.register_webhook(url=url, batch_size=args.batch_size)
+
+    async def _drain() -> int:
+        delivered = 0
+        while True:
+            count = await eventing_service.deliver_pending_webhooks_once()
+            if not count:
+                break
+            delivered += count
+        await eventing_service._http_client.aclose()
+        return delivered
+
+    started = time.perf_counter()
+    delivered = asyncio.run(_drain())
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    print(
+        f"delivered {delivered} events to {args.webhooks} webhooks in {_StubReceiver.requests} requests "
+        f"(batch_size={args.batch_size}) in {elapsed:.2f}s: {delivered / elapsed:,.0f} events/sec"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,10 @@ from clipmato import __version__
 from clipmato import web as web_module
 from clipmato.api.idempotency import idempotency_store
 from clipmato.routers import public_api as public_api_module
+from clipmato.utils.record_summary import summary_sort_key
 from clipmato.dependencies import (
     get_file_io_service,
+    get_metadata_service,
     get_processing_service,
     get_progress_service,
     get_project_preset_service,
@@ -34,8 +36,12 @@ class DummyProcessingService:
     def __init__(self) -> None:
         self.calls: list[tuple[tuple[object, ...], dict[str, object]]] = []
 
-    async def process(self, *args, **kwargs):
+    def enqueue(self, *args, **kwargs):
         self.calls.append((args, kwargs))
+        return len(self.calls)
+
+    def has_capacity(self):
+        return True
 
 
 class DummyProgressService:
@@ -167,3 +173,55 @@ def test_versioned_upload_is_idempotent_for_reused_key(api_client, api_app):
     assert second.headers["X-Idempotency-Replayed"] == "true"
     assert file_io_service.saved_filenames == ["clip.wav"]
     assert len(processing_service.calls) == 1
+
+
+def test_record_list_is_paginated_and_rejects_foreign_cursors(api_client, api_app):
+    summaries = [
+        {"id": f"rec-{index}", "filename": f"{index}.wav", "upload_time": f"2026-04-0{index + 1}T10:00:00"}
+        for index in range(3)
+    ]
+
+    class PagedMetadataService:
+        def iter_summaries(self, *, sort="upload_time", descending=False, after=None):
+            ordered = sorted(summaries, key=lambda item: summary_sort_key(item, sort), reverse=descending)
+            for item in ordered:
+                key = summary_sort_key(item, sort)
+                if after is None or (key < tuple(after) if descending else key > tuple(after)):
+                    yield item
+
+    api_app.dependency_overrides[get_metadata_service] = lambda: PagedMetadataService()
+    api_app.dependency_overrides[get_progress_service] = lambda: DummyProgressService()
+
+    first = api_client.get("/api/v1/records", params={"limit": 2}).json()
+    second = api_client.get("/api/v1/records", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    invalid = api_client.get("/api/v1/records", params={"cursor": first["next_cursor"], "sort": "schedule_time"})
+    unpaged = api_client.get("/api/v1/records").json()
+
+    assert [record["id"] for record in first["records"]] == ["rec-2", "rec-1"]
+    assert [record["id"] for record in second["records"]] == ["rec-0"]
+    assert second["next_cursor"] is None
+    assert [record["id"] for record in unpaged["records"]] == ["rec-2", "rec-1", "rec-0"]
+    assert unpaged["next_cursor"] is None
+    assert invalid.status_code == 400
+    assert invalid.json()["error"]["code"] == "invalid_cursor"
+
+
+def test_versioned_upload_returns_503_when_processing_queue_is_full(api_client, api_app):
+    file_io_service = DummyFileIOService(return_path="/tmp/clipmato-upload.wav")
+    processing_service = DummyProcessingService()
+    processing_service.has_capacity = lambda: False
+
+    api_app.dependency_overrides[get_file_io_service] = lambda: file_io_service
+    api_app.dependency_overrides[get_processing_service] = lambda: processing_service
+    api_app.dependency_overrides[get_project_preset_service] = lambda: DummyProjectPresetService()
+
+    response = api_client.post(
+        "/api/v1/upload",
+        files={"file": ("clip.wav", BytesIO(b"123456"), "audio/wav")},
+        data={"remove_silence": "false", "priority": "high"},
+    )
+
+    assert response.status_code == 503
+    assert response.json()["error"]["code"] == "processing_queue_full"
+    assert file_io_service.saved_filenames == []
+    assert processing_service.calls == []
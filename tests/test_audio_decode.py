@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from clipmato.steps import transcription
+from clipmato.utils import audio_decode
+from clipmato.utils.audio_decode import MediaInfo, StreamInfo
+
+
+def test_parse_probe_prefers_audio_stream_duration():
+    payload = json.dumps(
+        {
+            "streams": [
+                {"index": 0, "codec_type": "video", "codec_name": "h264", "width": 1280, "height": 720, "duration": "62.0"},
+                {
+                    "index": 1,
+                    "codec_type": "audio",
+                    "codec_name": "aac",
+                    "sample_rate": "48000",
+                    "channels": 2,
+                    "channel_layout": "stereo",
+                    "duration": "61.48",
+                },
+            ],
+            "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": "62.03", "bit_rate": "1250000"},
+        }
+    )
+    info = audio_decode._parse_probe(payload)
+    assert (info.has_audio, info.duration, info.has_video) == (True, 61.48, True)
+    assert (info.format_name, info.bit_rate) == ("mov,mp4,m4a,3gp,3g2,mj2", 1250000)
+    assert info.first_stream("audio") == StreamInfo(
+        index=1, codec_type="audio", codec_name="aac", sample_rate=48000, channels=2, channel_layout="stereo", duration=61.48
+    )
+    assert (info.first_stream("video").width, info.first_stream("video").height) == (1280, 720)
+
+    no_stream_duration = audio_decode._parse_probe(
+        json.dumps({"streams": [{"codec_type": "audio", "duration": "N/A"}], "format": {"duration": "12.5"}})
+    )
+    assert (no_stream_duration.has_audio, no_stream_duration.duration) == (True, 12.5)
+
+    video_only = audio_decode._parse_probe(json.dumps({"streams": [{"codec_type": "video"}], "format": {"duration": "N/A"}}))
+    assert (video_only.has_audio, video_only.duration, video_only.has_video) == (False, None, True)
+    assert audio_decode._parse_probe("") == MediaInfo(has_audio=False, duration=None)
+
+
+@pytest.fixture()
+def fake_ffmpeg(monkeypatch, tmp_path):
+    """Put an ``ffmpeg`` on PATH that writes a known float32 ramp to stdout."""
+    script = tmp_path / "bin" / "ffmpeg"
+    script.parent.mkdir()
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import array, os, sys\n"
+        "count = int(os.environ['FAKE_FFMPEG_SAMPLES'])\n"
+        "sys.stdout.buffer.write(array.array('f', (i / count for i in range(count))).tobytes())\n"
+        "sys.exit(int(os.environ.get('FAKE_FFMPEG_EXIT', '0')))\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+    return monkeypatch
+
+
+@pytest.mark.parametrize("duration", [None, 1.0, 10.0])
+def test_decode_pcm_streams_samples_into_one_buffer(fake_ffmpeg, tmp_path, duration):
+    np = pytest.importorskip("numpy")
+    fake_ffmpeg.setenv("FAKE_FFMPEG_SAMPLES", "300001")  # not a multiple of the read size
+
+    samples = audio_decode.decode_pcm(tmp_path / "in.mp4", sample_rate=16000, duration=duration)
+
+    assert samples.dtype == np.float32
+    assert samples.shape == (300001,)
+    assert samples[0] == 0.0
+    assert samples[-1] == pytest.approx(300000 / 300001)
+
+
+def test_decode_pcm_reports_ffmpeg_failure(fake_ffmpeg, tmp_path):
+    pytest.importorskip("numpy")
+    fake_ffmpeg.setenv("FAKE_FFMPEG_SAMPLES", "10")
+    fake_ffmpeg.setenv("FAKE_FFMPEG_EXIT", "1")
+
+    with pytest.raises(RuntimeError, match="Audio decode failed"):
+        audio_decode.decode_pcm(tmp_path / "in.mp4")
+
+
+def test_local_whisper_stream_mode_skips_wav_conversion(monkeypatch, tmp_path):
+    upload = tmp_path / "episode.mp4"
+    upload.write_bytes(b"video bytes")
+    probes: list[Path] = []
+    decoded: list[tuple[Path, float | None]] = []
+    transcribed: list[object] = []
+
+    class FakeModel:
+        def transcribe(self, audio, **kwargs):
+            transcribed.append(audio)
+            return {"text": " streamed "}
+
+    def fake_probe(path):
+        probes.append(path)
+        return MediaInfo(has_audio=True, duration=42.0)
+
+    def fake_decode(path, *, sample_rate, duration):
+        decoded.append((path, duration))
+        return "pcm-buffer"
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("stream mode must not convert to WAV")
+
+    monkeypatch.setattr(transcription, "resolve_transcription_backend", lambda: "local-whisper")
+    monkeypatch.setattr(transcription, "LOCAL_WHISPER_DECODE", "stream")
+    monkeypatch.setattr(transcription, "get_local_whisper_model", lambda: "base")
+    monkeypatch.setattr(transcription, "detect_local_whisper_device", lambda: "cpu")
+    monkeypatch.setattr(transcription, "_load_local_whisper_model", lambda name, device: FakeModel())
+    monkeypatch.setattr(transcription, "media_info", fake_probe)
+    monkeypatch.setattr(transcription, "decode_pcm", fake_decode)
+    monkeypatch.setattr(transcription.subprocess, "run", no_subprocess)
+    monkeypatch.setattr(transcription.transcript_cache, "get", lambda key: None)
+    monkeypatch.setattr(transcription.transcript_cache, "put", lambda *args, **kwargs: None)
+
+    assert transcription.transcribe_audio(str(upload)) == "streamed"
+    assert probes == [upload]
+    assert decoded == [(upload, 42.0)]
+    assert transcribed == ["pcm-buffer"]
+    assert not upload.with_suffix(".wav").exists()
+
+
+def test_video_without_audio_is_rejected_after_one_probe(monkeypatch, tmp_path):
+    upload = tmp_path / "silent.mp4"
+    upload.write_bytes(b"video bytes")
+    probes: list[Path] = []
+    monkeypatch.setattr(transcription, "resolve_transcription_backend", lambda: "openai")
+    monkeypatch.setattr(transcription, "media_info", lambda path: probes.append(path) or MediaInfo(False, None))
+
+    with pytest.raises(RuntimeError, match="No audio track detected"):
+        transcription.transcribe_audio(str(upload))
+    assert probes == [upload]
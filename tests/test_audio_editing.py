@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from clipmato.steps import audio_editing
+from clipmato.utils.audio_decode import MediaInfo, StreamInfo
+
+REPORT = {
+    "input_i": "-27.61",
+    "input_tp": "-4.47",
+    "input_lra": "18.06",
+    "input_thresh": "-39.20",
+    "output_i": "-16.58",
+    "target_offset": "0.58",
+}
+
+
+@pytest.fixture()
+def fake_ffmpeg(monkeypatch, tmp_path):
+    """Put an ``ffmpeg`` on PATH that logs each call's filter script and arguments."""
+    log = tmp_path / "calls.jsonl"
+    script = tmp_path / "bin" / "ffmpeg"
+    script.parent.mkdir()
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys\n"
+        "args = sys.argv[1:]\n"
+        "graph = open(args[args.index('-filter_complex_script') + 1]).read()\n"
+        f"with open({str(log)!r}, 'a') as handle:\n"
+        "    handle.write(json.dumps({'graph': graph, 'args': args}) + '\\n')\n"
+        "if os.environ.get('FAKE_FFMPEG_FAIL') == ('measure' if args[-1] == '-' else 'encode'):\n"
+        "    if args[-1] != '-':\n"
+        "        open(args[-1], 'w').write('partial')\n"
+        "    sys.exit('boom')\n"
+        "if args[-1] == '-':\n"
+        "    sys.stderr.write('[Parsed_loudnorm_2 @ 0x1] \\n' + os.environ['FAKE_LOUDNORM_REPORT'] + '\\n')\n"
+        "else:\n"
+        "    open(args[-1], 'w').write('encoded')\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_LOUDNORM_REPORT", json.dumps(REPORT, indent=1))
+    monkeypatch.setattr(audio_editing, "EDIT_LOUDNORM", True)
+    monkeypatch.setattr(audio_editing, "EDIT_HIGHPASS_HZ", 80.0)
+    monkeypatch.setattr(audio_editing, "EDIT_NOISE_GATE_DB", None)
+    return lambda: [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def _upload(tmp_path: Path, name: str, monkeypatch, *, video_codec: str | None = None, has_audio: bool = True) -> Path:
+    path = tmp_path / name
+    path.write_bytes(b"raw capture")
+    streams = (StreamInfo(index=0, codec_type="video", codec_name=video_codec),) if video_codec else ()
+    info = MediaInfo(has_audio, 6.0, has_video=video_codec is not None, streams=streams)
+    monkeypatch.setattr(audio_editing, "media_info", lambda _path: info)
+    return path
+
+
+def test_edit_applies_silence_cuts_and_measured_loudnorm_in_one_encode(fake_ffmpeg, monkeypatch, tmp_path):
+    src = _upload(tmp_path, "episode.wav", monkeypatch)
+    monkeypatch.setattr(audio_editing, "EDIT_NOISE_GATE_DB", -50.0)
+
+    output = audio_editing.edit_audio(str(src), [[0, 1200], [2800, 4500]])
+
+    measure, encode = fake_ffmpeg()
+    cut = (
+        "[0:a]asplit=2[a0][a1];\n"
+        "[a0]atrim=start=0.000:end=1.200,asetpts=PTS-STARTPTS[as0];\n"
+        "[a1]atrim=start=2.800:end=4.500,asetpts=PTS-STARTPTS[as1];\n"
+        "[as0][as1]concat=n=2:v=0:a=1"
+    )
+    cleanup = "highpass=f=80,agate=threshold=0.003162:ratio=4:attack=5:release=250"
+    assert measure["graph"] == f"{cut},{cleanup},loudnorm=I=-16:TP=-1.5:LRA=11:print_format=json[a]"
+    assert measure["args"][-4:] == ["[a]", "-f", "null", "-"]
+    assert encode["graph"] == (
+        f"{cut},{cleanup},loudnorm=I=-16:TP=-1.5:LRA=11:measured_I=-27.61:measured_TP=-4.47"
+        ":measured_LRA=18.06:measured_thresh=-39.20:offset=0.58:linear=true,aresample=48000[a]"
+    )
+    assert output == str(tmp_path / "episode_edited.m4a")
+    assert encode["args"][-9:] == ["-map", "[a]", "-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart", output]
+    assert Path(output).read_text() == "encoded"
+
+
+def test_video_keeps_its_stream_uncut_or_trimmed_in_sync(fake_ffmpeg, monkeypatch, tmp_path):
+    src = _upload(tmp_path, "episode.mov", monkeypatch, video_codec="h264")
+
+    assert audio_editing.edit_audio(str(src)) == str(tmp_path / "episode_edited.mp4")
+    audio_editing.edit_audio(str(src), [[0, 1000]])
+
+    _measure, copy, _measure_cut, cut = fake_ffmpeg()
+    assert "[0:v]" not in copy["graph"]
+    assert copy["args"][-13:-7] == ["-map", "[a]", "-map", "0:v:0", "-c:v", "copy"]
+    assert cut["graph"].endswith(";\n[0:v]trim=start=0.000:end=1.000,setpts=PTS-STARTPTS[v]")
+    assert "[v]" in cut["args"] and "copy" not in cut["args"]
+
+
+def test_video_codecs_mp4_cannot_hold_are_reencoded(fake_ffmpeg, monkeypatch, tmp_path):
+    src = _upload(tmp_path, "screen.webm", monkeypatch, video_codec="vp9")
+
+    assert audio_editing.edit_audio(str(src)) == str(tmp_path / "screen_edited.mp4")
+
+    _measure, encode = fake_ffmpeg()
+    assert "copy" not in encode["args"]
+    assert encode["args"][encode["args"].index("-c:v") + 1] == "libx264"
+
+
+@pytest.mark.parametrize("failing_pass", ["measure", "encode"])
+def test_failed_ffmpeg_pass_leaves_the_upload_unedited(fake_ffmpeg, monkeypatch, tmp_path, failing_pass):
+    src = _upload(tmp_path, "episode.wav", monkeypatch)
+    monkeypatch.setenv("FAKE_FFMPEG_FAIL", failing_pass)
+
+    assert audio_editing.edit_audio(str(src)) == str(src)
+    assert not (tmp_path / "episode_edited.m4a").exists()
+
+
+def test_failed_edit_still_applies_the_silence_cuts(fake_ffmpeg, monkeypatch, tmp_path):
+    src = _upload(tmp_path, "episode.mov", monkeypatch, video_codec="h264")
+    monkeypatch.setenv("FAKE_FFMPEG_FAIL", "encode")
+    calls: list[tuple] = []
+    monkeypatch.setattr(audio_editing, "render_intervals", _recording_render(calls))
+
+    output = audio_editing.edit_audio(str(src), [[0, 1000], [2000, 3000]])
+
+    assert output == str(tmp_path / "episode_trimmed.mov")
+    assert calls == [(src, tmp_path / "episode_trimmed.mov", [[0, 1000], [2000, 3000]], True)]
+    assert not (tmp_path / "episode_edited.mp4").exists()
+
+    monkeypatch.setattr(audio_editing, "render_intervals", _recording_render([], fail=True))
+    assert audio_editing.edit_audio(str(src), [[0, 1000]]) == str(src)
+
+
+def _recording_render(calls: list, *, fail: bool = False):
+    def render(src, dst, intervals, *, keep_video=False):
+        calls.append((src, dst, intervals, keep_video))
+        if fail:
+            raise RuntimeError("Trimming failed: no encoder")
+        Path(dst).write_text("trimmed")
+
+    return render
+
+
+def test_upload_without_audio_is_left_unedited(fake_ffmpeg, monkeypatch, tmp_path):
+    src = _upload(tmp_path, "slides.mp4", monkeypatch, video_codec="h264", has_audio=False)
+
+    assert audio_editing.edit_audio(str(src)) == str(src)
+    assert not (tmp_path / "calls.jsonl").exists()
+
+
+def test_unmeasurable_loudness_is_left_alone(fake_ffmpeg, monkeypatch, tmp_path):
+    src = _upload(tmp_path, "silent.wav", monkeypatch)
+    monkeypatch.setenv("FAKE_LOUDNORM_REPORT", json.dumps({**REPORT, "input_i": "-inf", "input_tp": "-inf"}))
+
+    audio_editing.edit_audio(str(src))
+
+    _measure, encode = fake_ffmpeg()
+    assert encode["graph"] == "[0:a]highpass=f=80,aresample=48000[a]"
+    assert audio_editing._parse_loudnorm("no report") is None
+
+
+def test_nothing_to_apply_returns_the_input(monkeypatch, tmp_path):
+    monkeypatch.setattr(audio_editing, "EDIT_LOUDNORM", False)
+    monkeypatch.setattr(audio_editing, "EDIT_HIGHPASS_HZ", 0.0)
+    monkeypatch.setattr(audio_editing, "EDIT_NOISE_GATE_DB", None)
+    monkeypatch.setattr(audio_editing, "media_info", lambda _path: pytest.fail("probed"))
+
+    assert audio_editing.edit_audio(str(tmp_path / "episode.wav")) == str(tmp_path / "episode.wav")
+    monkeypatch.setattr(audio_editing, "EDIT_LOUDNORM", True)
+    assert audio_editing.edit_audio("process raw audio") == "process raw audio"
@@ -2,13 +2,17 @@ import asyncio
 import json
 from pathlib import Path
 
+import httpx
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from clipmato import config
 from clipmato.routers.events import router as events_router
-from clipmato.services import eventing
+from clipmato.services import event_log, eventing
+from clipmato.services.event_hub import EventHub
+from clipmato.services.event_index import EventIndex
+from clipmato.services.webhook_delivery import WebhookHttpClient
 from clipmato.utils import file_io, progress
 
 
@@ -21,6 +25,10 @@ def isolated_event_store(tmp_path, monkeypatch):
     monkeypatch.setattr(progress, "upload_dir", tmp_path, raising=False)
     eventing.eventing_service._worker_task = None
     eventing.eventing_service._stop_event = None
+    eventing.eventing_service._worker_subscription = None
+    eventing.eventing_service._webhooks_active = True
+    eventing.eventing_service._hub = EventHub(eventing._events_path, queue_size=4, poll_seconds=0.01)
+    eventing.eventing_service._index = EventIndex(eventing._events_path)
     return tmp_path
 
 
@@ -86,30 +94,23 @@ def test_webhook_delivery_dead_letters_and_replays(isolated_event_store, monkeyp
     deliveries: list[dict] = []
     delivery_mode = {"fail": True}
 
-    class DummyResponse:
-        status = 204
-
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
-    def fake_urlopen(request, timeout):
-        headers = {key.lower(): value for key, value in request.header_items()}
+    def handler(request: httpx.Request) -> httpx.Response:
         deliveries.append(
             {
-                "url": request.full_url,
-                "headers": headers,
-                "body": request.data.decode("utf-8"),
-                "timeout": timeout,
+                "url": str(request.url),
+                "headers": dict(request.headers),
+                "body": request.content.decode("utf-8"),
             }
         )
         if delivery_mode["fail"]:
-            raise eventing.URLError("boom")
-        return DummyResponse()
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(204)
 
-    monkeypatch.setattr(eventing, "urlopen", fake_urlopen)
+    monkeypatch.setattr(
+        eventing.eventing_service,
+        "_http_client",
+        WebhookHttpClient(timeout=1, transport=httpx.MockTransport(handler)),
+    )
 
     webhook_response = client.post(
         "/api/v1/webhooks",
@@ -157,3 +158,281 @@ def test_webhook_delivery_dead_letters_and_replays(isolated_event_store, monkeyp
     assert replayed["dead_lettered_at"] is None
     assert replayed["last_delivered_sequence"] == event["sequence"]
     assert len(deliveries) == 4
+
+
+def test_append_uses_sequence_state_instead_of_rescanning_log(isolated_event_store, monkeypatch):
+    eventing.emit_event("record.uploaded", record_id="record-4")
+
+    def fail_full_scan(*_args, **_kwargs):
+        raise AssertionError("append must not rescan the event log")
+
+    monkeypatch.setattr(event_log, "_scan_last_sequence", fail_full_scan)
+    monkeypatch.setattr(event_log, "_head_sequence", fail_full_scan)
+    second = eventing.emit_event("record.uploaded", record_id="record-4")
+
+    assert second is not None
+    assert second["sequence"] == 2
+    state = json.loads((isolated_event_store / "events.jsonl.seq").read_text())
+    assert state["sequence"] == 2
+    assert state["size"] == (isolated_event_store / "events.jsonl").stat().st_size
+
+
+def test_append_recovers_sequence_when_state_is_missing_or_stale(isolated_event_store):
+    events_path = isolated_event_store / "events.jsonl"
+    eventing.emit_event("record.uploaded", record_id="record-5")
+    eventing.emit_event("record.uploaded", record_id="record-5")
+
+    (isolated_event_store / "events.jsonl.seq").unlink()
+    assert eventing.emit_event("record.uploaded", record_id="record-5")["sequence"] == 3
+
+    with events_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"event_id": "external", "sequence": 10, "type": "record.uploaded"}) + "\n")
+    assert eventing.emit_event("record.uploaded", record_id="record-5")["sequence"] == 11
+
+    with events_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"event_id": "torn", "sequ')
+    assert eventing.emit_event("record.uploaded", record_id="record-5")["sequence"] == 12
+    assert [event["sequence"] for event in eventing.eventing_service.list_events(after_sequence=10)] == [11, 12]
+
+
+def test_segmented_log_seeks_past_sealed_segments_and_prunes_consumed_ones(isolated_event_store, monkeypatch):
+    monkeypatch.setattr(event_log, "SEGMENT_MAX_EVENTS", 10)
+    monkeypatch.setattr(event_log, "SPARSE_INDEX_INTERVAL", 4)
+    for _ in range(25):
+        eventing.emit_event("record.progress.updated", record_id="record-6")
+
+    sealed = event_log.list_sealed_segments(isolated_event_store / "events.jsonl")
+    assert [(segment.first_sequence, segment.last_sequence) for segment in sealed] == [(1, 10), (11, 20)]
+    assert len(_read_events(isolated_event_store / "events.jsonl")) == 5
+
+    events = eventing.eventing_service.list_events(after_sequence=13, limit=8)
+    assert [event["sequence"] for event in events] == list(range(14, 22))
+
+    webhook = eventing.eventing_service.register_webhook(url="https://example.test/hooks")
+    eventing.eventing_service._apply_delivery_updates({webhook["webhook_id"]: {"last_delivered_sequence": 15}})
+    removed = eventing.eventing_service.compact_events(retain_segments=0)
+
+    assert removed == [{"first_sequence": 1, "last_sequence": 10}]
+    assert [event["sequence"] for event in eventing.eventing_service.list_events()][:2] == [11, 12]
+    assert eventing.emit_event("record.uploaded", record_id="record-6")["sequence"] == 26
+
+
+def test_segmented_log_recovers_sequence_after_rotation_without_state(isolated_event_store, monkeypatch):
+    monkeypatch.setattr(event_log, "SEGMENT_MAX_EVENTS", 3)
+    for _ in range(3):
+        eventing.emit_event("record.uploaded", record_id="record-7")
+
+    (isolated_event_store / "events.jsonl.seq").unlink()
+
+    assert not (isolated_event_store / "events.jsonl").exists()
+    assert eventing.emit_event("record.uploaded", record_id="record-7")["sequence"] == 4
+
+
+def test_stream_pushes_live_events_without_rereading_the_log(isolated_event_store, monkeypatch):
+    eventing.emit_event("record.uploaded", record_id="record-8")
+    reads: list[int] = []
+    list_events = eventing.eventing_service.list_events
+
+    def counting_list_events(**kwargs):
+        reads.append(kwargs["after_sequence"])
+        return list_events(**kwargs)
+
+    monkeypatch.setattr(eventing.eventing_service, "list_events", counting_list_events)
+
+    async def scenario() -> list[dict]:
+        stream = eventing.eventing_service.stream_events(record_id="record-8")
+        received = [await stream.__anext__()]
+        for _ in range(3):
+            eventing.emit_event("record.progress.updated", record_id="record-8")
+            eventing.emit_event("record.progress.updated", record_id="other-record")
+            received.append(await asyncio.wait_for(stream.__anext__(), timeout=1))
+        await stream.aclose()
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert [event["sequence"] for event in received] == [1, 2, 4, 6]
+    assert reads == [0]
+    assert eventing.eventing_service._hub.subscriber_count == 0
+
+
+def test_stream_catches_up_after_queue_overflow_and_foreign_appends(isolated_event_store):
+    async def scenario() -> list[int]:
+        stream = eventing.eventing_service.stream_events(record_id="record-9")
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        for _ in range(6):
+            eventing.emit_event("record.progress.updated", record_id="record-9")
+        sequences = [(await asyncio.wait_for(pending, timeout=1))["sequence"]]
+        for _ in range(5):
+            sequences.append((await asyncio.wait_for(stream.__anext__(), timeout=1))["sequence"])
+
+        path = isolated_event_store / "events.jsonl"
+        with eventing._locked_file(path):
+            event_log.append_event(
+                path,
+                lambda sequence: {"event_id": "external", "sequence": sequence, "record_id": "record-9", "type": "x"},
+            )
+        sequences.append((await asyncio.wait_for(stream.__anext__(), timeout=1))["sequence"])
+        await stream.aclose()
+        return sequences
+
+    assert asyncio.run(scenario()) == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_filtered_queries_read_only_indexed_matches_across_segments(isolated_event_store, monkeypatch):
+    monkeypatch.setattr(event_log, "SEGMENT_MAX_EVENTS", 7)
+    for index in range(30):
+        record_id = "record-a" if index % 5 == 0 else "record-b"
+        event_type = "record.uploaded" if index % 10 == 0 else "record.progress.updated"
+        eventing.emit_event(event_type, record_id=record_id)
+    eventing.eventing_service.warm()
+
+    path = isolated_event_store / "events.jsonl"
+    with eventing._locked_file(path):
+        event_log.append_event(
+            path,
+            lambda sequence: {"event_id": "external", "sequence": sequence, "aggregate_id": "record-a", "type": "x"},
+        )
+
+    reads: list[int] = []
+    original_read = event_log.SegmentReader.read
+
+    def counting_read(self, location):
+        reads.append(location.offset)
+        return original_read(self, location)
+
+    monkeypatch.setattr(event_log.SegmentReader, "read", counting_read)
+
+    events = eventing.eventing_service.list_events(record_id="record-a")
+    assert [event["sequence"] for event in events] == [1, 6, 11, 16, 21, 26, 31]
+    assert len(reads) == 7
+
+    uploads = eventing.eventing_service.list_events(
+        after_sequence=1,
+        record_id="record-a",
+        event_types=["record.uploaded"],
+        limit=1,
+    )
+    assert [event["sequence"] for event in uploads] == [11]
+
+
+def test_webhook_delivery_batches_opted_in_endpoints_and_checkpoints_once(isolated_event_store, monkeypatch):
+    received: dict[str, list[dict]] = {"single": [], "batched": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        kind = "batched" if request.url.path == "/batched" else "single"
+        received[kind].append({"headers": dict(request.headers), "body": json.loads(request.content)})
+        return httpx.Response(200)
+
+    monkeypatch.setattr(
+        eventing.eventing_service,
+        "_http_client",
+        WebhookHttpClient(timeout=1, transport=httpx.MockTransport(handler)),
+    )
+    single = eventing.eventing_service.register_webhook(url="https://example.test/single", record_id="record-10")
+    batched = eventing.eventing_service.register_webhook(url="https://example.test/batched", batch_size=4)
+    for index in range(10):
+        eventing.emit_event("record.progress.updated", record_id="record-10" if index % 2 else "record-11")
+
+    writes: list[int] = []
+    original_write = eventing._write_webhooks
+
+    def counting_write(webhooks):
+        writes.append(len(webhooks))
+        original_write(webhooks)
+
+    monkeypatch.setattr(eventing, "_write_webhooks", counting_write)
+
+    delivered = asyncio.run(eventing.eventing_service.deliver_pending_webhooks_once())
+
+    assert delivered == 15
+    assert len(writes) == 1
+    assert [item["body"]["sequence"] for item in received["single"]] == [2, 4, 6, 8, 10]
+    assert [len(item["body"]["events"]) for item in received["batched"]] == [4, 4, 2]
+    assert received["batched"][0]["headers"]["x-clipmato-event-count"] == "4"
+    assert received["batched"][-1]["headers"]["x-clipmato-event-sequence"] == "10"
+    assert eventing.eventing_service.get_webhook(single["webhook_id"])["last_delivered_sequence"] == 10
+    assert eventing.eventing_service.get_webhook(batched["webhook_id"])["last_delivered_sequence"] == 10
+    assert asyncio.run(eventing.eventing_service.deliver_pending_webhooks_once()) == 0
+
+
+def test_webhook_worker_wakes_on_appends_instead_of_polling(isolated_event_store, monkeypatch):
+    delivered: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        delivered.append(json.loads(request.content)["sequence"])
+        return httpx.Response(204)
+
+    monkeypatch.setattr(eventing, "WEBHOOK_POLL_SECONDS", 60.0)
+    monkeypatch.setattr(
+        eventing.eventing_service,
+        "_http_client",
+        WebhookHttpClient(timeout=1, transport=httpx.MockTransport(handler)),
+    )
+
+    async def _wait_for(count: int) -> None:
+        for _ in range(200):
+            if len(delivered) >= count:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"expected {count} deliveries, got {delivered}")
+
+    async def _scenario() -> None:
+        service = eventing.eventing_service
+        await service.start_worker()
+        try:
+            await asyncio.sleep(0.05)
+            service.register_webhook(url="https://example.test/hook")
+            service.emit_event("record.created", record_id="record-1")
+            await _wait_for(1)
+
+            # An append from another process is noticed by the hub's log watcher.
+            with eventing._locked_file(eventing._events_path()):
+                event_log.append_event(
+                    eventing._events_path(),
+                    lambda sequence: {"event_id": f"evt-{sequence}", "sequence": sequence, "type": "record.updated"},
+                )
+            await _wait_for(2)
+        finally:
+            await service.stop_worker()
+
+    asyncio.run(_scenario())
+
+    assert delivered == [1, 2]
+
+
+def test_webhook_worker_drains_backlog_of_filtered_out_events(isolated_event_store, monkeypatch):
+    delivered: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        delivered.append(json.loads(request.content)["sequence"])
+        return httpx.Response(204)
+
+    monkeypatch.setattr(eventing, "WEBHOOK_POLL_SECONDS", 60.0)
+    monkeypatch.setattr(eventing, "WEBHOOK_DELIVERY_WINDOW", 3)
+    monkeypatch.setattr(
+        eventing.eventing_service,
+        "_http_client",
+        WebhookHttpClient(timeout=1, transport=httpx.MockTransport(handler)),
+    )
+    service = eventing.eventing_service
+    service.register_webhook(url="https://example.test/hook", record_id="record-match")
+    for _ in range(7):
+        service.emit_event("record.progress.updated", record_id="record-other")
+    service.emit_event("record.progress.updated", record_id="record-match")
+
+    async def _scenario() -> None:
+        await service.start_worker()
+        try:
+            for _ in range(200):
+                if delivered:
+                    return
+                await asyncio.sleep(0.01)
+        finally:
+            await service.stop_worker()
+
+    asyncio.run(_scenario())
+
+    # three windows of filtered-out events are skipped without waiting for the safety poll
+    assert delivered == [8]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from clipmato.steps import transcription
+from clipmato.utils.audio_decode import MediaInfo
+
+# Ground-truth speech (absolute seconds) that the fake model "hears".
+SPEECH = [(0.0, 4.0, "a"), (4.0, 9.0, "b"), (9.0, 11.5, "c"), (11.5, 16.0, "d"), (16.0, 21.0, "e"), (21.0, 24.0, "f")]
+TOTAL = 25.0
+RATE = 100
+
+
+class _Window:
+    def __init__(self, start: float, seconds: float) -> None:
+        self.start = start
+        self.seconds = seconds
+
+    def __len__(self) -> int:
+        return int(round(self.seconds * RATE))
+
+
+class _FakeModel:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def transcribe(self, audio: _Window, **kwargs):
+        self.calls.append({"start": audio.start, **kwargs})
+        end = audio.start + audio.seconds
+        segments = [
+            {"start": max(s, audio.start) - audio.start, "end": min(e, end) - audio.start, "text": f" {text}"}
+            for s, e, text in SPEECH
+            if e > audio.start and s < end
+        ]
+        return {"text": "".join(seg["text"] for seg in segments), "segments": segments, "language": "en"}
+
+
+def _windowed_env(monkeypatch, *, window: float = 10.0, overlap: float = 2.0):
+    model = _FakeModel()
+    decoded: list[tuple[float, float]] = []
+
+    def fake_decode(src, *, sample_rate, start=0.0, length=None, duration=None):
+        decoded.append((start, length))
+        return _Window(start, max(min(length if length is not None else TOTAL, TOTAL - start), 0.0))
+
+    monkeypatch.setattr(transcription, "FFMPEG_SAMPLE_RATE", RATE)
+    monkeypatch.setattr(transcription, "LOCAL_WHISPER_WINDOW_SECONDS", window)
+    monkeypatch.setattr(transcription, "LOCAL_WHISPER_WINDOW_OVERLAP_SECONDS", overlap)
+    monkeypatch.setattr(transcription, "get_local_whisper_model", lambda: "base")
+    monkeypatch.setattr(transcription, "detect_local_whisper_device", lambda: "cpu")
+    monkeypatch.setattr(transcription, "_load_local_whisper_model", lambda name, device: model)
+    monkeypatch.setattr(transcription, "decode_pcm", fake_decode)
+    return model, decoded
+
+
+def test_windowed_transcription_merges_overlaps_and_reports_each_window(monkeypatch):
+    model, decoded = _windowed_env(monkeypatch)
+    reported: list[tuple[list[str], float, float | None]] = []
+
+    text = transcription._transcribe_with_local_whisper(
+        Path("episode.mp4"),
+        media=MediaInfo(has_audio=True, duration=TOTAL),
+        on_segments=lambda segments, done, total: reported.append(([s["text"] for s in segments], done, total)),
+    )
+
+    assert text == "a b c d e f"
+    assert decoded == [(0.0, 12.0), (10.0, 12.0), (20.0, 12.0)]
+    assert reported == [(["a", "b", "c"], 10.0, TOTAL), (["d", "e"], 20.0, TOTAL), (["f"], 25.0, TOTAL)]
+    assert model.calls[0]["initial_prompt"] is None and "language" not in model.calls[0]
+    assert model.calls[1]["initial_prompt"] == "a b c"
+    assert model.calls[1]["language"] == "en"
+
+
+def test_short_audio_is_transcribed_in_one_call(monkeypatch):
+    model, decoded = _windowed_env(monkeypatch, window=30.0)
+    monkeypatch.setattr(transcription, "LOCAL_WHISPER_DECODE", "stream")
+
+    text = transcription._transcribe_with_local_whisper(Path("clip.wav"), media=MediaInfo(True, TOTAL))
+
+    assert text == "a b c d e f"
+    assert len(model.calls) == 1
+    assert "initial_prompt" not in model.calls[0]
+
+
+def test_partial_transcripts_are_sent_with_progress_events(monkeypatch):
+    updates: list[tuple] = []
+    monkeypatch.setattr(
+        transcription,
+        "update_progress",
+        lambda record_id, stage, message=None, *, details=None: updates.append((record_id, stage, message, details)),
+    )
+
+    transcription._report_partial_transcript("rec-1", [{"start": 0.0, "end": 4.0, "text": "a"}], 600.0, 3725.4)
+
+    assert updates == [
+        (
+            "rec-1",
+            "transcribing",
+            "Transcribed 10:00 of 1:02:05",
+            {
+                "partial_transcript": [{"start": 0.0, "end": 4.0, "text": "a"}],
+                "transcribed_seconds": 600.0,
+                "total_seconds": 3725.4,
+            },
+        )
+    ]
@@ -117,5 +117,29 @@ class MCPApiTests(unittest.TestCase):
         self.assertEqual(body["error"]["code"], "approval_required")
 
 
+    def test_records_summary_resource_returns_full_records(self) -> None:
+        self.write_metadata(
+            [
+                {
+                    "id": "rec-1",
+                    "filename": "episode.mp4",
+                    "upload_time": "2026-03-25T10:00:00+00:00",
+                    "transcript": "Full transcript text",
+                    "long_description": "Long description",
+                }
+            ]
+        )
+        client = self.load_client()
+
+        response = client.get("/api/v1/mcp/resources/records.summary", headers={"X-Client-Id": "mcp-test"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()["payload"]
+        self.assertEqual(payload["count"], 1)
+        record = payload["records"][0]
+        self.assertEqual(record["transcript"], "Full transcript text")
+        self.assertEqual(record["long_description"], "Long description")
+
+
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from clipmato.providers.base import PublishConfigurationError
+from clipmato.providers.youtube import YouTubePublisher
+from clipmato.utils import media_probe
+from clipmato.utils.audio_decode import MediaInfo, StreamInfo
+from clipmato.utils.media_probe import MediaProbeCache, media_info_from_payload
+from clipmato.utils.presentation import present_record
+
+EPISODE = MediaInfo(
+    has_audio=True,
+    duration=61.5,
+    has_video=True,
+    format_name="mov,mp4,m4a,3gp,3g2,mj2",
+    bit_rate=1250000,
+    streams=(
+        StreamInfo(index=0, codec_type="video", codec_name="h264", width=1280, height=720),
+        StreamInfo(index=1, codec_type="audio", codec_name="aac", sample_rate=48000, channels=2, channel_layout="stereo"),
+    ),
+)
+
+
+def _counting_probe(probes: list[Path], info: MediaInfo = EPISODE):
+    def probe(path: Path) -> MediaInfo:
+        probes.append(path)
+        return info
+
+    return probe
+
+
+def test_cache_probes_each_file_once_until_it_changes(tmp_path):
+    upload = tmp_path / "episode.mp4"
+    upload.write_bytes(b"video")
+    probes: list[Path] = []
+    cache = MediaProbeCache(_counting_probe(probes))
+
+    assert cache.get(upload) is cache.get(str(upload))
+    assert probes == [upload]
+
+    upload.write_bytes(b"re-recorded video")
+    cache.get(upload)
+    assert probes == [upload, upload]
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 2, "seeded": 0}
+
+
+def test_stored_payload_seeds_the_cache_while_the_file_is_unchanged(tmp_path):
+    upload = tmp_path / "episode.mp4"
+    upload.write_bytes(b"video")
+    payload = MediaProbeCache(_counting_probe([])).payload(upload)
+    assert (payload["name"], payload["size"]) == ("episode.mp4", 5)
+    assert str(tmp_path) not in str(payload)
+    assert media_info_from_payload(payload) == EPISODE
+
+    probes: list[Path] = []
+    fresh = MediaProbeCache(_counting_probe(probes))
+    assert fresh.seed(payload, tmp_path)
+    assert fresh.get(upload) == EPISODE
+    assert probes == []
+
+    os.utime(upload, ns=(payload["mtime_ns"] + 10**9, payload["mtime_ns"] + 10**9))
+    assert not MediaProbeCache(_counting_probe([])).seed(payload, tmp_path)
+    assert not fresh.seed({**payload, "name": "gone.mp4"}, tmp_path)
+    assert not fresh.seed({**payload, "name": "../episode.mp4"}, tmp_path / "uploads")
+
+
+def test_youtube_rejects_a_video_container_without_video(monkeypatch, tmp_path):
+    voice_memo = tmp_path / "memo.webm"
+    voice_memo.write_bytes(b"audio only")
+    audio_only = MediaInfo(True, 30.0, streams=(StreamInfo(index=0, codec_type="audio", codec_name="opus"),))
+    monkeypatch.setattr(media_probe, "media_probe_cache", MediaProbeCache(_counting_probe([], audio_only)))
+    publisher = YouTubePublisher()
+
+    with pytest.raises(PublishConfigurationError, match="requires a video file"):
+        publisher._resolve_source_path({"edited_audio": str(voice_memo)})
+
+    monkeypatch.setattr(media_probe, "media_probe_cache", MediaProbeCache(_counting_probe([])))
+    assert publisher._resolve_source_path({"edited_audio": str(voice_memo)}) == voice_memo
+
+
+def test_record_page_summarizes_stored_media():
+    payload = {"name": "episode_edited.mp4", **media_probe.media_info_to_payload(EPISODE)}
+
+    presented = present_record({"id": "rec-1", "media": [payload]})
+
+    assert presented["media_items"] == [
+        {"name": "episode_edited.mp4", "summary": "mov · 61.5s · h264 1280x720 · aac 48 kHz stereo"}
+    ]
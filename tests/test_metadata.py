@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 
 from clipmato import config
-from clipmato.utils import metadata
+from clipmato.utils import metadata, metadata_shards
 
 
 @pytest.fixture(autouse=True)
@@ -94,3 +94,253 @@ def test_read_metadata_invalidates_cache_when_file_changes(temp_metadata_file):
 
     second = metadata.read_metadata()
     assert second == [{"id": "two"}]
+
+
+@pytest.fixture
+def sqlite_backend(temp_metadata_file, monkeypatch):
+    db_path = temp_metadata_file.with_name("metadata.sqlite3")
+    monkeypatch.setattr(metadata, "metadata_backend", "sqlite", raising=False)
+    monkeypatch.setattr(metadata, "metadata_db_path", db_path, raising=False)
+    yield db_path
+    store = metadata._record_stores.pop(("sqlite", db_path), None)
+    if store is not None:
+        store.close()
+
+
+def test_sqlite_backend_imports_json_once_and_keeps_order(temp_metadata_file, sqlite_backend):
+    temp_metadata_file.write_text(json.dumps([{"id": "b", "value": 1}, {"id": "a", "value": 2}], indent=2))
+
+    assert [rec["id"] for rec in metadata.read_metadata()] == ["b", "a"]
+    assert temp_metadata_file.with_name("metadata.json.imported.bak").exists()
+
+    # metadata.json is no longer the write path, and a stale copy is not re-imported.
+    metadata.append_metadata({"id": "c", "value": 3})
+    temp_metadata_file.write_text(json.dumps([{"id": "stale"}], indent=2))
+
+    assert [rec["id"] for rec in metadata.read_metadata()] == ["b", "a", "c"]
+    assert metadata.get_metadata_record("a") == {"id": "a", "value": 2}
+    assert json.loads(temp_metadata_file.read_text()) == [{"id": "stale"}]
+
+
+def test_sqlite_backend_handles_concurrent_row_writes(sqlite_backend):
+    for record_id in ("keep", "update", "remove"):
+        metadata.append_metadata({"id": record_id, "value": 1})
+
+    barrier = threading.Barrier(4)
+
+    def run(action):
+        barrier.wait()
+        action()
+
+    actions = (
+        lambda: metadata.append_metadata({"id": "new", "value": 99}),
+        lambda: metadata.update_metadata("update", {"value": 200}),
+        lambda: metadata.remove_metadata("remove"),
+        lambda: metadata.mutate_metadata(lambda records: records.append({"id": "extra"})),
+    )
+    threads = [threading.Thread(target=run, args=(action,)) for action in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = metadata.read_metadata()
+    assert {rec["id"] for rec in records} == {"keep", "update", "new", "extra"}
+    assert metadata.get_metadata_record("update")["value"] == 200
+
+
+def test_sqlite_mutate_writes_only_changed_rows(sqlite_backend):
+    for index in range(50):
+        metadata.append_metadata({"id": f"rec-{index}", "value": index})
+    store = metadata._record_store()
+    connection = store._connect()
+
+    before = connection.total_changes
+    selected = metadata.mutate_metadata(
+        lambda records: next(rec for rec in records if rec["id"] == "rec-7").update({"value": -7}) or "ok"
+    )
+
+    assert selected == "ok"
+    assert connection.total_changes - before == 2  # one record row plus the revision counter
+    assert metadata.get_metadata_record("rec-7")["value"] == -7
+
+    # A writer in another process bumps the revision and invalidates this cache.
+    other = metadata.SqliteMetadataStore(sqlite_backend)
+    other.update("rec-8", {"value": "external"})
+    other.close()
+    assert next(rec for rec in metadata.read_metadata() if rec["id"] == "rec-8")["value"] == "external"
+
+
+def test_read_views_are_shared_read_only_and_thaw_on_write(temp_metadata_file):
+    temp_metadata_file.write_text(
+        json.dumps([{"id": "one", "titles": ["A"], "publish_jobs": {"youtube": {"status": "draft"}}}], indent=2)
+    )
+
+    views = metadata.read_metadata_view()
+    record = metadata.get_metadata_record_view("one")
+
+    assert record is views[0]
+    assert metadata.read_metadata_view() is views
+    assert json.loads(json.dumps(record)) == {"id": "one", "titles": ["A"], "publish_jobs": {"youtube": {"status": "draft"}}}
+    with pytest.raises(TypeError):
+        record["selected_title"] = "B"
+    with pytest.raises(TypeError):
+        record["publish_jobs"]["youtube"].update({"status": "published"})
+
+    editable = metadata.thaw(record)
+    editable["titles"].append("B")
+    with pytest.raises(TypeError):
+        record["titles"].append("B")
+    assert record["titles"] == ["A"]
+    assert metadata.get_metadata_record("one")["titles"] == ["A"]
+
+    metadata.update_metadata("one", {"selected_title": "A"})
+    assert metadata.get_metadata_record_view("one")["selected_title"] == "A"
+    assert metadata.get_metadata_record_view("missing") is None
+
+
+@pytest.fixture
+def sharded_backend(temp_metadata_file, monkeypatch):
+    root = temp_metadata_file.with_name("metadata.d")
+    monkeypatch.setattr(metadata, "metadata_backend", "sharded", raising=False)
+    monkeypatch.setattr(metadata, "metadata_shards_dir", root, raising=False)
+    yield root
+    metadata._record_stores.pop(("sharded", root), None)
+
+
+@pytest.mark.parametrize("backend", ["sqlite_backend", "sharded_backend"])
+def test_record_views_come_from_the_cache_on_per_record_backends(request, monkeypatch, backend):
+    request.getfixturevalue(backend)
+    metadata.append_metadata({"id": "one", "titles": ["A"]})
+    view = metadata.get_metadata_record_view("one")
+    store = metadata._record_store()
+
+    monkeypatch.setattr(store, "get", lambda record_id: pytest.fail("read the store instead of the cache"))
+    assert metadata.get_metadata_record_view("one") is view
+    assert metadata.get_metadata_record_view("missing") is None
+
+    metadata.update_metadata("one", {"selected_title": "A"})
+    assert metadata.get_metadata_record_view("one")["selected_title"] == "A"
+
+
+def test_sharded_backend_imports_json_and_updates_one_shard(temp_metadata_file, sharded_backend):
+    temp_metadata_file.write_text(
+        json.dumps(
+            [
+                {"id": "b", "upload_time": "2026-01-02", "transcript": "long text"},
+                {"id": "a/x", "upload_time": "2026-01-01"},
+            ],
+            indent=2,
+        )
+    )
+
+    assert [rec["id"] for rec in metadata.read_metadata()] == ["b", "a/x"]
+    shards = sorted(path.name for path in (sharded_backend / "records").iterdir())
+    assert "b.json" in shards and len(shards) == 2  # unsafe ids are hashed into safe names
+
+    other_shard = sharded_backend / "records" / "b.json"
+    before = other_shard.stat().st_mtime_ns
+    metadata.update_metadata("a/x", {"selected_title": "Picked"})
+    assert other_shard.stat().st_mtime_ns == before
+    assert metadata.get_metadata_record("a/x")["selected_title"] == "Picked"
+
+    metadata.update_metadata("b", {"schedule_time": "2026-02-01T09:00:00"})
+    assert [
+        (summary["id"], summary["upload_time"], summary.get("schedule_time")) for summary in metadata.read_metadata_summaries()
+    ] == [("b", "2026-01-02", "2026-02-01T09:00:00"), ("a/x", "2026-01-01", None)]
+    assert "transcript" not in (sharded_backend / "index.json").read_text()
+
+
+def test_sharded_backend_concurrent_writes_and_mutations(sharded_backend):
+    for record_id in ("keep", "update", "remove"):
+        metadata.append_metadata({"id": record_id, "value": 1})
+    metadata.read_metadata()
+
+    barrier = threading.Barrier(5)
+
+    def run(action):
+        barrier.wait()
+        action()
+
+    actions = (
+        lambda: metadata.append_metadata({"id": "new", "value": 99}),
+        lambda: metadata.update_metadata("update", {"value": 200}),
+        lambda: metadata.update_metadata("keep", {"value": 100}),
+        lambda: metadata.remove_metadata("remove"),
+        lambda: metadata.mutate_metadata(lambda records: records.append({"id": "extra"})),
+    )
+    threads = [threading.Thread(target=run, args=(action,)) for action in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = {rec["id"]: rec for rec in metadata.read_metadata()}
+    assert set(records) == {"keep", "update", "new", "extra"}
+    assert records["update"]["value"] == 200
+    assert records["keep"]["value"] == 100
+    assert not (sharded_backend / "records" / "remove.json").exists()
+
+
+def test_summary_projection_tracks_mutations_without_large_fields(temp_metadata_file):
+    temp_metadata_file.write_text(
+        json.dumps([{"id": "one", "filename": "one.wav", "transcript": "words " * 100, "titles": ["T"]}], indent=2)
+    )
+
+    assert metadata.read_metadata_summaries() == (
+        {"id": "one", "filename": "one.wav", "has_generated_content": True},
+    )
+
+    metadata.update_metadata(
+        "one",
+        {"schedule_time": "2026-05-01T09:00:00", "publish_jobs": {"youtube": {"status": "scheduled"}, "other": {}}},
+    )
+    (summary,) = metadata.read_metadata_summaries()
+    assert summary["schedule_time"] == "2026-05-01T09:00:00"
+    assert summary["publish_jobs"] == {"youtube": {"status": "scheduled"}}
+    assert "transcript" not in summary and "titles" not in summary
+
+
+def test_sharded_summaries_are_served_from_the_index(sharded_backend, monkeypatch):
+    metadata.append_metadata({"id": "one", "filename": "one.wav", "transcript": "words"})
+    metadata.update_metadata("one", {"selected_title": "Chosen"})
+    store = metadata._record_store()
+
+    def _no_shard_reads(name):
+        raise AssertionError(f"list view loaded shard {name}")
+
+    monkeypatch.setattr(store, "_read_shard", _no_shard_reads)
+
+    (summary,) = metadata.read_metadata_summaries()
+    assert summary["selected_title"] == "Chosen"
+    assert summary["has_generated_content"] is True
+
+
+def test_iter_summaries_seeks_past_cursor_keys(temp_metadata_file):
+    temp_metadata_file.write_text(
+        json.dumps([{"id": f"r{index}", "upload_time": f"2026-01-0{index}"} for index in (3, 1, 2)], indent=2)
+    )
+
+    ascending = [summary["id"] for summary in metadata.iter_metadata_summaries()]
+    after_first = [summary["id"] for summary in metadata.iter_metadata_summaries(after=("2026-01-01", "r1"))]
+    descending = [
+        summary["id"] for summary in metadata.iter_metadata_summaries(descending=True, after=("2026-01-03", "r3"))
+    ]
+
+    assert ascending == ["r1", "r2", "r3"]
+    assert after_first == ["r2", "r3"]
+    assert descending == ["r2", "r1"]
+
+
+def test_sharded_change_counter_rotates_on_single_record_writes(sharded_backend, monkeypatch):
+    monkeypatch.setattr(metadata_shards, "_CHANGES_ROTATE_BYTES", 4)
+    metadata.append_metadata({"id": "one", "filename": "one.wav"})
+    store = metadata._record_store()
+    signatures = {store.signature()}
+    for count in range(10):
+        metadata.update_metadata("one", {"selected_title": f"Title {count}"})
+        signatures.add(store.signature())
+
+    assert (sharded_backend / "changes").stat().st_size <= 4
+    assert len(signatures) == 11
+    assert metadata.get_metadata_record("one")["selected_title"] == "Title 9"
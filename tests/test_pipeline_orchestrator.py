@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from clipmato import orchestrator
+from clipmato.orchestrator import Pipeline, Step, step_dependencies
+from clipmato.services import service_utils
+
+
+@pytest.fixture(autouse=True)
+def _quiet_side_effects(monkeypatch):
+    progress: list[tuple[str, str | None]] = []
+    events: list[tuple[str, dict]] = []
+    monkeypatch.setattr(orchestrator, "update_progress", lambda rec_id, stage, message=None: progress.append((stage, message)))
+    monkeypatch.setattr(service_utils, "update_progress", lambda *args, **kwargs: None)
+    monkeypatch.setattr(service_utils, "emit_event", lambda event_type, **kwargs: events.append((event_type, kwargs["payload"])))
+    return progress, events
+
+
+def _tracked(name: str, log: list[str], delay: float = 0.01, result=None):
+    async def _run(*_args):
+        log.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        log.append(f"end:{name}")
+        return result if result is not None else name
+
+    return _run
+
+
+def _episode_steps(log: list[str], *, remove_silence: bool = True) -> list[Step]:
+    steps = [
+        Step("transcribing", _tracked("transcribing", log), ["file_path"], "transcript"),
+        Step("descriptions", _tracked("descriptions", log), ["transcript", "rec_id"], "desc"),
+        Step("entities", _tracked("entities", log), ["transcript", "rec_id"], "entities"),
+        Step("titles", _tracked("titles", log), ["transcript", "rec_id"], "titles"),
+        Step("script", _tracked("script", log), ["transcript", "rec_id"], "script"),
+        Step("editing", _tracked("editing", log), ["file_path"], "edited_audio"),
+    ]
+    if remove_silence:
+        steps.append(
+            Step(
+                "remove_silence",
+                _tracked("remove_silence", log, result=(2.0, 1.0, "trimmed")),
+                ["edited_audio"],
+                ["original_duration", "trimmed_duration", "edited_audio"],
+            )
+        )
+    steps.append(Step("distribution", _tracked("distribution", log), ["edited_audio", "rec_id"], "distribution"))
+    return steps
+
+
+def test_step_dependencies_follow_context_keys():
+    deps = step_dependencies(_episode_steps([]))
+
+    assert deps["transcribing"] == set()
+    assert deps["editing"] == set()
+    for name in ("descriptions", "entities", "titles", "script"):
+        assert deps[name] == {"transcribing"}
+    assert deps["remove_silence"] == {"editing"}
+    assert deps["distribution"] == {"remove_silence"}
+
+
+def test_pipeline_overlaps_independent_steps_and_keeps_results():
+    log: list[str] = []
+    ctx = asyncio.run(Pipeline(_episode_steps(log), max_concurrency=8).run({"rec_id": "rec-1", "file_path": "in.wav"}))
+
+    assert ctx["edited_audio"] == "trimmed"
+    assert ctx["original_duration"] == 2.0
+    assert ctx["titles"] == "titles"
+    assert log.index("start:editing") < log.index("end:transcribing")
+    prompt_starts = [log.index(f"start:{name}") for name in ("descriptions", "entities", "titles", "script")]
+    assert max(prompt_starts) < min(log.index(f"end:{name}") for name in ("descriptions", "entities", "titles", "script"))
+    assert log.index("start:distribution") > log.index("end:remove_silence")
+
+
+def test_pipeline_respects_concurrency_limit():
+    running = 0
+    peak = 0
+
+    async def _work(*_args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    steps = [Step(f"stage-{index}", _work, ["rec_id"], f"out-{index}") for index in range(6)]
+    asyncio.run(Pipeline(steps, max_concurrency=2).run({"rec_id": "rec-1"}))
+
+    assert peak == 2
+
+
+def test_pipeline_progress_only_moves_forward(_quiet_side_effects):
+    progress, _events = _quiet_side_effects
+    steps = _episode_steps([])
+    asyncio.run(Pipeline(steps, max_concurrency=8).run({"rec_id": "rec-1", "file_path": "in.wav"}))
+
+    order = [step.name for step in steps]
+    reported = [order.index(stage) for stage, _message in progress]
+    assert reported == sorted(reported)
+    assert progress[0] == ("transcribing", "Also running: editing")
+
+
+def test_pipeline_failure_cancels_running_steps(_quiet_side_effects):
+    _progress, events = _quiet_side_effects
+
+    async def _boom(*_args):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    steps = [
+        Step("transcribing", _boom, ["file_path"], "transcript"),
+        Step("editing", _tracked("editing", [], delay=5), ["file_path"], "edited_audio"),
+        Step("titles", _tracked("titles", []), ["transcript"], "titles"),
+    ]
+    with pytest.raises(RuntimeError, match="provider down"):
+        asyncio.run(Pipeline(steps).run({"rec_id": "rec-1", "file_path": "in.wav"}))
+
+    assert ("workflow.stage.failed", {"stage": "transcribing"}) in events
+    assert ("workflow.stage.cancelled", {"stage": "editing"}) in events
+    assert not any(payload.get("stage") == "titles" for _type, payload in events)
+
+
+@pytest.fixture()
+def episode_env(monkeypatch, tmp_path):
+    from clipmato.services import file_processing
+    from clipmato.utils import pipeline_checkpoints
+
+    monkeypatch.setattr(pipeline_checkpoints, "checkpoints_dir", tmp_path)
+    monkeypatch.setattr(file_processing, "update_progress", lambda *args, **kwargs: None)
+    monkeypatch.setattr(file_processing, "emit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(file_processing, "get_metadata_record_view", lambda record_id: None)
+    stored: list[dict] = []
+    monkeypatch.setattr(file_processing, "append_metadata", stored.append)
+    calls: list[str] = []
+
+    def _prompt(name, value):
+        async def _run(*_args):
+            calls.append(name)
+            return value, {"task": name}
+
+        return _run
+
+    def _edit(path, keep_intervals):
+        calls.append("editing")
+        return f"{path}.edited.wav"
+
+    def _transcribe(path, record_id):
+        calls.append("transcribing")
+        return "fresh transcript"
+
+    monkeypatch.setattr(file_processing, "transcribe_record_audio", _transcribe)
+    monkeypatch.setattr(file_processing, "generate_descriptions_with_prompt_async", _prompt("descriptions", {"short_description": "s"}))
+    monkeypatch.setattr(file_processing, "extract_entities_with_prompt_async", _prompt("entities", {"people": ["Ada"]}))
+    monkeypatch.setattr(file_processing, "propose_titles_with_prompt_async", _prompt("titles", ["T1"]))
+    monkeypatch.setattr(file_processing, "generate_script_with_prompt_async", _prompt("script", "script"))
+    monkeypatch.setattr(file_processing, "edit_audio", _edit)
+    monkeypatch.setattr(file_processing, "distribute_with_prompt_async", _prompt("distribution", "dist"))
+    return file_processing, pipeline_checkpoints, stored, calls
+
+
+def test_process_file_checkpoints_stages_and_resumes_without_redoing_them(episode_env, monkeypatch):
+    file_processing, checkpoints, stored, calls = episode_env
+    release = asyncio.Event()
+
+    async def _stuck_script(*_args):
+        await release.wait()
+
+    monkeypatch.setattr(file_processing, "generate_script_with_prompt_async", _stuck_script)
+
+    async def interrupted():
+        task = asyncio.create_task(file_processing.process_file_async("in.wav", "in.wav", "rec-1"))
+        while "transcribing" not in ((checkpoints.load_checkpoint("rec-1") or {}).get("completed_stages") or []):
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(interrupted())
+    checkpoint = checkpoints.load_checkpoint("rec-1")
+    assert stored == []
+    assert {"transcribing", "descriptions", "titles", "editing"} <= set(checkpoint["completed_stages"])
+    assert "script" not in checkpoint["completed_stages"]
+    assert checkpoint["context"]["transcript"] == "fresh transcript"
+
+    async def _script(*_args):
+        calls.append("script")
+        return "resumed script", {"task": "script"}
+
+    monkeypatch.setattr(file_processing, "generate_script_with_prompt_async", _script)
+    calls.clear()
+    record = asyncio.run(file_processing.process_file_async("in.wav", "in.wav", "rec-1"))
+
+    assert calls == ["script"]
+    assert record["transcript"] == "fresh transcript"
+    assert record["script"] == "resumed script"
+    assert record["titles"] == ["T1"]
+    assert stored == [record]
+    assert checkpoints.load_checkpoint("rec-1") is None
+
+
+def test_remove_silence_hands_keep_intervals_to_the_editing_encode(episode_env, monkeypatch):
+    file_processing, _checkpoints, stored, calls = episode_env
+    edits: list[tuple[str, object]] = []
+
+    def _detect(path):
+        calls.append("remove_silence")
+        return 10.0, 7.5, [[0, 4000], [6500, 10000]]
+
+    def _edit(path, keep_intervals):
+        calls.append("editing")
+        edits.append((path, keep_intervals))
+        return "in_edited.m4a"
+
+    monkeypatch.setattr(file_processing, "find_keep_intervals", _detect)
+    monkeypatch.setattr(file_processing, "edit_audio", _edit)
+
+    record = asyncio.run(file_processing.process_file_async("in.wav", "in.wav", "rec-2", remove_silence=True))
+
+    assert calls.index("remove_silence") < calls.index("editing")
+    assert edits == [("in.wav", [[0, 4000], [6500, 10000]])]
+    assert (record["original_duration"], record["trimmed_duration"]) == (10.0, 7.5)
+    assert record["edited_audio"] == "in_edited.m4a"
+    assert stored == [record]
+
+
+def test_uncut_fallback_does_not_report_a_trimmed_duration(episode_env, monkeypatch):
+    file_processing, _checkpoints, stored, _calls = episode_env
+    monkeypatch.setattr(file_processing, "find_keep_intervals", lambda path: (10.0, 7.5, [[0, 4000]]))
+    monkeypatch.setattr(file_processing, "edit_audio", lambda path, keep_intervals: path)
+
+    record = asyncio.run(file_processing.process_file_async("in.wav", "in.wav", "rec-3", remove_silence=True))
+
+    assert record["original_duration"] == 10.0
+    assert "trimmed_duration" not in record
+    assert record["edited_audio"] == "in.wav"
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from clipmato.services import processing_queue as queue_module
+from clipmato.services.processing_queue import ProcessingQueue, QueueFullError
+from clipmato.services.stage_limits import StageLimits
+from clipmato.utils import pipeline_checkpoints
+
+
+@pytest.fixture()
+def recorded(monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline_checkpoints, "checkpoints_dir", tmp_path / "checkpoints")
+    progress: list[tuple[str, str, str | None]] = []
+    processed: list[str] = []
+    monkeypatch.setattr(
+        queue_module, "update_progress", lambda record_id, stage, message=None: progress.append((record_id, stage, message))
+    )
+    monkeypatch.setattr(queue_module, "emit_event", lambda *args, **kwargs: None)
+
+    async def fake_process(file_path, filename, record_id, remove_silence, project_context):
+        processed.append(record_id)
+        await asyncio.sleep(0.01)
+        if record_id == "broken":
+            return {"id": record_id, "error": "boom"}
+        return {"id": record_id}
+
+    monkeypatch.setattr(queue_module, "process_file_async", fake_process)
+    return progress, processed
+
+
+def test_queue_runs_jobs_by_priority_then_fifo_and_reports_metrics(recorded):
+    progress, processed = recorded
+    queue = ProcessingQueue(workers=1, max_depth=10)
+
+    async def scenario():
+        queue.submit("a.wav", "a.wav", "first", priority="normal")
+        await asyncio.sleep(0)  # the single worker picks up "first"
+        queue.submit("b.wav", "b.wav", "low-1", priority="low")
+        queue.submit("c.wav", "c.wav", "normal-1")
+        position = queue.submit("d.wav", "d.wav", "urgent", priority="high", message="Local Whisper on cpu")
+        queue.submit("e.wav", "e.wav", "broken")
+        waiting = queue.metrics()
+        await queue._queue.join()
+        await queue.stop()
+        return position, waiting
+
+    position, waiting = asyncio.run(scenario())
+
+    assert processed == ["first", "urgent", "normal-1", "broken", "low-1"]
+    assert position == 1
+    assert ("urgent", "queued", "Queued at position 1 · Local Whisper on cpu") in progress
+    assert waiting["depth"] == 4
+    assert waiting["depth_by_priority"] == {"high": 1, "normal": 2, "low": 1}
+    assert waiting["running"] == 1
+    final = queue.metrics()
+    assert final["depth"] == 0
+    assert (final["enqueued"], final["completed"], final["failed"]) == (5, 4, 1)
+
+
+def test_queue_rejects_jobs_beyond_max_depth(recorded):
+    queue = ProcessingQueue(workers=1, max_depth=1)
+
+    async def scenario():
+        queue.submit("a.wav", "a.wav", "running")
+        await asyncio.sleep(0)
+        queue.submit("b.wav", "b.wav", "waiting")
+        assert not queue.has_capacity()
+        with pytest.raises(QueueFullError):
+            queue.submit("c.wav", "c.wav", "rejected")
+        with pytest.raises(ValueError):
+            queue.submit("d.wav", "d.wav", "odd", priority="urgent")
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+    assert queue.metrics()["rejected"] == 1
+
+
+def test_stage_limits_cap_concurrent_stages():
+    limits = StageLimits({"transcribing": 1, "titles": 2})
+    peaks: dict[str, int] = {}
+    active: dict[str, int] = {}
+
+    async def stage(name: str):
+        async with limits.slot(name):
+            active[name] = active.get(name, 0) + 1
+            peaks[name] = max(peaks.get(name, 0), active[name])
+            await asyncio.sleep(0.01)
+            active[name] -= 1
+
+    async def scenario():
+        tasks = [asyncio.create_task(stage(name)) for name in ["transcribing"] * 3 + ["titles"] * 4 + ["editing"] * 3]
+        await asyncio.sleep(0.001)
+        snapshot = limits.snapshot()
+        await asyncio.gather(*tasks)
+        return snapshot
+
+    snapshot = asyncio.run(scenario())
+
+    assert peaks == {"transcribing": 1, "titles": 2, "editing": 3}
+    assert snapshot["transcribing"] == {"limit": 1, "active": 1, "waiting": 2}
+    assert "editing" not in snapshot
+
+
+def test_resume_requeues_interrupted_jobs_started_ones_first(recorded, monkeypatch):
+    _progress, processed = recorded
+    monkeypatch.setattr(queue_module, "get_metadata_record_view", lambda record_id: {"id": record_id} if record_id == "stored" else None)
+    job = {"file_path": "a.wav", "filename": "a.wav", "remove_silence": False, "project_context": None}
+    pipeline_checkpoints.save_checkpoint("waiting", job, priority="normal")
+    pipeline_checkpoints.save_checkpoint("halfway", job, completed_stages=["transcribing"], context={"transcript": "hi"})
+    pipeline_checkpoints.save_checkpoint("stored", job)
+    queue = ProcessingQueue(workers=1, max_depth=10)
+
+    async def scenario():
+        with pipeline_checkpoints.claim("busy") as acquired:
+            assert acquired
+            pipeline_checkpoints.save_checkpoint("busy", job)
+            resumed = queue.resume_interrupted()
+        await queue._queue.join()
+        await queue.stop()
+        return resumed
+
+    resumed = asyncio.run(scenario())
+
+    assert resumed == ["waiting", "halfway"]
+    assert processed == ["halfway", "waiting"]
+    assert pipeline_checkpoints.load_checkpoint("stored") is None
+    assert pipeline_checkpoints.load_checkpoint("busy") is not None
+
+
+def test_deleting_a_checkpoint_keeps_the_run_lock_until_release(recorded):
+    job = {"file_path": "a.wav", "filename": "a.wav", "remove_silence": False, "project_context": None}
+    lock_path = pipeline_checkpoints._lock_path("running")
+
+    with pipeline_checkpoints.claim("running") as acquired:
+        assert acquired
+        pipeline_checkpoints.save_checkpoint("running", job)
+        pipeline_checkpoints.delete_checkpoint("running")
+        assert lock_path.exists()
+        with pipeline_checkpoints.claim("running") as second:
+            assert not second
+        assert pipeline_checkpoints.is_claimed("running")
+
+    assert not lock_path.exists()
+    with pipeline_checkpoints.claim("running") as acquired:
+        assert acquired
+
+
+def test_claim_does_not_hold_a_lock_file_that_was_unlinked_under_it(recorded, monkeypatch):
+    lock_path = pipeline_checkpoints._lock_path("raced")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path.write_text("")
+    stale_inode = lock_path.stat().st_ino
+    real_flock = pipeline_checkpoints.fcntl.flock
+    raced: list[int] = []
+
+    def flock_after_unlink(handle, operation):
+        # a finishing job unlinks the file between this claimer's open and flock
+        if not raced and operation & pipeline_checkpoints.fcntl.LOCK_EX:
+            raced.append(os.fstat(handle.fileno()).st_ino)
+            lock_path.unlink()
+        real_flock(handle, operation)
+
+    monkeypatch.setattr(pipeline_checkpoints.fcntl, "flock", flock_after_unlink)
+
+    with pipeline_checkpoints.claim("raced") as acquired:
+        assert acquired
+        assert lock_path.exists()
+        monkeypatch.setattr(pipeline_checkpoints.fcntl, "flock", real_flock)
+        with pipeline_checkpoints.claim("raced") as second:
+            assert not second
+
+    assert raced == [stale_inode]
@@ -21,6 +21,12 @@ def _build_app():
         async def process(self, *args, **kwargs):
             return None
 
+        def enqueue(self, *args, **kwargs):
+            return 1
+
+        def has_capacity(self):
+            return True
+
     class DummyFileIO:
         def save(self, *args, **kwargs):
             return None
@@ -63,3 +69,53 @@ def test_progress_reports_invalid_schema_error(client, tmp_path):
     assert body["progress"] == 0
     assert body["error"] == "invalid_progress_file"
     assert "unreadable" in body["message"].lower()
+
+
+def test_progress_updates_go_to_shared_log_not_status_files(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(progress, "emit_event", lambda *args, **kwargs: None)
+
+    progress.update_progress("rec-a", "transcribing")
+    progress.update_progress("rec-b", "complete")
+    progress.update_progress("rec-a", "titles", "Picking titles")
+
+    assert not list(tmp_path.glob("*.status.json"))
+    assert len((tmp_path / "progress.jsonl").read_text().splitlines()) == 3
+    assert progress.read_progress("rec-a")["stage"] == "titles"
+    assert client.get("/progress/rec-a").json()["message"] == "Picking titles"
+    assert progress.read_progress_many(["rec-a", "rec-b", "rec-c"]) == {
+        "rec-a": {"stage": "titles", "progress": progress.STAGE_PROGRESS["titles"], "message": "Picking titles"},
+        "rec-b": {"stage": "complete", "progress": progress.STAGE_PROGRESS["complete"]},
+        "rec-c": {"stage": "pending", "progress": 0},
+    }
+
+
+def test_bulk_progress_reads_legacy_status_files_until_overwritten(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(progress, "emit_event", lambda *args, **kwargs: None)
+    (tmp_path / "old-1.status.json").write_text(json.dumps({"stage": "transcribing", "progress": 20}))
+    (tmp_path / "old-2.status.json").write_text('{"stage": ')
+
+    statuses = progress.read_progress_many(["old-1", "old-2"])
+    assert statuses["old-1"] == {"stage": "transcribing", "progress": 20}
+    assert statuses["old-2"]["error"] == "invalid_progress_file"
+
+    progress.update_progress("old-1", "complete")
+
+    assert progress.read_progress_many(["old-1"])["old-1"]["stage"] == "complete"
+    assert progress.read_progress("old-1")["stage"] == "complete"
+
+
+def test_progress_log_compacts_to_one_line_per_record(tmp_path, monkeypatch):
+    from clipmato.utils import progress_store
+
+    monkeypatch.setattr(progress_store, "COMPACT_MIN_LINES", 10)
+    store = progress_store.ProgressStore(tmp_path / "progress.jsonl")
+    reader = progress_store.ProgressStore(tmp_path / "progress.jsonl")
+    for step in range(12):
+        store.write("rec-1", {"stage": "transcribing", "progress": step})
+    store.write("rec-2", {"stage": "complete", "progress": 100})
+
+    assert len((tmp_path / "progress.jsonl").read_text().splitlines()) < 13
+    assert reader.get_many(["rec-1", "rec-2"]) == {
+        "rec-1": {"stage": "transcribing", "progress": 11},
+        "rec-2": {"stage": "complete", "progress": 100},
+    }
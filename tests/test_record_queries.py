@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from clipmato.services.record_queries import RecordQueryService
+import pytest
+
+from clipmato.services.record_queries import InvalidCursorError, RecordFilters, RecordQueryService
+from clipmato.utils.record_summary import summary_sort_key
 
 
 class DummyMetadataService:
@@ -10,6 +13,17 @@ class DummyMetadataService:
     def read(self):
         return list(self._records)
 
+    def read_summaries(self):
+        return list(self._records)
+
+    def iter_summaries(self, *, sort="upload_time", descending=False, after=None):
+        ordered = sorted(self._records, key=lambda record: summary_sort_key(record, sort), reverse=descending)
+        for record in ordered:
+            key = summary_sort_key(record, sort)
+            if after is not None and (key >= tuple(after) if descending else key <= tuple(after)):
+                continue
+            yield record
+
 
 class DummyProgressService:
     def enrich(self, records):
@@ -85,3 +99,40 @@ def test_record_query_service_builds_public_detail_payload():
     assert payload["titles"] == ["Episode"]
     assert payload["people"] == ["Alice"]
     assert payload["publish_jobs"]["youtube"]["status"] == "scheduled"
+
+
+def test_record_query_service_pages_with_cursor_and_filters():
+    service = RecordQueryService()
+    metadata = DummyMetadataService(
+        [
+            {
+                "id": f"rec-{index}",
+                "filename": f"{index}.wav",
+                "upload_time": f"2026-04-{index + 1:02d}T10:00:00+00:00",
+                "schedule_time": "2026-05-01T09:00:00" if index % 2 else None,
+                "project_context": {"project_name": "OSM" if index < 4 else "Other"},
+            }
+            for index in range(6)
+        ]
+    )
+    progress = DummyProgressService()
+
+    first, cursor = service.page_records(metadata, progress, limit=2)
+    second, cursor_two = service.page_records(metadata, progress, limit=2, cursor=cursor)
+    third, cursor_three = service.page_records(metadata, progress, limit=2, cursor=cursor_two)
+
+    assert [record["id"] for record in first + second + third] == [f"rec-{index}" for index in range(5, -1, -1)]
+    assert cursor_three is None
+
+    filtered, next_cursor = service.page_records(
+        metadata,
+        progress,
+        limit=10,
+        sort="upload_time",
+        filters=RecordFilters(scheduled=True, project_name="osm"),
+    )
+    assert [record["id"] for record in filtered] == ["rec-1", "rec-3"]
+    assert next_cursor is None
+
+    with pytest.raises(InvalidCursorError):
+        service.page_records(metadata, progress, limit=2, sort="upload_time", cursor=cursor)
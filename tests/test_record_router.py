@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from clipmato.dependencies import get_file_io_service, get_metadata_service
+from clipmato.routers.record import router
+
+
+class DummyMetadata:
+    def __init__(self, record):
+        self.record = record
+
+    def remove(self, record_id):
+        return self.record if record_id == self.record["id"] else None
+
+
+class DummyFileIO:
+    def __init__(self, upload_dir):
+        self.upload_dir = upload_dir
+
+
+def test_delete_record_removes_the_upload_and_its_edited_file(tmp_path):
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    upload = upload_dir / "episode.mov"
+    edited = upload_dir / "episode_edited.mp4"
+    elsewhere = tmp_path / "keep.mp4"
+    for path in (upload, edited, elsewhere):
+        path.write_bytes(b"media")
+
+    def client_for(record):
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_metadata_service] = lambda: DummyMetadata(record)
+        app.dependency_overrides[get_file_io_service] = lambda: DummyFileIO(upload_dir)
+        return TestClient(app)
+
+    response = client_for({"id": "rec-1", "filename": upload.name, "edited_audio": str(edited)}).post(
+        "/record/rec-1/delete", follow_redirects=False
+    )
+    client_for({"id": "rec-2", "filename": "gone.mov", "edited_audio": str(elsewhere)}).post(
+        "/record/rec-2/delete", follow_redirects=False
+    )
+
+    assert response.status_code == 303
+    assert not upload.exists() and not edited.exists()
+    assert Path(elsewhere).exists()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import math
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pydub import AudioSegment  # noqa: E402
+from pydub.silence import detect_nonsilent, split_on_silence  # noqa: E402
+
+from clipmato.steps import silence_removal  # noqa: E402
+from clipmato.utils.audio_decode import MediaInfo  # noqa: E402
+
+RATE = 16000
+
+
+def _episode(pattern: list[tuple[float, float]]) -> np.ndarray:
+    """Build int16 mono audio from (seconds, amplitude) pieces of a 220 Hz tone."""
+    pieces = []
+    for seconds, amplitude in pattern:
+        t = np.arange(int(seconds * RATE)) / RATE
+        pieces.append(amplitude * np.sin(2 * math.pi * 220 * t))
+    return (np.concatenate(pieces) * 32767).astype(np.int16)
+
+
+def _energies(samples: np.ndarray) -> tuple[np.ndarray, int]:
+    floats = samples.astype(np.float64) / 32768
+    whole = len(floats) - len(floats) % 16
+    energies = np.square(floats[:whole]).reshape(-1, 16).sum(axis=1)
+    return energies, round(len(samples) * 1000 / RATE)
+
+
+@pytest.mark.parametrize("keep_silence", [0, 200, 900])
+def test_keep_intervals_match_pydub_split_on_silence(keep_silence):
+    samples = _episode([(0.5, 0.0), (2.0, 0.3), (1.5, 0.0004), (0.7, 0.2), (0.4, 0.0), (1.2, 0.25), (2.2, 0.0)])
+    sound = AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=RATE, channels=1)
+    energies, total_ms = _energies(samples)
+
+    intervals = silence_removal._keep_intervals(
+        energies, total_ms, min_silence_len=1000, silence_thresh=-50, keep_silence=keep_silence
+    )
+
+    expected_chunks = split_on_silence(sound, min_silence_len=1000, silence_thresh=-50, keep_silence=keep_silence)
+    assert [end - start for start, end in intervals] == [len(chunk) for chunk in expected_chunks]
+    if keep_silence == 0:
+        assert [list(pair) for pair in intervals] == detect_nonsilent(sound, min_silence_len=1000, silence_thresh=-50)
+
+
+def test_keep_intervals_edge_cases():
+    assert silence_removal._keep_intervals(np.zeros(0), 0, min_silence_len=1000, silence_thresh=-50, keep_silence=0) == []
+    assert silence_removal._keep_intervals(np.zeros(500), 500, min_silence_len=1000, silence_thresh=-50, keep_silence=0) == [(0, 500)]
+    assert silence_removal._keep_intervals(np.zeros(3000), 3000, min_silence_len=1000, silence_thresh=-50, keep_silence=200) == []
+    loud = np.full(3000, 16 * 0.25)
+    assert silence_removal._keep_intervals(loud, 3000, min_silence_len=1000, silence_thresh=-50, keep_silence=200) == [(0, 3000)]
+
+
+@pytest.fixture()
+def fake_ffmpeg(monkeypatch, tmp_path):
+    """Put an ``ffmpeg`` on PATH that fakes silencedetect output and writes trim filter scripts to the output path."""
+    script = tmp_path / "bin" / "ffmpeg"
+    script.parent.mkdir()
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "args = sys.argv[1:]\n"
+        "if '-af' in args:\n"
+        "    sys.stderr.write('[silencedetect @ 0x1] silence_start: 1.2\\n'\n"
+        "                     '[silencedetect @ 0x1] silence_end: 2.8 | silence_duration: 1.6\\n'\n"
+        "                     '[silencedetect @ 0x1] silence_start: 5.05\\n')\n"
+        "    sys.exit(0)\n"
+        "graph = open(args[args.index('-filter_complex_script') + 1]).read()\n"
+        "maps = [args[i + 1] for i, arg in enumerate(args) if arg == '-map']\n"
+        "open(args[-1], 'w').write(graph + '\\n' + ' '.join(maps))\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_numpy_backend_trims_with_one_ffmpeg_filter_pass(fake_ffmpeg, monkeypatch, tmp_path):
+    src = tmp_path / "episode.wav"
+    src.write_bytes(b"")
+    samples = _episode([(1.0, 0.2), (2.0, 0.0), (1.5, 0.2)])
+    energies, _total_ms = _energies(samples)
+    monkeypatch.setattr(silence_removal, "frame_energies", lambda path, **kwargs: (energies, len(samples)))
+    monkeypatch.setattr(silence_removal, "media_info", lambda path: MediaInfo(has_audio=True, duration=4.5))
+
+    original, trimmed, output = silence_removal.remove_silence(str(src), backend="numpy")
+
+    assert (original, trimmed) == (4.5, 2.9)
+    assert output == str(tmp_path / "episode_trimmed.wav")
+    assert Path(output).read_text() == (
+        "[0:a]asplit=2[a0][a1];\n"
+        "[a0]atrim=start=0.000:end=1.200,asetpts=PTS-STARTPTS[as0];\n"
+        "[a1]atrim=start=2.800:end=4.500,asetpts=PTS-STARTPTS[as1];\n"
+        "[as0][as1]concat=n=2:v=0:a=1[a]\n"
+        "[a]"
+    )
+    assert not list(tmp_path.glob("*.filter"))
+
+
+def test_numpy_backend_keeps_the_video_track(fake_ffmpeg, monkeypatch, tmp_path):
+    src = tmp_path / "episode.mp4"
+    src.write_bytes(b"")
+    samples = _episode([(1.0, 0.2), (2.0, 0.0), (1.5, 0.2)])
+    energies, _total_ms = _energies(samples)
+    monkeypatch.setattr(silence_removal, "frame_energies", lambda path, **kwargs: (energies, len(samples)))
+    monkeypatch.setattr(silence_removal, "media_info", lambda path: MediaInfo(True, 4.5, has_video=True))
+
+    _original, _trimmed, output = silence_removal.remove_silence(str(src), backend="numpy")
+
+    assert Path(output).read_text().endswith("[vs0][as0][vs1][as1]concat=n=2:v=1:a=1[v][a]\n[a] [v]")
+
+
+def test_unknown_or_unavailable_backend_falls_back(monkeypatch):
+    assert silence_removal._resolve_backend("sox") == "numpy"
+    monkeypatch.setattr(silence_removal.importlib.util, "find_spec", lambda name: None)
+    assert silence_removal._resolve_backend("numpy") == "pydub"
+
+
+def test_ffmpeg_backend_detects_and_trims_without_decoding_in_python(fake_ffmpeg, monkeypatch, tmp_path):
+    src = tmp_path / "episode.mp4"
+    src.write_bytes(b"")
+    monkeypatch.setattr(
+        silence_removal,
+        "media_info",
+        lambda path: MediaInfo(has_audio=True, duration=6.0, has_video=True),
+    )
+    monkeypatch.setattr(silence_removal, "frame_energies", lambda *args, **kwargs: pytest.fail("decoded in Python"))
+
+    original, trimmed, output = silence_removal.remove_silence(str(src), backend="ffmpeg", keep_silence=200)
+
+    assert (original, trimmed) == (6.0, 4.05)
+    assert Path(output).read_text() == (
+        "[0:a]asplit=2[a0][a1];\n"
+        "[0:v]split=2[v0][v1];\n"
+        "[a0]atrim=start=0.000:end=1.400,asetpts=PTS-STARTPTS[as0];\n"
+        "[v0]trim=start=0.000:end=1.400,setpts=PTS-STARTPTS[vs0];\n"
+        "[a1]atrim=start=2.600:end=5.250,asetpts=PTS-STARTPTS[as1];\n"
+        "[v1]trim=start=2.600:end=5.250,setpts=PTS-STARTPTS[vs1];\n"
+        "[vs0][as0][vs1][as1]concat=n=2:v=1:a=1[v][a]\n"
+        "[a] [v]"
+    )
+
+
+def test_pad_voiced_splits_overlapping_padding_halfway():
+    assert silence_removal._pad_voiced([(1000, 1300), (4000, 6000)], 6000, 200) == [(0, 1150), (1150, 4200)]
+    assert silence_removal._pad_voiced([], 900, 200) == [(0, 900)]
+    assert silence_removal._pad_voiced([(0, 900)], 900, 200) == []
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+
+
+def _executor_module():
+    # Other suites reload clipmato modules; the pool pickles functions by
+    # reference, so resolve the module that is currently imported.
+    return importlib.import_module("clipmato.services.stage_executor")
+
+
+def test_thread_mode_runs_in_this_process():
+    executor = _executor_module().StageExecutor("thread")
+
+    assert asyncio.run(executor.run(os.getpid)) == os.getpid()
+    assert executor.warm() == []
+
+
+def test_process_mode_runs_stages_in_warm_worker_processes():
+    executor = _executor_module().StageExecutor("process", workers=1)
+    try:
+        warmed = executor.warm()
+        assert [future.result(timeout=60) for future in warmed] == [True]
+
+        async def scenario():
+            return await asyncio.gather(executor.run(os.getpid), executor.run(divmod, 7, 2))
+
+        worker_pid, quotient = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert worker_pid != os.getpid()
+    assert quotient == (3, 1)
+
+
+def test_unknown_mode_falls_back_to_threads():
+    assert _executor_module().StageExecutor("gpu").mode == "thread"
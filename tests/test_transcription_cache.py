@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from clipmato.steps import transcription
+from clipmato.utils.transcript_cache import TranscriptCache
+
+
+@pytest.fixture()
+def cache(monkeypatch, tmp_path):
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    monkeypatch.setattr(transcription, "transcript_cache", cache)
+    monkeypatch.setattr(transcription, "resolve_transcription_backend", lambda: "openai")
+    return cache
+
+
+def test_transcribe_audio_reuses_cached_transcript_for_identical_audio(cache, monkeypatch, tmp_path):
+    calls: list[tuple[str, str, str | None]] = []
+
+    def fake_openai(src, model, language=None, **_kwargs):
+        calls.append((src.name, model, language))
+        return f"transcript of {src.name}"
+
+    monkeypatch.setattr(transcription, "_transcribe_with_openai", fake_openai)
+    first = tmp_path / "episode.wav"
+    reupload = tmp_path / "episode-retry.wav"
+    first.write_bytes(b"RIFF same audio")
+    reupload.write_bytes(b"RIFF same audio")
+
+    assert transcription.transcribe_audio(str(first)) == "transcript of episode.wav"
+    assert transcription.transcribe_audio(str(reupload)) == "transcript of episode.wav"
+    transcription.transcribe_audio(str(reupload), language="de")
+
+    assert calls == [("episode.wav", "whisper-1", None), ("episode-retry.wav", "whisper-1", "de")]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["entries"]) == (1, 2, 2, 2)
+
+
+def test_cache_hit_for_a_video_upload_skips_conversion(cache, monkeypatch, tmp_path):
+    prepared: list[str] = []
+
+    def fake_prepare(audio_path, *, convert=True):
+        prepared.append(audio_path)
+        return tmp_path / "episode.wav", None
+
+    monkeypatch.setattr(transcription, "_prepare_audio_file", fake_prepare)
+    monkeypatch.setattr(transcription, "_transcribe_with_openai", lambda src, **_kwargs: "video transcript")
+    first = tmp_path / "episode.mp4"
+    reupload = tmp_path / "episode-retry.mp4"
+    first.write_bytes(b"same video")
+    reupload.write_bytes(b"same video")
+
+    assert transcription.transcribe_audio(str(first)) == "video transcript"
+    assert transcription.transcribe_audio(str(reupload)) == "video transcript"
+
+    assert prepared == [str(first)]
+    assert transcription._source_fingerprint(first, convert=True) != transcription._source_fingerprint(first, convert=False)
+
+
+def test_transcript_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = TranscriptCache(tmp_path, max_bytes=1024 * 1024)
+    keys = [TranscriptCache.key(f"audio-{index}", backend="openai", model="whisper-1", language=None) for index in range(3)]
+    cache.put(keys[0], "x" * 200)
+    cache.put(keys[1], "y" * 200)
+    cache.max_bytes = cache.stats()["bytes"] + 100  # room for two entries, not three
+    stale = os.stat(cache._entry_path(keys[1])).st_mtime_ns - 10_000_000
+    os.utime(cache._entry_path(keys[0]), ns=(stale, stale))
+
+    assert cache.get(keys[0]) == "x" * 200  # the hit makes keys[1] the least recently used
+    cache.put(keys[2], "z" * 200)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "x" * 200
+    assert cache.get(keys[2]) == "z" * 200
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from openai import OpenAI
+
+from clipmato.steps import transcription
+from clipmato.utils.audio_decode import MediaInfo, parse_silencedetect
+
+
+class _StubTranscriptionServer:
+    """Local stand-in for ``POST /v1/audio/transcriptions`` that tracks concurrency."""
+
+    def __init__(self, delay: float = 0.2) -> None:
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.requests: list[str] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802 - http.server naming
+                body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+                name = body.split(b'filename="', 1)[1].split(b'"', 1)[0].decode()
+                with stub._lock:
+                    stub.active += 1
+                    stub.peak = max(stub.peak, stub.active)
+                    stub.requests.append(name)
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub.active -= 1
+                payload = f"text of {name}".encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                return None
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_parse_silences_reads_silencedetect_output():
+    stderr = "\n".join(
+        [
+            "[silencedetect @ 0x1] silence_start: -0.01",
+            "[silencedetect @ 0x1] silence_end: 1.5 | silence_duration: 1.51",
+            "size=N/A time=00:10:00.00",
+            "[silencedetect @ 0x1] silence_start: 598.2",
+            "[silencedetect @ 0x1] silence_end: 599.0 | silence_duration: 0.8",
+            "[silencedetect @ 0x1] silence_start: 1190.0",
+        ]
+    )
+
+    assert parse_silencedetect(stderr) == [(0.0, 1.5), (598.2, 599.0)]
+    assert parse_silencedetect(stderr, duration=1200.0)[-1] == (1190.0, 1200.0)
+
+
+def test_split_points_snap_to_nearby_silences_and_fall_back_to_targets():
+    silences = [(280.0, 281.0), (590.0, 592.0), (1500.0, 1502.0)]
+
+    points = transcription._choose_split_points(1200.0, 4, silences)
+
+    # targets 300 / 600 / 900: the first two snap to silences within 30s, the last has none nearby
+    assert points == [280.5, 591.0, 900.0]
+    assert transcription._choose_split_points(100.0, 1, silences) == []
+
+
+def test_chunks_are_transcribed_concurrently_and_joined_in_order(monkeypatch, tmp_path):
+    source = tmp_path / "episode.wav"
+    source.write_bytes(b"x" * 300)
+    monkeypatch.setattr(transcription, "MAX_CHUNK_SIZE_BYTES", 100)
+    monkeypatch.setattr(transcription, "OPENAI_TRANSCRIPTION_CONCURRENCY", 3)
+    monkeypatch.setattr(transcription, "media_info", lambda src: MediaInfo(has_audio=True, duration=1800.0))
+    monkeypatch.setattr(transcription, "_detect_silences", lambda src: [(895.0, 897.0)])
+    segment_calls: list[list[str]] = []
+
+    def fake_run(args, check=False, **kwargs):
+        segment_calls.append(list(args))
+        pattern = Path(args[-1])
+        for index in range(4):
+            Path(str(pattern) % index).write_bytes(b"chunk")
+
+    monkeypatch.setattr(transcription.subprocess, "run", fake_run)
+
+    # long enough per request that client start-up on a busy machine cannot hide serial execution
+    with _StubTranscriptionServer(delay=0.5) as stub:
+        monkeypatch.setattr(transcription, "_openai_client", lambda: OpenAI(api_key="test", base_url=stub.base_url))
+        started = time.perf_counter()
+        text = transcription._transcribe_with_openai(source, model="whisper-1")
+        elapsed = time.perf_counter() - started
+
+    assert text.splitlines() == [f"text of chunk_{index:03d}.wav" for index in range(4)]
+    assert stub.peak == 3
+    assert elapsed < 4 * stub.delay
+    segment_times = segment_calls[0][segment_calls[0].index("-segment_times") + 1]
+    assert segment_times == "450.000,896.000,1350.000"
+
+
+@pytest.mark.parametrize("language", [None, "fr"])
+def test_single_request_passes_language_hint(monkeypatch, tmp_path, language):
+    source = tmp_path / "short.wav"
+    source.write_bytes(b"x" * 10)
+    captured: dict[str, object] = {}
+
+    class FakeTranscriptions:
+        def create(self, **kwargs):
+            captured.update(kwargs)
+            return "hello"
+
+    class FakeClient:
+        audio = type("Audio", (), {"transcriptions": FakeTranscriptions()})()
+
+    monkeypatch.setattr(transcription, "_openai_client", lambda: FakeClient())
+
+    assert transcription._transcribe_with_openai(source, model="whisper-1", language=language) == "hello"
+    assert captured.get("language") == language
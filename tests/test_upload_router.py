@@ -31,6 +31,12 @@ def build_app(file_io_service):
         async def process(self, *args, **kwargs):
             return None
 
+        def enqueue(self, *args, **kwargs):
+            return 1
+
+        def has_capacity(self):
+            return True
+
     class DummyProgress:
         def update(self, *args, **kwargs):
             return None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from clipmato.utils import whisper_models
+from clipmato.utils.whisper_models import WhisperModelPool, collect_model_stats
+
+MB = 1024 * 1024
+
+
+class _Tensor:
+    def __init__(self, nbytes: int) -> None:
+        self.nbytes = nbytes
+
+    def numel(self) -> int:
+        return self.nbytes // 4
+
+    def element_size(self) -> int:
+        return 4
+
+
+class _FakeModel:
+    def __init__(self, name: str, megabytes: int) -> None:
+        self.name = name
+        self._megabytes = megabytes
+
+    def parameters(self):
+        return [_Tensor(self._megabytes * MB - MB), _Tensor(MB)]
+
+    def buffers(self):
+        return []
+
+
+def _loader(sizes: dict[str, int], loads: list[str], delay: float = 0.0):
+    def load(name: str, device: str):
+        loads.append(name)
+        time.sleep(delay)
+        return _FakeModel(name, sizes[name])
+
+    return load
+
+
+def test_pool_evicts_least_recently_used_models_past_the_memory_budget(tmp_path):
+    loads: list[str] = []
+    pool = WhisperModelPool(_loader({"x": 3, "y": 3, "z": 3}, loads), max_bytes=7 * MB, stats_dir=tmp_path)
+
+    first = pool.get("x", "cpu")
+    pool.get("y", "cpu")
+    assert pool.get("x", "cpu") is first  # "y" is now the least recently used
+    pool.get("z", "cpu")
+
+    stats = pool.stats()
+    assert loads == ["x", "y", "z"]
+    assert [model["model_name"] for model in stats["models"]] == ["x", "z"]
+    assert (stats["loads"], stats["evictions"], stats["resident_bytes"]) == (3, 1, 6 * MB)
+    assert stats["models"][0]["uses"] == 2
+
+
+def test_pool_keeps_a_model_larger_than_the_budget_and_frees_room_before_loading(tmp_path):
+    loads: list[str] = []
+    pool = WhisperModelPool(_loader({"tiny": 1, "medium": 3000}, loads), max_bytes=2 * MB, stats_dir=tmp_path)
+
+    pool.get("tiny", "cpu")
+    pool.get("medium", "cpu")  # known to be ~3 GB, so "tiny" goes before the load
+
+    assert [model["model_name"] for model in pool.stats()["models"]] == ["medium"]
+    assert pool.get("medium", "cpu").name == "medium"
+    assert loads == ["tiny", "medium"]
+
+
+def test_concurrent_requests_share_one_load(tmp_path):
+    loads: list[str] = []
+    pool = WhisperModelPool(_loader({"base": 1}, loads, delay=0.05), max_bytes=10 * MB, stats_dir=tmp_path)
+    results: list[object] = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get("base", "cpu"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["base"]
+    assert len({id(model) for model in results}) == 1
+    assert pool.stats()["models"][0]["load_seconds"] >= 0.05
+
+
+def test_collect_model_stats_merges_live_process_snapshots(tmp_path, monkeypatch):
+    pool = WhisperModelPool(_loader({"base": 2}, []), max_bytes=10 * MB, stats_dir=tmp_path)
+    pool.get("base", "cpu")
+    (tmp_path / "999999999.json").write_text('{"loads": 5, "models": [{"model_name": "gone"}]}')
+    monkeypatch.setattr(whisper_models, "_pid_alive", lambda pid: pid != 999999999)
+
+    merged = collect_model_stats(tmp_path)
+
+    assert merged["processes"] == 1
+    assert merged["loads"] == 1
+    assert merged["resident_bytes"] == 2 * MB
+    assert [model["model_name"] for model in merged["models"]] == ["base"]
+    assert not (tmp_path / "999999999.json").exists()
+    assert whisper_models.estimated_model_bytes("large-v3") == whisper_models.estimated_model_bytes("large")
+    assert whisper_models.estimated_model_bytes("base.en") == 74_000_000 * 4
+    assert whisper_models.estimated_model_bytes("custom.pt") == 0